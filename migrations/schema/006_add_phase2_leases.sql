@@ -0,0 +1,18 @@
+-- ============================================================================
+-- Migration 006: Add phase 2 lease columns to mcp_so_server_urls
+-- Purpose: Let several phase 2 workers claim URLs atomically (see
+--          src/database/work_queue.py). A claim sets lease_owner and
+--          lease_expires_at; expired leases are put back in the queue.
+-- Created: 2026-10-16
+-- ============================================================================
+
+ALTER TABLE mcp_so_server_urls ADD COLUMN lease_owner TEXT;        -- Worker holding the row
+ALTER TABLE mcp_so_server_urls ADD COLUMN lease_expires_at DATETIME; -- Claim is void after this
+
+-- Claim order: pending rows by priority, oldest first
+CREATE INDEX IF NOT EXISTS idx_mcp_so_urls_claim
+  ON mcp_so_server_urls(phase2_status, priority DESC, discovered_at ASC);
+
+-- Expired lease scan
+CREATE INDEX IF NOT EXISTS idx_mcp_so_urls_lease
+  ON mcp_so_server_urls(phase2_status, lease_expires_at);
@@ -0,0 +1,8 @@
+-- ============================================================================
+-- Migration 007: Add source_sha to markdown_content
+-- Purpose: Store the git blob sha of fetched READMEs so later runs can tell
+--          an unchanged README apart without comparing full contents.
+-- Created: 2026-10-16
+-- ============================================================================
+
+ALTER TABLE markdown_content ADD COLUMN source_sha TEXT;  -- Git blob sha (READMEs only)
@@ -0,0 +1,17 @@
+-- ============================================================================
+-- Migration 008: Add parse_cache table
+-- Purpose: Store README parse results (tools, parameters, installation
+--          configs) keyed by the sha256 of the README and the parser name and
+--          version, so enrichers only reparse READMEs that changed (see
+--          src/parsers/parse_cache.py).
+-- Created: 2026-10-16
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS parse_cache (
+    content_sha256 TEXT NOT NULL,         -- sha256 of the README content
+    parser TEXT NOT NULL,                 -- 'tools', 'parameters', 'readme_config'
+    parser_version TEXT NOT NULL,         -- PARSER_VERSION of the parser module
+    result TEXT NOT NULL,                 -- JSON parse result
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (content_sha256, parser, parser_version)
+);
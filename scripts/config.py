@@ -80,6 +80,8 @@ PHASE2_CONFIG = {
     'DELAY_BETWEEN_BATCHES_MIN': 10.0, # Minimum delay between batches
     'DELAY_BETWEEN_BATCHES_MAX': 20.0, # Maximum delay between batches
     'INITIAL_PAGE_WAIT': 4.0,          # Wait after loading first URL
+    'READY_TIMEOUT': 10000,            # Max wait for a page to become ready (ms)
+    'DOM_QUIET_MS': 300,               # DOM-mutation quiet window marking a page as rendered
 
     # === RETRY CONFIGURATION ===
     'RETRY_DELAY_BASE': 10.0,     # Base delay for exponential backoff
@@ -88,7 +90,11 @@ PHASE2_CONFIG = {
     # === SCRAPING BEHAVIOR ===
     'HEADLESS': True,             # Run browser in headless mode
     'TIMEOUT': 30000,             # Page load timeout (ms)
-    'PARALLEL_WORKERS': 1,        # Number of parallel workers (keep 1 for safety)
+    'PARALLEL_WORKERS': 1,        # Worker processes (phase2_worker.py leases rows, safe above 1)
+    'LEASE_SECONDS': 300,         # Work queue lease before a claimed URL is re-queued
+    'PAGE_POOL_SIZE': 8,          # Browser pages scraped concurrently per worker
+    'BROWSER_CONTEXTS': 2,        # Browser contexts the page pool is spread over
+    'BLOCK_RESOURCES': True,      # Abort images, fonts, media, CSS and trackers
 
     # === DETECTION AVOIDANCE ===
     'ROTATE_USER_AGENT': True,    # Rotate user agent per URL
@@ -212,6 +218,8 @@ SCENARIOS = {
             'DELAY_BETWEEN_BATCHES_MIN': 5.0,
             'DELAY_BETWEEN_BATCHES_MAX': 10.0,
             'PARALLEL_WORKERS': 2,  # Slightly more aggressive
+            'PAGE_POOL_SIZE': 16,
+            'BROWSER_CONTEXTS': 4,
         }
     },
 }
@@ -264,7 +272,10 @@ def estimate_phase2_time(config, num_urls):
     url_time = avg_url_delay + 3.0  # 3s for scraping
     num_batches = (num_urls // config['BATCH_SIZE']) + 1
 
-    total_seconds = (num_urls * url_time) + (num_batches * avg_batch_delay)
+    # Pooled pages scrape URLs concurrently
+    concurrency = config.get('PAGE_POOL_SIZE', 1) * config.get('PARALLEL_WORKERS', 1)
+
+    total_seconds = (num_urls * url_time) / concurrency + (num_batches * avg_batch_delay)
     return total_seconds / 60  # Return in minutes
 
 
@@ -5,47 +5,65 @@ Backfill MCP Configuration Tables from Existing READMEs
 This script parses existing README content stored in the markdown_content table
 and extracts NPM/Docker installation configurations using the ReadmeParser.
 
+With --from-tarball, each repository is downloaded once as a tarball instead:
+the README and manifests (package.json, pyproject.toml) come from the same
+download, and the package.json name is used to fetch missing npm info.
+
 Usage:
-    python scripts/backfill_configs_from_readme.py [--dry-run] [--limit N]
+    python scripts/pipeline/backfill_configs_from_readme.py [--dry-run] [--limit N] [--from-tarball] [--no-cache]
 
 Options:
-    --dry-run    : Don't save to database, just show what would be extracted
-    --limit N    : Process only N servers (for testing)
-    --verbose    : Show detailed parsing results
+    --dry-run      : Don't save to database, just show what would be extracted
+    --limit N      : Process only N servers (for testing)
+    --verbose      : Show detailed parsing results
+    --from-tarball : Read README and manifests from repository tarballs
+    --no-cache     : Reparse every README (ignore the parse_cache table)
 """
 
 import sys
 import json
+import uuid
+import asyncio
 import argparse
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
 # Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
 
 from sqlalchemy import create_engine, func, select
 from sqlalchemy.orm import sessionmaker
-from src.parsers.readme_parser import ReadmeParser
+from src.parsers.readme_parser import ReadmeParser, PARSER_VERSION
+from src.parsers.parse_cache import ParseCache
 from src.database.models_normalized import (
     Server,
     MarkdownContent,
+    GithubInfo,
+    NpmInfo,
     McpConfigNpm,
     McpConfigDocker,
 )
+from src.enrichers.github_enricher import GitHubEnricher, DEFAULT_REPO_CONCURRENCY
+from src.enrichers.npm_enricher import NpmEnricher
+from src.enrichers.tarball_ingestor import TarballIngestor, apply_snapshot_profile, parse_snapshot, npm_package_name
+from src.network.http_pool import run_in_http_scope
 from loguru import logger
 
 
 # Database configuration
-DB_PATH = Path(__file__).parent.parent / "data" / "mcp_servers.db"
+DB_PATH = project_root / "data" / "mcp_servers.db"
 
 
 class ConfigBackfiller:
     """Backfill configuration tables from existing README content"""
 
-    def __init__(self, dry_run: bool = False, verbose: bool = False):
+    def __init__(self, dry_run: bool = False, verbose: bool = False, use_parse_cache: bool = True):
         self.dry_run = dry_run
         self.verbose = verbose
+        self.use_parse_cache = use_parse_cache
+        self.parse_cache: Optional[ParseCache] = None
         self.engine = create_engine(f"sqlite:///{DB_PATH}", echo=False)
         self.Session = sessionmaker(bind=self.engine)
 
@@ -57,6 +75,8 @@ class ConfigBackfiller:
             "no_config": 0,
             "parse_errors": 0,
             "already_exists": 0,
+            "npm_discovered": 0,
+            "profiles_updated": 0,
         }
         self.failures: List[Dict] = []
 
@@ -92,10 +112,15 @@ class ConfigBackfiller:
     def extract_config_from_readme(
         self, server: Server, readme_content: str
     ) -> Optional[Dict]:
-        """Parse README and extract configuration"""
+        """Parse README and extract configuration (served from the parse cache when unchanged)"""
         try:
-            parser = ReadmeParser(readme_content)
-            config_data = parser.parse_all()
+            config_data = self.parse_cache.get(readme_content) if self.parse_cache else None
+            if config_data is None:
+                parser = ReadmeParser(readme_content)
+                config_data = parser.parse_all()
+                # A README cut short by the parse budget is parsed again next run
+                if self.parse_cache and not parser.budget_exceeded:
+                    self.parse_cache.put(readme_content, config_data)
 
             if not config_data or not config_data.get("installation_config"):
                 return None
@@ -237,12 +262,9 @@ class ConfigBackfiller:
             self.stats["parse_errors"] += 1
             return False
 
-    def process_server(self, session, server: Server) -> bool:
-        """Process a single server"""
-        self.stats["total_processed"] += 1
-
-        # Get README content
-        readme = next(
+    def find_readme(self, server: Server) -> Optional[MarkdownContent]:
+        """README row of a server, if it has content"""
+        return next(
             (
                 mc
                 for mc in server.markdown_contents
@@ -251,6 +273,13 @@ class ConfigBackfiller:
             None,
         )
 
+    def process_server(self, session, server: Server) -> bool:
+        """Process a single server"""
+        self.stats["total_processed"] += 1
+
+        # Get README content
+        readme = self.find_readme(server)
+
         if not readme:
             logger.warning(f"No README content for {server.slug}")
             self.stats["no_config"] += 1
@@ -281,6 +310,143 @@ class ConfigBackfiller:
             self.stats["no_config"] += 1
             return False
 
+    def get_servers_with_github(self, session, limit: Optional[int] = None):
+        """Get servers with a GitHub repository but no config entries"""
+        servers_with_npm = session.query(McpConfigNpm.server_id).subquery()
+        servers_with_docker = session.query(McpConfigDocker.server_id).subquery()
+
+        query = (
+            session.query(Server)
+            .join(GithubInfo, Server.id == GithubInfo.server_id)
+            .filter(
+                ~Server.id.in_(select(servers_with_npm)),
+                ~Server.id.in_(select(servers_with_docker)),
+            )
+        )
+        if limit:
+            query = query.limit(limit)
+
+        result = query.all()
+        logger.info(f"Found {len(result)} servers with a GitHub repository needing config backfill")
+        return result
+
+    async def ingest_tarballs(self, servers: List[Server]) -> Dict[str, Dict]:
+        """
+        Download snapshots (and discovered npm info) for many servers
+
+        Returns:
+            Dict mapping server id to {'snapshot': dict, 'npm_data': dict or None}
+        """
+        results = {}
+        semaphore = asyncio.Semaphore(DEFAULT_REPO_CONCURRENCY)
+
+        async with GitHubEnricher() as github, NpmEnricher() as npm:
+            ingestor = TarballIngestor(github)
+
+            async def ingest(server: Server):
+                async with semaphore:
+                    info = server.github_info
+                    snapshot = await ingestor.ingest(info.github_owner, info.github_repo)
+                    if not snapshot:
+                        return
+
+                    npm_data = None
+                    package_name = npm_package_name(snapshot)
+                    if package_name and server.npm_info is None:
+                        npm_data = await npm.fetch_package_info(package_name)
+                    results[server.id] = {'snapshot': snapshot, 'npm_data': npm_data}
+
+            await asyncio.gather(*[ingest(server) for server in servers])
+
+            ingest_stats = ingestor.get_stats()
+            logger.info(
+                f"Tarballs: {ingest_stats['downloads']} downloaded "
+                f"({ingest_stats['bytes_downloaded'] / 1024 / 1024:.1f} MB), "
+                f"{ingest_stats['cache_hits']} from cache, {ingest_stats['failed']} failed"
+            )
+
+        return results
+
+    def save_npm_info(self, session, server: Server, npm_data: Dict):
+        """Save npm info discovered from package.json"""
+        npm_info = NpmInfo(
+            id=str(uuid.uuid4()),
+            server_id=server.id,
+            npm_package=npm_data.get('npm_package', ''),
+            npm_version=npm_data.get('npm_version', '1.0.0'),
+            npm_downloads_weekly=npm_data.get('npm_downloads_weekly', 0),
+            npm_downloads_monthly=npm_data.get('npm_downloads_monthly', 0),
+            npm_license=npm_data.get('npm_license'),
+            npm_homepage=npm_data.get('npm_homepage'),
+            npm_repository_url=npm_data.get('npm_repository_url'),
+            latest_version=npm_data.get('latest_version'),
+            latest_version_published_at=npm_data.get('latest_version_published_at'),
+            last_synced_at=datetime.utcnow()
+        )
+        if not self.dry_run:
+            session.add(npm_info)
+            session.flush()
+        self.stats["npm_discovered"] += 1
+        logger.success(f"npm: {server.slug} -> {npm_info.npm_package}")
+
+    def run_from_tarballs(self, limit: Optional[int] = None):
+        """Run the backfill from repository tarballs"""
+        logger.info("=" * 70)
+        logger.info("MCP Configuration Backfill (repository tarballs)")
+        logger.info("=" * 70)
+
+        if self.dry_run:
+            logger.warning("DRY RUN MODE - No changes will be saved to database")
+
+        session = self.Session()
+        try:
+            servers = self.get_servers_with_github(session, limit)
+            if not servers:
+                logger.info("No servers need backfilling")
+                return
+
+            ingested = asyncio.run(run_in_http_scope(self.ingest_tarballs(servers)))
+
+            for idx, server in enumerate(servers, 1):
+                self.stats["total_processed"] += 1
+                result = ingested.get(server.id)
+                if not result:
+                    self.stats["no_config"] += 1
+                    continue
+
+                try:
+                    if result['npm_data']:
+                        self.save_npm_info(session, server, result['npm_data'])
+
+                    # Community files and languages from the listing, instead of their API calls
+                    apply_snapshot_profile(server.github_info, result['snapshot'])
+                    self.stats["profiles_updated"] += 1
+
+                    config_data = parse_snapshot(result['snapshot'])
+                    config_type = (config_data.get("installation_config") or {}).get("type")
+                    if config_type == "npm":
+                        self.save_npm_config(session, server, config_data)
+                    elif config_type == "docker":
+                        self.save_docker_config(session, server, config_data)
+                    else:
+                        self.stats["no_config"] += 1
+
+                    if not self.dry_run:
+                        session.commit()
+
+                except Exception as e:
+                    session.rollback()
+                    logger.error(f"Error processing {server.slug}: {e}")
+                    self.failures.append(
+                        {"server": server.slug, "type": "tarball", "error": str(e)}
+                    )
+                    self.stats["parse_errors"] += 1
+
+        finally:
+            session.close()
+
+        self.print_summary()
+
     def run(self, limit: Optional[int] = None):
         """Run the backfill process"""
         logger.info("=" * 70)
@@ -300,6 +466,16 @@ class ConfigBackfiller:
                 logger.info("No servers need backfilling")
                 return
 
+            # One bulk lookup for all READMEs
+            self.parse_cache = ParseCache(
+                session, "readme_config", PARSER_VERSION, enabled=self.use_parse_cache
+            )
+            self.parse_cache.prefetch(
+                readme.content
+                for readme in map(self.find_readme, servers)
+                if readme
+            )
+
             logger.info(f"Processing {len(servers)} servers...\n")
 
             for idx, server in enumerate(servers, 1):
@@ -338,9 +514,18 @@ class ConfigBackfiller:
         logger.info(f"No config found: {self.stats['no_config']}")
         logger.warning(f"Parse errors: {self.stats['parse_errors']}")
 
+        if self.stats["npm_discovered"] > 0:
+            logger.info(f"npm packages discovered: {self.stats['npm_discovered']}")
+
+        if self.stats["profiles_updated"] > 0:
+            logger.info(f"GitHub profiles updated from tarballs: {self.stats['profiles_updated']}")
+
         if self.stats["already_exists"] > 0:
             logger.info(f"Already existed: {self.stats['already_exists']}")
 
+        if self.parse_cache:
+            logger.info(f"Parse cache: {self.parse_cache.summary()}")
+
         # Success rate
         total_extracted = self.stats["npm_extracted"] + self.stats["docker_extracted"]
         if self.stats["total_processed"] > 0:
@@ -379,6 +564,16 @@ def main():
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Show detailed parsing results"
     )
+    parser.add_argument(
+        "--from-tarball",
+        action="store_true",
+        help="Read README and manifests from repository tarballs (one download per repo)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Reparse every README (ignore the parse cache)",
+    )
 
     args = parser.parse_args()
 
@@ -396,8 +591,13 @@ def main():
         sys.exit(1)
 
     # Run backfill
-    backfiller = ConfigBackfiller(dry_run=args.dry_run, verbose=args.verbose)
-    backfiller.run(limit=args.limit)
+    backfiller = ConfigBackfiller(
+        dry_run=args.dry_run, verbose=args.verbose, use_parse_cache=not args.no_cache
+    )
+    if args.from_tarball:
+        backfiller.run_from_tarballs(limit=args.limit)
+    else:
+        backfiller.run(limit=args.limit)
 
 
 if __name__ == "__main__":
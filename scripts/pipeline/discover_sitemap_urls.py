@@ -0,0 +1,181 @@
+"""
+Phase 1 via sitemaps: discover mcp.so server URLs without a browser
+Streams mcp.so's sitemap.xml (and sitemap indexes) and upserts server URLs
+into mcp_so_server_urls in batches. Re-runs only insert what's new.
+"""
+import sys
+import re
+import uuid
+import asyncio
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Fix encoding for Windows
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from src.database.models_normalized import McpSoServerUrl
+from src.scrapers.sitemap_discovery import SitemapDiscovery, parse_server_url
+from src.network.http_pool import run_in_http_scope
+from scripts.config import PHASE1_CONFIG
+
+# Configuration
+DB_PATH = project_root / 'data' / 'mcp_servers.db'
+MCP_SO_BASE_URL = "https://mcp.so"
+BATCH_SIZE = PHASE1_CONFIG['BATCH_SIZE']
+
+
+def slugify(text):
+    """Convert text to slug format"""
+    text = text.lower()
+    text = re.sub(r'[^a-z0-9-]', '-', text)
+    text = re.sub(r'-+', '-', text)
+    return text.strip('-')
+
+
+def flush_batch(session, inserts, updates, dry_run=False):
+    """Write one batch of new and refreshed URLs"""
+    if dry_run:
+        return
+    if inserts:
+        session.bulk_insert_mappings(McpSoServerUrl, inserts)
+    if updates:
+        session.bulk_update_mappings(McpSoServerUrl, updates)
+    session.commit()
+
+
+async def discover(session, sitemaps=None, limit=None, full=False, dry_run=False):
+    """
+    Discover server URLs from sitemaps and upsert them
+
+    Args:
+        session: SQLAlchemy session
+        sitemaps: Root sitemap URLs (default: from robots.txt)
+        limit: Stop after this many new URLs
+        full: Read every child sitemap, even those unchanged since the last run
+        dry_run: Count without writing
+
+    Returns:
+        dict: Discovery statistics
+    """
+    # Known URLs with their last update, to skip entries whose lastmod hasn't moved
+    known = {
+        url: (row_id, updated_at)
+        for row_id, url, updated_at in session.query(
+            McpSoServerUrl.id, McpSoServerUrl.mcp_so_url, McpSoServerUrl.updated_at
+        )
+    }
+    since = None if full else session.query(func.max(McpSoServerUrl.discovered_at)).scalar()
+
+    print(f"  Known URLs: {len(known)}")
+    if since:
+        print(f"  Skipping child sitemaps unchanged since {since.isoformat()}")
+
+    stats = {'new': 0, 'refreshed': 0, 'unchanged': 0, 'duplicates': 0}
+    inserts, updates = [], []
+    run_seen = set()
+
+    async with SitemapDiscovery(MCP_SO_BASE_URL) as discovery:
+        async for url, lastmod, sitemap_number in discovery.iter_server_urls(since=since, sitemaps=sitemaps):
+            if url in run_seen:
+                stats['duplicates'] += 1
+                continue
+            run_seen.add(url)
+
+            now = datetime.utcnow()
+
+            if url in known:
+                row_id, updated_at = known[url]
+                if lastmod and updated_at and lastmod > updated_at:
+                    # Page changed since we processed it: queue it for phase 2 again
+                    updates.append({'id': row_id, 'phase2_status': 'pending', 'updated_at': now})
+                    stats['refreshed'] += 1
+                else:
+                    stats['unchanged'] += 1
+            else:
+                server_name, owner = parse_server_url(url)
+                inserts.append({
+                    'id': str(uuid.uuid4()),
+                    'mcp_so_url': url,
+                    'server_name': server_name,
+                    'owner_name': owner,
+                    'slug': slugify(server_name),
+                    'phase2_status': 'pending',
+                    'phase2_attempts': 0,
+                    'page_number': sitemap_number,
+                    'priority': 0,
+                    'discovered_at': now,
+                    'updated_at': now,
+                })
+                stats['new'] += 1
+
+            if len(inserts) + len(updates) >= BATCH_SIZE:
+                flush_batch(session, inserts, updates, dry_run)
+                print(f"  💾 {stats['new']} new | {stats['refreshed']} refreshed | "
+                      f"{stats['unchanged']} unchanged")
+                inserts, updates = [], []
+
+            if limit and stats['new'] >= limit:
+                print(f"  Reached limit of {limit} new URLs")
+                break
+
+        flush_batch(session, inserts, updates, dry_run)
+        stats.update(discovery.stats)
+
+    return stats
+
+
+async def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Discover mcp.so server URLs from sitemaps')
+    parser.add_argument('--sitemap', action='append', help='Root sitemap URL (default: from robots.txt)')
+    parser.add_argument('--limit', type=int, help='Stop after this many new URLs')
+    parser.add_argument('--full', action='store_true', help='Read every child sitemap, ignoring lastmod')
+    parser.add_argument('--dry-run', action='store_true', help='Count URLs without writing to the database')
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("🗺️  Phase 1 - Sitemap URL Discovery")
+    print("=" * 70)
+    print(f"Database: {DB_PATH}")
+    if args.dry_run:
+        print("🔍 DRY RUN MODE - No changes will be made")
+
+    engine = create_engine(f'sqlite:///{DB_PATH}', echo=False)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    start_time = datetime.now()
+
+    try:
+        stats = await discover(session, sitemaps=args.sitemap, limit=args.limit,
+                               full=args.full, dry_run=args.dry_run)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        session.rollback()
+        return
+    finally:
+        session.close()
+
+    elapsed = datetime.now() - start_time
+    print("\n" + "=" * 70)
+    print("✅ DISCOVERY COMPLETED")
+    print("=" * 70)
+    print(f"  • Sitemaps fetched: {stats['sitemaps_fetched']} "
+          f"({stats['sitemaps_skipped']} skipped, {stats['sitemaps_failed']} failed)")
+    print(f"  • URLs in sitemaps: {stats['urls_seen']}")
+    print(f"  • New server URLs: {stats['new']}")
+    print(f"  • Refreshed (lastmod changed): {stats['refreshed']}")
+    print(f"  • Already known: {stats['unchanged']}")
+    print(f"⏱️  Total time: {elapsed}")
+
+
+if __name__ == '__main__':
+    asyncio.run(run_in_http_scope(main()))
@@ -15,20 +15,209 @@ sys.path.insert(0, str(project_root))
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from src.enrichers.github_enricher import GitHubEnricher
+from src.enrichers.github_enricher import GitHubEnricher, GRAPHQL_BATCH_SIZE, DEFAULT_REPO_CONCURRENCY
+from src.enrichers.github_refresh_planner import GitHubRefreshPlanner, REST_COST_PER_REPO, GRAPHQL_COST_PER_REPO
+from src.network.http_pool import run_in_http_scope
 from src.database.models_normalized import GithubInfo
 
 # Configuration
 DB_PATH = project_root / 'data' / 'mcp_servers.db'
 
 
-async def enrich_github_info(limit: int = None, force: bool = False):
+def apply_github_data(gh_info, data):
+    """
+    Copy comprehensive GitHub data onto a GithubInfo row
+
+    Args:
+        gh_info: GithubInfo instance
+        data: Dict returned by fetch_comprehensive_info / fetch_comprehensive_batch
+    """
+    gh_info.github_full_name = data.get('github_full_name')
+    gh_info.github_description = data.get('github_description')
+    gh_info.github_stars = data.get('github_stars', 0)
+    gh_info.github_forks = data.get('github_forks', 0)
+    gh_info.github_watchers = data.get('github_watchers', 0)
+    gh_info.github_open_issues = data.get('github_open_issues', 0)
+    gh_info.github_last_commit = data.get('github_last_commit')
+    gh_info.github_created_at = data.get('github_created_at')
+    gh_info.github_updated_at = datetime.utcnow()
+    gh_info.commit_frequency = data.get('commit_frequency', 0)
+
+    # Languages
+    gh_info.primary_language = data.get('primary_language')
+    gh_info.languages = json.dumps(data.get('languages', {}))
+    gh_info.github_topics = json.dumps(data.get('github_topics', []))
+
+    # License
+    gh_info.license_name = data.get('license_name')
+
+    # Contributors
+    gh_info.top_contributors = json.dumps(data.get('top_contributors', []))
+    gh_info.contributors_count = data.get('contributors_count', 0)
+
+    # Release
+    gh_info.latest_github_version = data.get('latest_github_version')
+    gh_info.latest_release_date = data.get('latest_release_date')
+    gh_info.release_notes = data.get('release_notes')
+    gh_info.is_prerelease = 1 if data.get('is_prerelease') else 0
+
+    # Community files
+    gh_info.has_readme = 1 if data.get('has_readme') else 0
+    gh_info.has_license = 1 if data.get('has_license') else 0
+    gh_info.has_contributing = 1 if data.get('has_contributing') else 0
+    gh_info.has_code_of_conduct = 1 if data.get('has_code_of_conduct') else 0
+
+    # Health score
+    gh_info.github_health_score = data.get('github_health_score', 0)
+
+    # Sync timestamp
+    gh_info.last_synced_at = datetime.utcnow()
+
+
+async def enrich_with_graphql(enricher, session, github_infos, stats):
+    """
+    Enrich rows through GraphQL batches (one query per GRAPHQL_BATCH_SIZE repos)
+
+    Args:
+        enricher: Started GitHubEnricher
+        session: SQLAlchemy session
+        github_infos: GithubInfo rows to enrich
+        stats: Stats dict updated in place
+    """
+    for start in range(0, len(github_infos), GRAPHQL_BATCH_SIZE):
+        batch = github_infos[start:start + GRAPHQL_BATCH_SIZE]
+        print(f"\n[{start + len(batch)}/{stats['total']}] Enriching batch of {len(batch)} repositories")
+
+        results = await enricher.fetch_comprehensive_batch(
+            [{'owner': gh_info.github_owner, 'repo': gh_info.github_repo} for gh_info in batch]
+        )
+
+        applied = 0
+        missing = 0
+        try:
+            for gh_info in batch:
+                key = f"{gh_info.github_owner}/{gh_info.github_repo}"
+                data = results.get(key)
+                if data:
+                    apply_github_data(gh_info, data)
+                    applied += 1
+                else:
+                    missing += 1
+                    stats['failed'] += 1
+                    stats['errors'].append(f"{key}: No data returned")
+
+            session.commit()
+            # Counted once committed: a failed commit saves none of the batch
+            stats['success'] += applied
+            print(f"      [OK] Batch saved")
+
+        except Exception as e:
+            stats['failed'] += len(batch) - missing
+            stats['errors'].append(f"Batch at {start}: {str(e)}")
+            print(f"      [ERROR] Error: {e}")
+            session.rollback()
+
+
+async def enrich_with_rest(enricher, session, github_infos, stats, concurrency):
+    """
+    Enrich rows over REST, `concurrency` repositories in flight at a time
+
+    Rows are fetched in chunks and committed once per chunk.
+
+    Args:
+        enricher: Started GitHubEnricher
+        session: SQLAlchemy session
+        github_infos: GithubInfo rows to enrich
+        stats: Stats dict updated in place
+        concurrency: Repositories fetched concurrently
+    """
+    chunk_size = max(1, concurrency) * 4
+    for start in range(0, len(github_infos), chunk_size):
+        chunk = github_infos[start:start + chunk_size]
+        print(f"\n[{start + len(chunk)}/{stats['total']}] Enriching {len(chunk)} repositories "
+              f"({concurrency} at a time)")
+
+        results = await enricher.fetch_comprehensive_multiple(
+            [{'owner': gh_info.github_owner, 'repo': gh_info.github_repo} for gh_info in chunk],
+            concurrency=concurrency
+        )
+
+        for gh_info in chunk:
+            key = f"{gh_info.github_owner}/{gh_info.github_repo}"
+            data = results.get(key)
+            try:
+                if data:
+                    # Update github_info with comprehensive data
+                    apply_github_data(gh_info, data)
+                    session.commit()
+                    stats['success'] += 1
+                else:
+                    stats['failed'] += 1
+                    stats['errors'].append(f"{key}: No data returned")
+                    print(f"      [ERROR] Failed to fetch data: {key}")
+
+            except Exception as e:
+                stats['failed'] += 1
+                stats['errors'].append(f"{key}: {str(e)}")
+                print(f"      [ERROR] Error: {e}")
+                session.rollback()
+
+
+async def plan_refresh(enricher, session, github_infos, graphql, budget_fraction):
+    """
+    Reduce rows to those worth a full refresh (see GitHubRefreshPlanner)
+
+    Rows found unchanged by the bulk pre-check get their counters updated
+    in place, without a full fetch: their last_synced_at records the check,
+    while github_updated_at keeps the time of the last full fetch.
+
+    Args:
+        enricher: Started GitHubEnricher
+        session: SQLAlchemy session
+        github_infos: All GithubInfo rows
+        graphql: Refreshes will go through GraphQL (cheaper per repository)
+        budget_fraction: Share of the remaining rate limit this run may spend
+
+    Returns:
+        list: GithubInfo rows to re-enrich, highest priority first
+    """
+    planner = GitHubRefreshPlanner(
+        enricher,
+        budget_fraction=budget_fraction,
+        cost_per_repo=GRAPHQL_COST_PER_REPO if graphql else REST_COST_PER_REPO
+    )
+    plan = await planner.plan(github_infos)
+
+    checked_at = datetime.utcnow()
+    for gh_info, activity in plan['unchanged']:
+        gh_info.github_stars = activity['stars']
+        gh_info.github_forks = activity['forks']
+        gh_info.last_synced_at = checked_at
+    session.commit()
+
+    print(f"\n[INFO] Refresh plan:")
+    print(f"  Due for a check:  {plan['candidates']} / {len(github_infos)}")
+    print(f"  Unchanged:        {len(plan['unchanged'])} (counters updated)")
+    print(f"  Gone from GitHub: {len(plan['missing'])}")
+    print(f"  Rate budget:      {plan['budget']} -> room for {plan['capacity']} refresh(es)")
+    print(f"  To refresh:       {len(plan['refresh'])} (+{len(plan['deferred'])} deferred)")
+
+    return plan['refresh']
+
+
+async def enrich_github_info(limit: int = None, force: bool = False, graphql: bool = False,
+                             concurrency: int = DEFAULT_REPO_CONCURRENCY, plan: bool = False,
+                             budget_fraction: float = 0.5):
     """
     Enrich GitHub information for all servers
 
     Args:
         limit: Maximum number of servers to enrich (None = all)
         force: Re-enrich even if already enriched
+        graphql: Fetch repositories in GraphQL batches instead of 6 REST calls each
+        concurrency: Repositories fetched concurrently on the REST path
+        plan: Refresh only stale, changed repositories within the rate budget
+        budget_fraction: Share of the remaining rate limit a planned run may spend
     """
     print("=" * 80)
     print("GitHub Info Enrichment")
@@ -42,11 +231,11 @@ async def enrich_github_info(limit: int = None, force: bool = False):
     # Get all servers with GitHub info
     query = session.query(GithubInfo)
 
-    if not force:
+    if not force and not plan:
         # Only enrich if not already enriched (github_stars = 0)
         query = query.filter(GithubInfo.github_stars == 0)
 
-    if limit:
+    if limit and not plan:
         query = query.limit(limit)
 
     github_infos = query.all()
@@ -70,78 +259,14 @@ async def enrich_github_info(limit: int = None, force: bool = False):
 
     # Enrich each server
     async with GitHubEnricher() as enricher:
-        for idx, gh_info in enumerate(github_infos, 1):
-            owner = gh_info.github_owner
-            repo = gh_info.github_repo
+        if plan:
+            github_infos = (await plan_refresh(enricher, session, github_infos, graphql, budget_fraction))[:limit]
+            stats['total'] = len(github_infos)
 
-            print(f"\n[{idx}/{stats['total']}] Enriching: {owner}/{repo}")
-
-            try:
-                # Fetch comprehensive GitHub data
-                data = await enricher.fetch_comprehensive_info(owner, repo)
-
-                if data:
-                    # Update github_info with comprehensive data
-                    gh_info.github_full_name = data.get('github_full_name')
-                    gh_info.github_description = data.get('github_description')
-                    gh_info.github_stars = data.get('github_stars', 0)
-                    gh_info.github_forks = data.get('github_forks', 0)
-                    gh_info.github_watchers = data.get('github_watchers', 0)
-                    gh_info.github_open_issues = data.get('github_open_issues', 0)
-                    gh_info.github_last_commit = data.get('github_last_commit')
-                    gh_info.github_created_at = data.get('github_created_at')
-                    gh_info.github_updated_at = datetime.utcnow()
-                    gh_info.commit_frequency = data.get('commit_frequency', 0)
-
-                    # Languages
-                    gh_info.primary_language = data.get('primary_language')
-                    gh_info.languages = json.dumps(data.get('languages', {}))
-                    gh_info.github_topics = json.dumps(data.get('github_topics', []))
-
-                    # License
-                    gh_info.license_name = data.get('license_name')
-
-                    # Contributors
-                    gh_info.top_contributors = json.dumps(data.get('top_contributors', []))
-                    gh_info.contributors_count = data.get('contributors_count', 0)
-
-                    # Release
-                    gh_info.latest_github_version = data.get('latest_github_version')
-                    gh_info.latest_release_date = data.get('latest_release_date')
-                    gh_info.release_notes = data.get('release_notes')
-                    gh_info.is_prerelease = 1 if data.get('is_prerelease') else 0
-
-                    # Community files
-                    gh_info.has_readme = 1 if data.get('has_readme') else 0
-                    gh_info.has_license = 1 if data.get('has_license') else 0
-                    gh_info.has_contributing = 1 if data.get('has_contributing') else 0
-                    gh_info.has_code_of_conduct = 1 if data.get('has_code_of_conduct') else 0
-
-                    # Health score
-                    gh_info.github_health_score = data.get('github_health_score', 0)
-
-                    # Sync timestamp
-                    gh_info.last_synced_at = datetime.utcnow()
-
-                    session.commit()
-                    stats['success'] += 1
-                    print(f"      [OK] Enriched successfully")
-
-                else:
-                    stats['failed'] += 1
-                    stats['errors'].append(f"{owner}/{repo}: No data returned")
-                    print(f"      [ERROR] Failed to fetch data")
-
-            except Exception as e:
-                stats['failed'] += 1
-                error_msg = f"{owner}/{repo}: {str(e)}"
-                stats['errors'].append(error_msg)
-                print(f"      [ERROR] Error: {e}")
-                session.rollback()
-
-            # Small delay between requests
-            if idx < stats['total']:
-                await asyncio.sleep(0.5)
+        if graphql:
+            await enrich_with_graphql(enricher, session, github_infos, stats)
+        else:
+            await enrich_with_rest(enricher, session, github_infos, stats, concurrency)
 
         # Show final stats
         print("\n" + "=" * 80)
@@ -162,7 +287,20 @@ async def enrich_github_info(limit: int = None, force: bool = False):
         enricher_stats = enricher.get_stats()
         print(f"\n[INFO] API Stats:")
         print(f"  Requests made:    {enricher_stats['requests_made']}")
-        print(f"  Rate limit left:  {enricher_stats['rate_limit_remaining']}")
+        print(f"  GraphQL queries:  {enricher_stats['graphql_requests']}")
+        pool_stats = enricher_stats['rate_limit']
+        print(f"  Tokens in pool:   {pool_stats['tokens']}")
+        print(f"  Rate limit left:  {pool_stats['remaining']}")
+        if pool_stats['waits'] or pool_stats['secondary_limits']:
+            print(f"  Rate limit waits: {pool_stats['waits']} ({pool_stats['wait_seconds']:.0f}s), "
+                  f"{pool_stats['secondary_limits']} secondary limit(s)")
+        flight_stats = enricher_stats['single_flight']
+        if flight_stats['coalesced']:
+            print(f"  Deduplicated:     {flight_stats['coalesced']} repeated repository fetch(es)")
+        if enricher_stats['cache']:
+            cache_stats = enricher_stats['cache']
+            print(f"  Cache:            {cache_stats['hits']} hits | {cache_stats['not_modified']} not modified (304) | "
+                  f"{cache_stats['misses']} misses")
 
     session.close()
 
@@ -181,11 +319,35 @@ def main():
         action='store_true',
         help='Re-enrich all servers even if already enriched'
     )
+    parser.add_argument(
+        '--graphql',
+        action='store_true',
+        help=f'Use GraphQL batches of {GRAPHQL_BATCH_SIZE} repositories (REST fallback per batch)'
+    )
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='Refresh only stale repositories that changed since their last sync, within the rate budget'
+    )
+    parser.add_argument(
+        '--budget-fraction',
+        type=float,
+        default=0.5,
+        help='Share of the remaining rate limit a --plan run may spend (default: 0.5)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_REPO_CONCURRENCY,
+        help=f'Repositories fetched concurrently over REST (default: {DEFAULT_REPO_CONCURRENCY})'
+    )
 
     args = parser.parse_args()
 
     # Run async enrichment
-    asyncio.run(enrich_github_info(limit=args.limit, force=args.force))
+    asyncio.run(run_in_http_scope(enrich_github_info(limit=args.limit, force=args.force, graphql=args.graphql,
+                                                      concurrency=args.concurrency, plan=args.plan,
+                                                      budget_fraction=args.budget_fraction)))
 
 
 if __name__ == '__main__':
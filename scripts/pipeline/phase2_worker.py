@@ -0,0 +1,184 @@
+"""
+Phase 2 worker: extract GitHub URLs for queued mcp.so server URLs
+Drains mcp_so_server_urls through the leased work queue, so several worker
+processes (or machines sharing a PostgreSQL database) can run side by side.
+A crashed worker loses nothing: its leases expire and the rows are re-queued.
+"""
+import sys
+import asyncio
+import argparse
+import random
+import multiprocessing
+from pathlib import Path
+from datetime import datetime
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Fix encoding for Windows
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database.work_queue import Phase2WorkQueue
+from src.network.http_pool import run_in_http_scope
+from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.fetch_strategy import HybridFetcher
+from scripts.config import PHASE2_CONFIG
+from scripts.pipeline.scrape_github_urls import extract_github_url_from_server
+
+# Configuration
+DB_URL = f"sqlite:///{project_root / 'data' / 'mcp_servers.db'}"
+LEASE_SECONDS = PHASE2_CONFIG['LEASE_SECONDS']
+
+
+def parse_github_url(github_url):
+    """Extract owner and repo from GitHub URL"""
+    if not github_url:
+        return None, None
+    parts = github_url.rstrip('/').split('github.com/')[-1].split('/')
+    if len(parts) < 2:
+        return None, None
+    return parts[0], parts[1]
+
+
+async def _heartbeat(queue, held_ids, interval):
+    """Renew leases of in-flight rows until cancelled"""
+    while True:
+        await asyncio.sleep(interval)
+        renewed = queue.heartbeat(held_ids)
+        if renewed < len(held_ids):
+            print(f"  ⚠️  [{queue.worker_id}] {len(held_ids) - renewed} lease(s) lost")
+
+
+async def _process_row(scraper, fetcher, queue, row, held_ids, stats):
+    """Extract the GitHub URL of one claimed row and settle its claim"""
+    try:
+        data = await extract_github_url_from_server(scraper, row.mcp_so_url, fetcher)
+        if not data:
+            queue.fail(row.id, 'Failed to scrape server page')
+            stats['failed'] += 1
+            return
+
+        github_owner, github_repo = parse_github_url(data['github_url'])
+        queue.complete(row.id, github_url=data['github_url'],
+                       github_owner=github_owner, github_repo=github_repo)
+        stats['completed'] += 1
+        print(f"  ✅ [{queue.worker_id}] {row.server_name}: {data['github_url'] or 'no GitHub URL'}")
+
+    except Exception as e:
+        queue.fail(row.id, str(e))
+        stats['failed'] += 1
+        print(f"  ❌ [{queue.worker_id}] {row.server_name}: {e}")
+    finally:
+        held_ids.discard(row.id)
+
+
+async def run_worker(db_url=DB_URL, batch_size=PHASE2_CONFIG['BATCH_SIZE'], lease_seconds=LEASE_SECONDS,
+                     max_attempts=PHASE2_CONFIG['MAX_RETRIES'], max_batches=None):
+    """
+    Claim and process batches until the queue is empty
+
+    Args:
+        db_url: SQLAlchemy database URL
+        batch_size: Rows claimed per batch
+        lease_seconds: Lease duration (renewed every third of it while working)
+        max_attempts: Attempts before a row is marked 'failed'
+        max_batches: Stop after this many batches (None = until empty)
+
+    Returns:
+        dict: Worker statistics
+    """
+    connect_args = {'timeout': 30} if db_url.startswith('sqlite') else {}
+    engine = create_engine(db_url, echo=False, connect_args=connect_args)
+    session = sessionmaker(bind=engine)()
+    queue = Phase2WorkQueue(session, lease_seconds=lease_seconds, max_attempts=max_attempts)
+
+    scraper = BaseScraper(headless=PHASE2_CONFIG['HEADLESS'], pool_size=PHASE2_CONFIG['PAGE_POOL_SIZE'],
+                          contexts=PHASE2_CONFIG['BROWSER_CONTEXTS'],
+                          block_resources=PHASE2_CONFIG['BLOCK_RESOURCES'])
+    fetcher = HybridFetcher(scraper, ready_quiet_ms=PHASE2_CONFIG['DOM_QUIET_MS'],
+                            ready_timeout=PHASE2_CONFIG['READY_TIMEOUT'])
+    stats = {'batches': 0, 'completed': 0, 'failed': 0}
+
+    print(f"🚀 Worker {queue.worker_id} started")
+
+    try:
+        await scraper.start()
+        await fetcher.start()
+
+        while max_batches is None or stats['batches'] < max_batches:
+            rows = queue.claim(batch_size)
+            if not rows:
+                print(f"  ℹ️  [{queue.worker_id}] Queue empty")
+                break
+
+            stats['batches'] += 1
+            held_ids = {row.id for row in rows}
+            heartbeat = asyncio.create_task(_heartbeat(queue, held_ids, lease_seconds / 3))
+
+            try:
+                await asyncio.gather(*[
+                    _process_row(scraper, fetcher, queue, row, held_ids, stats) for row in rows
+                ])
+            finally:
+                heartbeat.cancel()
+
+            # Anti-detection delay between batches
+            await asyncio.sleep(random.uniform(PHASE2_CONFIG['DELAY_BETWEEN_BATCHES_MIN'],
+                                               PHASE2_CONFIG['DELAY_BETWEEN_BATCHES_MAX']))
+
+        return stats
+
+    finally:
+        await fetcher.close()
+        await scraper.close()
+        session.close()
+
+
+def _worker_process(db_url, batch_size, lease_seconds, max_attempts, max_batches):
+    """Process entry point"""
+    stats = asyncio.run(run_in_http_scope(
+        run_worker(db_url, batch_size, lease_seconds, max_attempts, max_batches)
+    ))
+    print(f"🏁 Worker done: {stats['completed']} completed, {stats['failed']} failed "
+          f"in {stats['batches']} batch(es)")
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Phase 2 worker over the leased mcp_so_server_urls queue')
+    parser.add_argument('--workers', type=int, default=PHASE2_CONFIG['PARALLEL_WORKERS'],
+                        help='Number of worker processes on this machine')
+    parser.add_argument('--batch-size', type=int, default=PHASE2_CONFIG['BATCH_SIZE'])
+    parser.add_argument('--lease-seconds', type=int, default=LEASE_SECONDS)
+    parser.add_argument('--max-batches', type=int, help='Stop each worker after this many batches')
+    parser.add_argument('--db-url', default=DB_URL, help='SQLAlchemy URL (e.g. a shared PostgreSQL)')
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print(f"📥 Phase 2 - {args.workers} worker(s), batches of {args.batch_size}, "
+          f"{args.lease_seconds}s leases")
+    print("=" * 70)
+
+    start_time = datetime.now()
+    worker_args = (args.db_url, args.batch_size, args.lease_seconds,
+                   PHASE2_CONFIG['MAX_RETRIES'], args.max_batches)
+
+    if args.workers <= 1:
+        _worker_process(*worker_args)
+    else:
+        processes = [multiprocessing.Process(target=_worker_process, args=worker_args)
+                     for _ in range(args.workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+    print(f"\n⏱️  Total time: {datetime.now() - start_time}")
+
+
+if __name__ == '__main__':
+    main()
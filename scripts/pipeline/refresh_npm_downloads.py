@@ -0,0 +1,130 @@
+"""
+Refresh npm download counts for every npm_info row
+Download counts move daily while the rest of a packument rarely changes:
+this only refreshes npm_downloads_weekly / npm_downloads_monthly, with
+bulk queries against the npm downloads API and bulk database updates.
+"""
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Fix encoding for Windows
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database.models_normalized import NpmInfo
+from src.enrichers.npm_downloads import NpmDownloadsClient, DEFAULT_DOWNLOADS_CONCURRENCY
+from src.network.http_pool import run_in_http_scope
+
+# Configuration
+DB_PATH = project_root / 'data' / 'mcp_servers.db'
+
+# Rows written per bulk update
+UPDATE_BATCH_SIZE = 500
+
+
+async def refresh_downloads(session, limit=None, concurrency=DEFAULT_DOWNLOADS_CONCURRENCY, dry_run=False):
+    """
+    Fetch download counts for all npm_info rows and write them back
+
+    Args:
+        session: SQLAlchemy session
+        limit: Only refresh this many rows
+        concurrency: Downloads API requests in flight at once
+        dry_run: Fetch without writing
+
+    Returns:
+        dict: Refresh statistics
+    """
+    query = session.query(NpmInfo.id, NpmInfo.npm_package,
+                          NpmInfo.npm_downloads_weekly, NpmInfo.npm_downloads_monthly)
+    if limit:
+        query = query.limit(limit)
+    rows = query.all()
+
+    print(f"  Packages: {len(rows)}")
+
+    async with NpmDownloadsClient(concurrency=concurrency) as client:
+        print(f"  Requests planned: {len(client.plan_requests(row.npm_package for row in rows))}")
+        counts = await client.fetch(row.npm_package for row in rows)
+        client_stats = client.get_stats()
+
+    stats = {'rows': len(rows), 'updated': 0, 'unchanged': 0, 'missing': 0}
+    updates = []
+    now = datetime.utcnow()
+
+    for row in rows:
+        totals = counts.get(row.npm_package)
+        if totals is None:
+            stats['missing'] += 1
+        elif (totals['npm_downloads_weekly'], totals['npm_downloads_monthly']) == \
+                (row.npm_downloads_weekly, row.npm_downloads_monthly):
+            stats['unchanged'] += 1
+        else:
+            updates.append(dict(totals, id=row.id, updated_at=now))
+            stats['updated'] += 1
+
+    if not dry_run:
+        for i in range(0, len(updates), UPDATE_BATCH_SIZE):
+            session.bulk_update_mappings(NpmInfo, updates[i:i + UPDATE_BATCH_SIZE])
+        session.commit()
+
+    stats.update(client_stats)
+    return stats
+
+
+async def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Refresh npm download counts in npm_info')
+    parser.add_argument('--limit', type=int, help='Only refresh this many packages')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_DOWNLOADS_CONCURRENCY,
+                        help=f'Requests in flight at once (default: {DEFAULT_DOWNLOADS_CONCURRENCY})')
+    parser.add_argument('--dry-run', action='store_true', help='Fetch counts without writing to the database')
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("📦 npm Download Counts Refresh")
+    print("=" * 70)
+    print(f"Database: {DB_PATH}")
+    if args.dry_run:
+        print("🔍 DRY RUN MODE - No changes will be made")
+
+    engine = create_engine(f'sqlite:///{DB_PATH}', echo=False)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    start_time = datetime.now()
+
+    try:
+        stats = await refresh_downloads(session, limit=args.limit, concurrency=args.concurrency,
+                                        dry_run=args.dry_run)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        session.rollback()
+        return
+    finally:
+        session.close()
+
+    elapsed = datetime.now() - start_time
+    print("\n" + "=" * 70)
+    print("✅ REFRESH COMPLETED")
+    print("=" * 70)
+    print(f"  • Packages: {stats['rows']}")
+    print(f"  • Requests: {stats['requests']} ({stats['bulk_requests']} bulk, "
+          f"{stats['failed_requests']} failed)")
+    print(f"  • Updated: {stats['updated']}")
+    print(f"  • Unchanged: {stats['unchanged']}")
+    print(f"  • Not found: {stats['missing']}")
+    print(f"⏱️  Total time: {elapsed}")
+
+
+if __name__ == '__main__':
+    asyncio.run(run_in_http_scope(main()))
@@ -4,20 +4,21 @@ Orchestrates the full workflow: scrape -> enrich -> parse -> save -> migrate
 """
 import sys
 import asyncio
+import re
 import uuid
 import json
 from pathlib import Path
 from datetime import datetime
 
 # Add project root to path
-project_root = Path(__file__).parent.parent
+project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 # Fix encoding for Windows
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from src.database.models_normalized import (
     Base, Server, MarkdownContent, GithubInfo, NpmInfo,
@@ -26,13 +27,29 @@ from src.database.models_normalized import (
 from src.enrichers.github_enricher import GitHubEnricher
 from src.enrichers.npm_enricher import NpmEnricher
 from src.parsers.readme_parser import ReadmeParser
-import scripts.scrape_mcp_so as mcp_scraper
-import scripts.clean_database as db_cleaner
+from src.scrapers.fetch_strategy import HybridFetcher
+from src.network.http_pool import run_in_http_scope
+import scripts.pipeline.scrape_mcp_so as mcp_scraper
+import scripts.tools.database.clean_database as db_cleaner
 
 # Configuration
 DB_PATH = project_root / 'data' / 'mcp_servers.db'
 MAX_SERVERS = 100
 
+# Stage concurrency (each stage runs this many workers)
+SCRAPE_CONCURRENCY = mcp_scraper.PAGE_POOL_SIZE  # One worker per pooled browser page
+GITHUB_CONCURRENCY = 4
+NPM_CONCURRENCY = 4
+PARSE_CONCURRENCY = 2
+# Bounded queues between stages: a slow stage blocks its upstream (backpressure)
+STAGE_QUEUE_SIZE = 20
+# DB writer: commit every WRITE_BATCH_SIZE servers, or after WRITE_FLUSH_SECONDS idle
+WRITE_BATCH_SIZE = 20
+WRITE_FLUSH_SECONDS = 2.0
+
+# End-of-stream marker passed between stages
+STOP = object()
+
 
 def print_header(text):
     """Print formatted header"""
@@ -90,6 +107,8 @@ async def main(max_servers=MAX_SERVERS):
     # Phase 3: Scrape + Enrich Each Server
     # ========================================================================
     print_header(f"Phase 3: Scraping & Enriching {len(server_urls)} Servers 🔍")
+    print(f"  Stages: scrape x{SCRAPE_CONCURRENCY} → GitHub x{GITHUB_CONCURRENCY} → "
+          f"npm x{NPM_CONCURRENCY} → parse x{PARSE_CONCURRENCY} → DB writer (batches of {WRITE_BATCH_SIZE})")
 
     # Initialize enrichers
     github_enricher = GitHubEnricher()
@@ -98,96 +117,96 @@ async def main(max_servers=MAX_SERVERS):
     await npm_enricher.start()
 
     # Initialize database
-    engine = create_engine(f'sqlite:///{DB_PATH}', echo=False)
+    engine = create_sqlite_engine(DB_PATH)
     Session = sessionmaker(bind=engine)
     session = Session()
 
-    # Scraper for individual pages
-    scraper = mcp_scraper.BaseScraper(headless=True)
+    # Pooled scraper for individual pages, HTTP first
+    scraper = mcp_scraper.BaseScraper(headless=True, pool_size=SCRAPE_CONCURRENCY,
+                                      contexts=mcp_scraper.BROWSER_CONTEXTS,
+                                      block_resources=mcp_scraper.BLOCK_RESOURCES)
     await scraper.start()
+    fetcher = HybridFetcher(scraper, ready_quiet_ms=mcp_scraper.DOM_QUIET_MS,
+                            ready_timeout=mcp_scraper.READY_TIMEOUT_MS)
+    await fetcher.start()
 
     tags_map = {}
 
-    try:
-        for i, url in enumerate(server_urls, 1):
-            print(f"\n[{i}/{len(server_urls)}] Processing: {url}")
-
+    url_queue = asyncio.Queue()
+    github_queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+    npm_queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+    parse_queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+    write_queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+
+    for url in server_urls:
+        url_queue.put_nowait(url)
+    for _ in range(SCRAPE_CONCURRENCY):
+        url_queue.put_nowait(STOP)
+
+    async def scrape(url):
+        # Step 1: Scrape basic info from mcp.so
+        print(f"  📄 Scraping {url}")
+        data = await mcp_scraper.scrape_single_server(scraper, url, fetcher)
+        if not data:
+            print(f"  ❌ Failed to scrape {url}")
+            stats['errors'] += 1
+            return None
+
+        stats['scraped'] += 1
+        return {'data': data, 'github_data': None, 'readme_content': None,
+                'npm_data': None, 'config_data': None}
+
+    async def enrich_github(item):
+        # Step 2: Enrich with GitHub data
+        data = item['data']
+        if data.get('github_url'):
+            owner, repo = mcp_scraper.parse_github_url(data['github_url'])
+            if owner and repo:
+                github_enrichment = await github_enricher.enrich_server(owner, repo)
+                if github_enrichment:
+                    item['github_data'] = github_enrichment['github_info']
+                    item['readme_content'] = github_enrichment.get('readme')
+                    stats['github_enriched'] += 1
+        return item
+
+    async def enrich_npm(item):
+        # Step 3: Enrich with npm data
+        data = item['data']
+        if data.get('npm_url'):
+            npm_match = re.search(r'npmjs\.com/package/(.+)', data['npm_url'])
+            if npm_match:
+                package_name = npm_match.group(1).rstrip('/')
+                item['npm_data'] = await npm_enricher.fetch_package_info(package_name)
+                if item['npm_data']:
+                    stats['npm_enriched'] += 1
+        return item
+
+    async def parse_config(item):
+        # Step 4: Parse installation config from README (off the event loop)
+        readme_content = item['readme_content']
+        if readme_content:
             try:
-                # Step 1: Scrape basic info from mcp.so
-                print("  📄 Scraping mcp.so...")
-                data = await mcp_scraper.scrape_single_server(scraper, url)
-
-                if not data:
-                    print(f"  ❌ Failed to scrape")
-                    stats['errors'] += 1
-                    continue
-
-                stats['scraped'] += 1
-
-                # Step 2: Enrich with GitHub data
-                github_data = None
-                readme_content = None
-
-                if data.get('github_url'):
-                    owner, repo = mcp_scraper.parse_github_url(data['github_url'])
-                    if owner and repo:
-                        github_enrichment = await github_enricher.enrich_server(owner, repo)
-                        if github_enrichment:
-                            github_data = github_enrichment['github_info']
-                            readme_content = github_enrichment.get('readme')
-                            stats['github_enriched'] += 1
-
-                # Step 3: Enrich with npm data
-                npm_data = None
-                if data.get('npm_url'):
-                    import re
-                    npm_match = re.search(r'npmjs\.com/package/(.+)', data['npm_url'])
-                    if npm_match:
-                        package_name = npm_match.group(1).rstrip('/')
-                        npm_data = await npm_enricher.fetch_package_info(package_name)
-                        if npm_data:
-                            stats['npm_enriched'] += 1
-
-                # Step 4: Parse installation config from README
-                config_data = None
-                if readme_content:
-                    try:
-                        parser = ReadmeParser(readme_content['content'])
-                        config_data = parser.parse_all()
-                        stats['configs_parsed'] += 1
-                    except Exception as e:
-                        print(f"    ⚠️  Config parsing failed: {e}")
-
-                # Step 5: Save to database
-                print("  💾 Saving to database...")
-                saved = save_enriched_server(
-                    session,
-                    data,
-                    github_data,
-                    npm_data,
-                    readme_content,
-                    config_data,
-                    tags_map
-                )
-
-                if saved:
-                    session.commit()
-                    stats['saved'] += 1
-                    print(f"  ✅ Saved: {data.get('name', 'Unknown')}")
-                else:
-                    session.rollback()
-                    stats['errors'] += 1
+                parser = ReadmeParser(readme_content['content'])
+                item['config_data'] = await asyncio.to_thread(parser.parse_all)
+                stats['configs_parsed'] += 1
+            except Exception as e:
+                print(f"    ⚠️  Config parsing failed: {e}")
+        return item
 
-                # Small delay between servers
-                await asyncio.sleep(0.5)
+    try:
+        # Step 5 (DB writer) runs as the last stage, all stages overlap
+        await asyncio.gather(
+            run_stage('scrape', scrape, url_queue, github_queue, SCRAPE_CONCURRENCY, GITHUB_CONCURRENCY, stats),
+            run_stage('github', enrich_github, github_queue, npm_queue, GITHUB_CONCURRENCY, NPM_CONCURRENCY, stats),
+            run_stage('npm', enrich_npm, npm_queue, parse_queue, NPM_CONCURRENCY, PARSE_CONCURRENCY, stats),
+            run_stage('parse', parse_config, parse_queue, write_queue, PARSE_CONCURRENCY, 1, stats),
+            write_stage(write_queue, session, tags_map, stats),
+        )
 
-            except Exception as e:
-                print(f"  ❌ Error: {e}")
-                stats['errors'] += 1
-                session.rollback()
-                continue
+        mcp_scraper.print_fetch_stats(fetcher)
 
     finally:
+        await fetcher.close()
         await scraper.close()
         await github_enricher.close()
         await npm_enricher.close()
@@ -221,6 +240,149 @@ async def main(max_servers=MAX_SERVERS):
     print("   2. Migrate to Supabase: python scripts/migrate_to_supabase_mcp.py")
 
 
+async def run_stage(name, handler, inbox, outbox, concurrency, downstream_workers, stats):
+    """
+    Run one pipeline stage with `concurrency` workers
+
+    Each worker takes items from `inbox`, awaits `handler(item)` and puts the
+    result on `outbox` (None results are dropped). Putting on a full outbox
+    blocks, which throttles this stage to the pace of the next one.
+    Once every worker got STOP, one STOP per downstream worker is forwarded.
+
+    Args:
+        name: Stage name for error messages
+        handler: Coroutine function processing one item
+        inbox: Input queue
+        outbox: Output queue
+        concurrency: Number of workers in this stage
+        downstream_workers: Number of workers reading `outbox`
+        stats: Pipeline statistics dict
+    """
+    async def worker():
+        while True:
+            item = await inbox.get()
+            if item is STOP:
+                return
+            try:
+                result = await handler(item)
+            except Exception as e:
+                print(f"  ❌ [{name}] Error: {e}")
+                stats['errors'] += 1
+                continue
+            if result is not None:
+                await outbox.put(result)
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    for _ in range(downstream_workers):
+        await outbox.put(STOP)
+
+
+async def write_stage(inbox, session, tags_map, stats,
+                      batch_size=WRITE_BATCH_SIZE, flush_seconds=WRITE_FLUSH_SECONDS):
+    """
+    Single DB writer: saves servers in batches with one commit per batch
+
+    Each server is saved inside a savepoint so a failing server is rolled
+    back alone. A batch is committed when full, when no item arrived for
+    `flush_seconds`, or at end of stream.
+    """
+    batch = []
+    done = False
+
+    while not done:
+        idle = False
+        try:
+            item = await asyncio.wait_for(inbox.get(), timeout=flush_seconds)
+            if item is STOP:
+                done = True
+            else:
+                batch.append(item)
+        except asyncio.TimeoutError:
+            idle = True
+
+        if batch and (len(batch) >= batch_size or done or idle):
+            flush_servers(session, batch, tags_map, stats)
+            batch = []
+
+
+def create_sqlite_engine(db_path):
+    """
+    SQLite engine whose transactions and savepoints behave as documented
+
+    pysqlite only emits BEGIN before the first DML statement, so a
+    begin_nested() opened first becomes the outermost transaction and its
+    release commits immediately. Taking over BEGIN (SQLAlchemy's pysqlite
+    recipe) keeps every savepoint of a batch inside the batch's transaction.
+    """
+    engine = create_engine(f'sqlite:///{db_path}', echo=False)
+
+    @event.listens_for(engine, 'connect')
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def emit_begin(connection):
+        connection.exec_driver_sql('BEGIN')
+
+    return engine
+
+
+def forget_tags(tags_map, known_slugs):
+    """Drop tags created since `known_slugs` was taken: their rows were rolled back"""
+    for slug in [slug for slug in tags_map if slug not in known_slugs]:
+        del tags_map[slug]
+
+
+def flush_servers(session, batch, tags_map, stats):
+    """
+    Save a batch of enriched servers and commit once
+
+    Each server goes in a savepoint of the batch transaction (see
+    create_sqlite_engine): a failing server is rolled back alone, and a
+    failing commit loses the whole batch.
+    """
+    print(f"  💾 Saving {len(batch)} server(s) to database...")
+    saved_names = []
+    failed = 0
+    batch_tags = set(tags_map)
+
+    try:
+        for item in batch:
+            item_tags = set(tags_map)
+            savepoint = session.begin_nested()
+            saved = save_enriched_server(
+                session,
+                item['data'],
+                item['github_data'],
+                item['npm_data'],
+                item['readme_content'],
+                item['config_data'],
+                tags_map
+            )
+            if saved:
+                savepoint.commit()
+                saved_names.append(item['data'].get('name', 'Unknown'))
+            else:
+                savepoint.rollback()
+                forget_tags(tags_map, item_tags)
+                failed += 1
+                stats['errors'] += 1
+
+        session.commit()
+        stats['saved'] += len(saved_names)
+        for name in saved_names:
+            print(f"  ✅ Saved: {name}")
+
+    except Exception as e:
+        print(f"  ❌ Error committing batch: {e}")
+        session.rollback()
+        # The batch is one transaction, so nothing of it was written: count every
+        # server not already counted, and drop the tags it created so later
+        # batches recreate them
+        stats['errors'] += len(batch) - failed
+        forget_tags(tags_map, batch_tags)
+
+
 def save_enriched_server(session, data, github_data, npm_data, readme_content, config_data, tags_map):
     """
     Save server with all enriched data to database
@@ -276,6 +438,7 @@ def save_enriched_server(session, data, github_data, npm_data, readme_content, c
                 word_count=readme_content.get('word_count', 0),
                 estimated_reading_time_minutes=readme_content.get('estimated_reading_time_minutes', 0),
                 extracted_from=readme_content.get('extracted_from'),
+                source_sha=readme_content.get('sha'),
                 created_at=datetime.utcnow(),
                 updated_at=datetime.utcnow()
             )
@@ -362,4 +525,4 @@ if __name__ == '__main__':
                         help=f'Maximum number of servers to scrape (default: {MAX_SERVERS})')
     args = parser.parse_args()
 
-    asyncio.run(main(max_servers=args.max_servers))
+    asyncio.run(run_in_http_scope(main(max_servers=args.max_servers)))
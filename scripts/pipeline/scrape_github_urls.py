@@ -18,12 +18,36 @@ if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
 from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.fetch_strategy import HybridFetcher
+from src.network.http_pool import run_in_http_scope
 
 # Configuration
 DB_PATH = project_root / 'data' / 'mcp_servers.db'
 OUTPUT_FILE = project_root / 'data' / 'github_urls_1000.json'
 MCP_SO_BASE_URL = "https://mcp.so"
 TARGET_SERVERS = 1000
+BLOCK_RESOURCES = True  # Abort images, fonts, media, CSS and trackers while scraping
+READY_TIMEOUT_MS = 10000  # Max wait for a page to become ready
+DOM_QUIET_MS = 300  # DOM-mutation quiet window that marks a page as rendered
+
+# Fields read from a server page, extracted in one round trip (see BaseScraper.extract).
+# XPath keys are used when the page is read from raw HTML, pattern keys on both
+# HybridFetcher paths
+SERVER_PAGE_FIELDS = {
+    'name': {'selector': 'h1', 'xpath': '//h1'},
+    'main_github_links': {
+        'selector': "main a[href^='https://github.com/']",
+        'xpath': "//main//a[starts-with(@href, 'https://github.com/')]",
+        'attr': 'href', 'all': True, 'limit': 1,
+    },
+    'github_links': {
+        'selector': "a[href^='https://github.com/']",
+        'xpath': "//a[starts-with(@href, 'https://github.com/')]",
+        # GitHub URL outside an anchor (e.g. in embedded page data)
+        'pattern': r'https://github\.com/[^"\'<>\s]+',
+        'attr': 'href', 'all': True, 'limit': 1,
+    },
+}
 
 
 async def scrape_server_links(max_servers=TARGET_SERVERS):
@@ -37,7 +61,7 @@ async def scrape_server_links(max_servers=TARGET_SERVERS):
     print(f"🔍 Scraping up to {max_servers} servers from mcp.so...")
     print("=" * 70)
 
-    scraper = BaseScraper(headless=True)
+    scraper = BaseScraper(headless=True, block_resources=BLOCK_RESOURCES)
     server_links = set()
     page = 1
     consecutive_empty = 0
@@ -50,7 +74,7 @@ async def scrape_server_links(max_servers=TARGET_SERVERS):
             print(f"\n📄 Page {page} - Collected: {len(server_links)}/{max_servers}")
 
             await scraper.navigate(url)
-            await asyncio.sleep(2)  # Wait for page load
+            await scraper.wait_until_ready(quiet_ms=DOM_QUIET_MS, timeout=READY_TIMEOUT_MS)
 
             # Extract server links
             html = await scraper.get_html()
@@ -96,34 +120,48 @@ async def scrape_server_links(max_servers=TARGET_SERVERS):
         await scraper.close()
 
 
-async def extract_github_url_from_server(scraper, server_url):
+async def extract_github_url_from_server(scraper, server_url, fetcher=None):
     """
     Extract GitHub URL from a single server page
 
     Args:
         scraper: BaseScraper instance
         server_url: URL of server page
+        fetcher: Optional HybridFetcher reading the page over HTTP first
 
     Returns:
         Dict with server info and GitHub URL
     """
     try:
-        await scraper.navigate(server_url)
-        await asyncio.sleep(1)
-
-        html = await scraper.get_html()
+        if fetcher:
+            # The GitHub link is the one field this script needs: without it, use the browser
+            fields = await fetcher.fetch_fields(server_url, SERVER_PAGE_FIELDS, required=('github_links',),
+                                                ready_selector='h1')
+            if fields is None:
+                return None
+        else:
+            await scraper.navigate(server_url)
+            await scraper.wait_until_ready(selector='h1', quiet_ms=DOM_QUIET_MS, timeout=READY_TIMEOUT_MS)
+
+            # Read name and GitHub links in one page round trip
+            fields = await scraper.extract(SERVER_PAGE_FIELDS)
 
         # Extract server slug from URL
         slug = server_url.split('/servers/')[-1].split('?')[0]
 
-        # Find GitHub URL (pattern: https://github.com/...)
-        import re
-        github_match = re.search(r'https://github\.com/[^"\'<>\s]+', html)
-        github_url = github_match.group(0) if github_match else None
+        github_links = fields['main_github_links'] or fields['github_links']
+        github_url = github_links[0] if github_links else None
+
+        if not github_url and not fetcher:
+            # Fallback: GitHub URL outside an anchor (e.g. in embedded page data);
+            # HybridFetcher applies the github_links pattern itself on both paths
+            import re
+            html = await scraper.get_html()
+            github_match = re.search(r'https://github\.com/[^"\'<>\s]+', html)
+            github_url = github_match.group(0) if github_match else None
 
         # Extract server name
-        name_match = re.search(r'<h1[^>]*>([^<]+)</h1>', html)
-        name = name_match.group(1).strip() if name_match else slug
+        name = fields['name'].strip() if fields['name'] else slug
 
         return {
             'slug': slug,
@@ -152,16 +190,18 @@ async def scrape_all_github_urls(server_urls):
     print(f"📥 Extracting GitHub URLs from {len(server_urls)} servers...")
     print("=" * 70)
 
-    scraper = BaseScraper(headless=True)
+    scraper = BaseScraper(headless=True, block_resources=BLOCK_RESOURCES)
+    fetcher = HybridFetcher(scraper, ready_quiet_ms=DOM_QUIET_MS, ready_timeout=READY_TIMEOUT_MS)
     results = []
 
     try:
         await scraper.start()
+        await fetcher.start()
 
         for i, server_url in enumerate(server_urls, 1):
             print(f"\n[{i}/{len(server_urls)}] Processing: {server_url}")
 
-            data = await extract_github_url_from_server(scraper, server_url)
+            data = await extract_github_url_from_server(scraper, server_url, fetcher)
 
             if data:
                 results.append(data)
@@ -179,12 +219,16 @@ async def scrape_all_github_urls(server_urls):
                 github_count = sum(1 for r in results if r.get('github_url'))
                 print(f"\n📊 Progress: {i}/{len(server_urls)} | GitHub URLs: {github_count}")
 
+        for domain, counters in fetcher.get_stats().items():
+            print(f"\n🌐 {domain}: {counters['http']} via HTTP | {counters['fallback']} via browser")
+
         return results
 
     except Exception as e:
         print(f"\n❌ Error during GitHub URL extraction: {e}")
         return results
     finally:
+        await fetcher.close()
         await scraper.close()
 
 
@@ -269,4 +313,4 @@ async def main():
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    asyncio.run(run_in_http_scope(main()))
@@ -22,12 +22,16 @@ if sys.platform == 'win32':
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.fetch_strategy import HybridFetcher
+from src.scrapers.listing_pager import ListingCapture, ApiListingPager
+from src.network.http_pool import run_in_http_scope
 from src.database.models_normalized import (
     Base, Server, MarkdownContent, GithubInfo, NpmInfo,
     McpConfigNpm, Tool, ToolParameter, Tag, ServerTag
 )
 from src.parsers.tools_parser import ToolsParser
 from src.parsers.parameters_parser import ParametersParser
+from src.parsers.tool_index import ToolIndex
 from src.enrichers.github_enricher import GitHubEnricher
 
 # Configuration
@@ -36,6 +40,56 @@ SCHEMA_PATH = project_root / 'migrations' / '001_sqlite_normalized_schema.sql'
 MIGRATION_003_PATH = project_root / 'migrations' / '003_add_tool_parameters.sql'
 MCP_SO_BASE_URL = "https://mcp.so"
 MAX_SERVERS = 300  # Increased buffer to find 100 new servers
+PAGE_POOL_SIZE = 8  # Server pages scraped concurrently
+BROWSER_CONTEXTS = 2  # Browser contexts the page pool is spread over
+BLOCK_RESOURCES = True  # Abort images, fonts, media, CSS and trackers while scraping
+READY_TIMEOUT_MS = 10000  # Max wait for a page to become ready
+DOM_QUIET_MS = 300  # DOM-mutation quiet window that marks a page as rendered
+SERVER_LINK_SELECTOR = "a[href^='/server/']"
+LISTING_MODE = 'api'  # 'api': page the "Load More" XHR endpoint over HTTP, 'dom': click in the browser
+
+# Fields read from a server page, extracted in one round trip (see BaseScraper.extract).
+# Each rule carries an XPath equivalent so it can be read from the raw HTML first
+# (see HybridFetcher); the browser is only used when the HTML lacks a GitHub link.
+SERVER_PAGE_FIELDS = {
+    # Title/name
+    'name': {'selector': 'h1', 'xpath': '//h1'},
+    # Creator username (paragraph after h1, format: @username)
+    'creator': {'selector': 'h1 + p', 'xpath': '//h1/following-sibling::*[1][self::p]'},
+    # Description (paragraph after h2), with first paragraph in main as fallback
+    'description': {'selector': 'h2 + p', 'xpath': '//h2/following-sibling::*[1][self::p]'},
+    'main_paragraph': {'selector': 'main p', 'xpath': '//main//p'},
+    # GitHub links inside main content (avoids navigation/footer links),
+    # with any non issues/pulls link as fallback
+    'main_github_links': {
+        'selector': "main a[href*='github.com']",
+        'xpath': "//main//a[contains(@href, 'github.com')]",
+        'attr': 'href',
+        'all': True,
+    },
+    'github_links': {
+        'selector': "a[href*='github.com']:not([href*='/issues']):not([href*='/pulls'])",
+        'xpath': ("//a[contains(@href, 'github.com') and not(contains(@href, '/issues'))"
+                  " and not(contains(@href, '/pulls'))]"),
+        'attr': 'href',
+        'all': True,
+    },
+    'npm_links': {
+        'selector': "a[href*='npmjs.com']",
+        'xpath': "//a[contains(@href, 'npmjs.com')]",
+        'attr': 'href',
+        'all': True,
+    },
+    # Tags (badge/tag elements)
+    'tags': {
+        'selector': "[class*='tag'], [class*='badge']",
+        'xpath': "//*[contains(@class, 'tag') or contains(@class, 'badge')]",
+        'all': True,
+    },
+}
+# Fields the server-rendered HTML must provide before the browser fallback is skipped
+# (name falls back to the listing's name, the GitHub link has no fallback)
+SERVER_PAGE_REQUIRED = ('github_links',)
 
 
 def init_database():
@@ -142,6 +196,8 @@ async def fetch_readme_from_github(owner, repo):
         README content as string, or None if failed
     """
     try:
+        # The enricher's session rides on the shared connection pool, so this
+        # reuses open connections to api.github.com across READMEs
         async with GitHubEnricher() as enricher:
             readme_data = await enricher.fetch_readme(owner, repo)
             if readme_data and readme_data.get('content'):
@@ -151,59 +207,47 @@ async def fetch_readme_from_github(owner, repo):
     return None
 
 
-def extract_tool_section(readme, tool_name):
+async def scrape_server_list(max_servers=MAX_SERVERS, mode=LISTING_MODE):
     """
-    Extract specific tool section from README for parameter parsing
+    Scrape list of all server links from mcp.so
 
     Args:
-        readme: Full README content
-        tool_name: Name of the tool to extract section for
+        max_servers: Maximum number of server URLs to collect
+        mode: 'api' captures the "Load More" XHR request on the first click and
+              pages it over HTTP, falling back to clicking when none is found;
+              'dom' always clicks "Load More" in the browser
 
     Returns:
-        Tool section as string, or None if not found
+        List of server URLs
     """
-    if not readme or not tool_name:
-        return None
-
-    # Try multiple patterns to find the tool section
-    patterns = [
-        rf'###\s+{re.escape(tool_name)}\s*\n',
-        rf'###\s+[^#\n]*{re.escape(tool_name)}[^#\n]*\n',
-        rf'\*\*{re.escape(tool_name)}\*\*',
-        rf'`{re.escape(tool_name)}`',
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, readme, re.IGNORECASE)
-        if match:
-            start = match.start()
-            # Extract context around the match (200 chars before, 2000 chars after)
-            context_start = max(0, start - 200)
-            context_end = min(len(readme), start + 2000)
-            return readme[context_start:context_end]
-
-    return None
-
-
-async def scrape_server_list(max_servers=MAX_SERVERS):
-    """Scrape list of all server links from mcp.so"""
     print("\n" + "=" * 70)
-    print(f"Loading server list from mcp.so (up to {max_servers})...")
+    print(f"Loading server list from mcp.so (up to {max_servers}, {mode} mode)...")
     print("=" * 70)
 
-    scraper = BaseScraper(headless=True)
+    scraper = BaseScraper(headless=True, block_resources=BLOCK_RESOURCES)
     server_links = set()
+    endpoint = None
+    cookies = {}
 
     try:
         await scraper.start()
+
+        capture = ListingCapture(scraper.page) if mode == 'api' else None
+        if capture:
+            capture.attach()
+
         await scraper.navigate(MCP_SO_BASE_URL)
-        await asyncio.sleep(3)
+        await scraper.wait_until_ready(selector=SERVER_LINK_SELECTOR, quiet_ms=DOM_QUIET_MS,
+                                       timeout=READY_TIMEOUT_MS)
+
+        anchors_seen = 0
 
         # Click "Load More" button several times to get more servers
         for i in range(20):  # Increased from 10 to load more servers
-            # Get current server links
-            current_links = await scraper.get_all_hrefs("a[href^='/server/']")
-            server_links.update(current_links)
+            # Only read anchors added since the previous click
+            new_links = await scraper.get_new_hrefs(SERVER_LINK_SELECTOR)
+            anchors_seen += len(new_links)
+            server_links.update(new_links)
 
             print(f"  Loaded {len(server_links)} servers so far...")
 
@@ -211,12 +255,20 @@ async def scrape_server_list(max_servers=MAX_SERVERS):
                 print(f"  Reached max limit of {max_servers} servers")
                 break
 
+            if capture and capture.endpoints:
+                # The first click revealed the listing endpoint: continue over HTTP
+                endpoint = capture.endpoints[-1]
+                cookies = {c['name']: c['value'] for c in await scraper.page.context.cookies()}
+                break
+
             # Try to click "Load More" button
             try:
                 load_more = scraper.page.locator("button:has-text('More')")
                 if await load_more.count() > 0:
                     await load_more.click()
-                    await asyncio.sleep(2)
+                    # Ready once new server links are rendered
+                    await scraper.wait_until_ready(selector=SERVER_LINK_SELECTOR, min_count=anchors_seen,
+                                                   quiet_ms=DOM_QUIET_MS, timeout=READY_TIMEOUT_MS)
                 else:
                     print("  ℹ️  No more 'Load More' button found")
                     break
@@ -224,35 +276,54 @@ async def scrape_server_list(max_servers=MAX_SERVERS):
                 print(f"  ℹ️  Could not click 'Load More': {e}")
                 break
 
-        # Convert to full URLs
-        server_urls = [f"{MCP_SO_BASE_URL}{link}" if link.startswith('/') else link
-                      for link in list(server_links)[:max_servers]]
-
-        print(f"✅ Found {len(server_urls)} server URLs")
-        return server_urls
+            if capture and i == 0 and not capture.endpoints:
+                print("  ℹ️  No listing endpoint captured, continuing in DOM mode")
+                capture.detach()
+                capture = None
 
     finally:
         await scraper.close()
 
+    if endpoint:
+        print(f"  🔌 Paging listing endpoint over HTTP ({endpoint.method} {endpoint.url})")
+        pager = ApiListingPager(endpoint, cookies=cookies)
+        server_links.update(await pager.collect(max_servers, known=server_links))
+        print(f"  Loaded {len(server_links)} servers after {pager.stats['requests']} request(s)")
+
+    # Convert to full URLs
+    server_urls = [f"{MCP_SO_BASE_URL}{link}" if link.startswith('/') else link
+                   for link in list(server_links)[:max_servers]]
 
-async def scrape_servers(server_urls, session, target_new_servers=100):
+    print(f"✅ Found {len(server_urls)} server URLs")
+    return server_urls
+
+
+async def scrape_servers(server_urls, session, target_new_servers=100,
+                         pool_size=PAGE_POOL_SIZE, contexts=BROWSER_CONTEXTS):
     """
     Scrape detailed information for each server
     Continues until target_new_servers new servers are collected
 
+    Server pages are scraped concurrently through a BaseScraper page pool;
+    database checks and writes stay serial in this coroutine.
+
     Args:
         server_urls: List of server URLs to scrape
         session: SQLAlchemy session
         target_new_servers: Number of new servers to collect (default: 100)
+        pool_size: Number of browser pages kept busy at once
+        contexts: Number of browser contexts the pages are spread over
 
     Returns:
         dict: Statistics about the scraping process
     """
     print("\n" + "=" * 70)
     print(f"Scraping servers until {target_new_servers} new ones found...")
+    print(f"  Page pool: {pool_size} pages over {contexts} context(s)")
     print("=" * 70)
 
-    scraper = BaseScraper(headless=True)
+    scraper = BaseScraper(headless=True, pool_size=pool_size, contexts=contexts,
+                          block_resources=BLOCK_RESOURCES)
     stats = {
         'processed': 0,      # Total URLs examined
         'new_servers': 0,    # New servers successfully saved
@@ -262,25 +333,25 @@ async def scrape_servers(server_urls, session, target_new_servers=100):
 
     tags_map = {}
     url_index = 0
+    fetcher = HybridFetcher(scraper, ready_quiet_ms=DOM_QUIET_MS, ready_timeout=READY_TIMEOUT_MS)
 
     try:
         await scraper.start()
+        await fetcher.start()
 
         # Continue until we have enough new servers OR run out of URLs
         while stats['new_servers'] < target_new_servers and url_index < len(server_urls):
-            url = server_urls[url_index]
-            url_index += 1
-            stats['processed'] += 1
-
-            print(f"\n[{stats['processed']}] Checking: {url}")
-            print(f"  Progress: {stats['new_servers']}/{target_new_servers} new | "
-                  f"{stats['skipped']} skipped | {stats['errors']} errors")
+            # Collect a window of candidate URLs (twice the pool so pages never idle)
+            window = []
+            while len(window) < scraper.pool_size * 2 and url_index < len(server_urls):
+                url = server_urls[url_index]
+                url_index += 1
+                stats['processed'] += 1
 
-            try:
                 # Quick check: extract slug from URL
                 parts = url.split('/')
                 if len(parts) < 5:
-                    print(f"  ❌ Invalid URL format")
+                    print(f"\n[{stats['processed']}] ❌ Invalid URL format: {url}")
                     stats['errors'] += 1
                     continue
 
@@ -289,44 +360,59 @@ async def scrape_servers(server_urls, session, target_new_servers=100):
 
                 # Check if server already exists (by slug only at this stage)
                 if server_exists_in_db(session, preliminary_slug):
-                    print(f"  ⏭️  SKIPPED: Already in database (slug: {preliminary_slug})")
+                    print(f"\n[{stats['processed']}] ⏭️  SKIPPED: Already in database (slug: {preliminary_slug})")
                     stats['skipped'] += 1
                     continue
 
-                # Server is potentially new, do full scrape
-                print(f"  🔍 Scraping details...")
-                data = await scrape_single_server(scraper, url)
+                window.append(url)
 
-                if not data:
-                    print(f"  ❌ Failed to scrape")
-                    stats['errors'] += 1
+            if not window:
+                continue
+
+            # Server is potentially new, do full scrape (concurrently)
+            print(f"\n  🔍 Scraping {len(window)} server(s) concurrently...")
+            tasks = [asyncio.create_task(_scrape_with_url(scraper, url, fetcher)) for url in window]
+
+            for next_done in asyncio.as_completed(tasks):
+                url, data = await next_done
+
+                print(f"\n  Checking: {url}")
+                print(f"  Progress: {stats['new_servers']}/{target_new_servers} new | "
+                      f"{stats['skipped']} skipped | {stats['errors']} errors")
+
+                if stats['new_servers'] >= target_new_servers:
+                    # Target reached while the window was in flight
                     continue
 
-                # Double-check with GitHub URL if available
-                if data.get('github_url'):
-                    if server_exists_in_db(session, data['slug'], data['github_url']):
-                        print(f"  ⏭️  SKIPPED: Already in database (GitHub URL match)")
-                        stats['skipped'] += 1
+                try:
+                    if not data:
+                        print(f"  ❌ Failed to scrape")
+                        stats['errors'] += 1
                         continue
 
-                # Server is truly new, save it
-                saved = save_server_to_db(session, data, tags_map)
-                if saved:
-                    session.commit()
-                    stats['new_servers'] += 1
-                    print(f"  ✅ SAVED: {data.get('name', 'Unknown')} "
-                          f"({stats['new_servers']}/{target_new_servers})")
-                else:
-                    session.rollback()
-                    stats['errors'] += 1
-
-                await asyncio.sleep(0.5)
+                    # Double-check with GitHub URL if available
+                    if data.get('github_url'):
+                        if server_exists_in_db(session, data['slug'], data['github_url']):
+                            print(f"  ⏭️  SKIPPED: Already in database (GitHub URL match)")
+                            stats['skipped'] += 1
+                            continue
+
+                    # Server is truly new, save it
+                    saved = save_server_to_db(session, data, tags_map)
+                    if saved:
+                        session.commit()
+                        stats['new_servers'] += 1
+                        print(f"  ✅ SAVED: {data.get('name', 'Unknown')} "
+                              f"({stats['new_servers']}/{target_new_servers})")
+                    else:
+                        session.rollback()
+                        stats['errors'] += 1
 
-            except Exception as e:
-                print(f"  ❌ Error: {e}")
-                stats['errors'] += 1
-                session.rollback()
-                continue
+                except Exception as e:
+                    print(f"  ❌ Error: {e}")
+                    stats['errors'] += 1
+                    session.rollback()
+                    continue
 
         # Check if we reached the target
         if stats['new_servers'] >= target_new_servers:
@@ -334,21 +420,57 @@ async def scrape_servers(server_urls, session, target_new_servers=100):
         else:
             print(f"\n⚠️  Ran out of servers! Only {stats['new_servers']}/{target_new_servers} new servers found.")
 
+        if BLOCK_RESOURCES:
+            print_resource_stats(scraper)
+        print_readiness_stats(scraper)
+        print_fetch_stats(fetcher)
+
         return stats
 
     finally:
+        await fetcher.close()
         await scraper.close()
 
 
-async def scrape_single_server(scraper, url):
-    """Scrape a single server page"""
-    try:
-        success = await scraper.navigate(url)
-        if not success:
-            return None
+def print_resource_stats(scraper):
+    """Print request interception counters for a scraper run"""
+    resource_stats = scraper.get_resource_stats()
+    blocked_types = ', '.join(f"{kind}: {count}" for kind, count
+                              in sorted(resource_stats['blocked_by_type'].items())) or 'none'
+    print(f"  🛡️  Requests allowed: {resource_stats['allowed_requests']} "
+          f"({resource_stats['allowed_bytes'] / 1024:.0f} KB transferred) | "
+          f"blocked: {resource_stats['blocked_requests']} ({blocked_types})")
+
+
+def print_readiness_stats(scraper):
+    """Print how long pages took to become ready"""
+    readiness = scraper.get_readiness_stats()
+    print(f"  ⏱️  Page readiness: avg {readiness['avg_ms']:.0f}ms | max {readiness['max_ms']:.0f}ms | "
+          f"{readiness['timeouts']}/{readiness['waits']} timed out")
 
-        await asyncio.sleep(2)
 
+def print_fetch_stats(fetcher):
+    """Print how many pages were read over plain HTTP vs the browser fallback"""
+    for domain, counters in fetcher.get_stats().items():
+        print(f"  🌐 {domain}: {counters['http']} via HTTP | {counters['fallback']} via browser "
+              f"({counters['fallback_rate']:.0%} fallback) | {counters['failed']} failed")
+
+
+async def _scrape_with_url(scraper, url, fetcher=None):
+    """Scrape a server page and return it paired with its URL"""
+    return url, await scrape_single_server(scraper, url, fetcher)
+
+
+async def scrape_single_server(scraper, url, fetcher=None):
+    """
+    Scrape a single server page
+
+    With a HybridFetcher the page is read from its server-rendered HTML and
+    a browser page is only used when that HTML lacks the required fields.
+    A browser page is leased from `scraper` only while the mcp.so page is
+    read, so README fetching and parsing don't hold a pooled page.
+    """
+    try:
         # Extract server name from URL: /server/{name}/{owner}
         parts = url.split('/')
         if len(parts) < 5:
@@ -357,28 +479,31 @@ async def scrape_single_server(scraper, url):
         server_name = parts[-2]
         owner = parts[-1]
 
-        # Get title/name
-        name = await scraper.get_text("h1")
-        if not name:
-            name = server_name
+        if fetcher:
+            fields = await fetcher.fetch_fields(url, SERVER_PAGE_FIELDS, required=SERVER_PAGE_REQUIRED,
+                                                ready_selector='h1')
+            if fields is None:
+                return None
+        else:
+            async with scraper.lease() as page_scraper:
+                success = await page_scraper.navigate(url)
+                if not success:
+                    return None
 
-        # Get creator username (from paragraph after h1, format: @username)
-        creator_text = await scraper.get_text("h1 + p") or ""
-        creator = creator_text.strip('@').strip() if creator_text.startswith('@') else owner
+                await page_scraper.wait_until_ready(selector='h1', quiet_ms=DOM_QUIET_MS,
+                                                    timeout=READY_TIMEOUT_MS)
 
-        # Get description (from paragraph after h2)
-        description = await scraper.get_text("h2 + p") or ""
-        if not description:
-            # Fallback to first paragraph in main
-            description = await scraper.get_text("main p") or ""
+                # Read every field in one page round trip
+                fields = await page_scraper.extract(SERVER_PAGE_FIELDS)
+
+        name = fields['name'] or server_name
+
+        creator_text = fields['creator'] or ""
+        creator = creator_text.strip('@').strip() if creator_text.startswith('@') else owner
 
-        # Look for GitHub link (inside main content only, exclude issues/pulls)
-        # Use main content to avoid navigation/footer links
-        github_links = await scraper.get_all_hrefs("main a[href*='github.com']")
-        if not github_links:
-            # Fallback: exclude issues/pulls links
-            github_links = await scraper.get_all_hrefs("a[href*='github.com']:not([href*='/issues']):not([href*='/pulls'])")
+        description = fields['description'] or fields['main_paragraph'] or ""
 
+        github_links = fields['main_github_links'] or fields['github_links']
         github_url = github_links[0] if github_links else None
 
         # Clean GitHub URL: remove blob/tree paths for monorepos
@@ -388,14 +513,10 @@ async def scrape_single_server(scraper, url):
             parts = github_url.split('/blob/')[0] if '/blob/' in github_url else github_url.split('/tree/')[0]
             github_url = parts
 
-        # Look for npm link
-        npm_links = await scraper.get_all_hrefs("a[href*='npmjs.com']")
+        npm_links = fields['npm_links']
         npm_url = npm_links[0] if npm_links else None
 
-        # Get tags (look for badge/tag elements)
-        tags = []
-        tag_elements = await scraper.get_all_text("[class*='tag'], [class*='badge']")
-        tags = [t.strip() for t in tag_elements if t.strip() and len(t) < 50]
+        tags = [t.strip() for t in fields['tags'] if t.strip() and len(t) < 50]
 
         # Fetch README and extract tools if GitHub URL available
         readme_content = None
@@ -415,11 +536,12 @@ async def scrape_single_server(scraper, url):
                     if parsed_tools:
                         print(f"  ✅ Found {len(parsed_tools)} tools")
                         params_parser = ParametersParser()
+                        tool_index = ToolIndex(readme_content)
 
                         for tool_data in parsed_tools:
                             # Extract tool section for parameter parsing
-                            tool_section = extract_tool_section(readme_content, tool_data['name'])
-                            if tool_section:
+                            tool_section = tool_index.tool_section(tool_data['name'])
+                            if tool_section is not None:
                                 params = params_parser.parse_parameters(tool_section)
                                 tool_data['parameters'] = params
                                 if params:
@@ -657,4 +779,4 @@ async def main():
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    asyncio.run(run_in_http_scope(main()))
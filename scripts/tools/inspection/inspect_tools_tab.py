@@ -35,7 +35,8 @@ async def inspect_tools_tab(scraper, slug):
 
     try:
         await scraper.navigate(url)
-        await asyncio.sleep(3)  # Wait for dynamic content to load
+        # Wait for dynamic content to load
+        await scraper.wait_until_ready(network_idle=True, quiet_ms=500, timeout=15000)
 
         # Take screenshot
         screenshot_path = project_root / 'data' / 'inspection' / f"{slug}_tools.png"
@@ -64,10 +65,27 @@ async def inspect_tools_tab(scraper, slug):
             "tbody tr",
         ]
 
+        # Common patterns for tool data
+        tool_patterns = [
+            ("h2", "Tool headings"),
+            ("h3", "Tool headings"),
+            ("[class*='name']", "Name fields"),
+            ("[class*='description']", "Description fields"),
+            ("code", "Code blocks (may contain schemas)"),
+            ("pre", "Pre-formatted text"),
+        ]
+
         print(f"\n  Analyzing page structure...")
 
+        # Read body text, counts and samples for every selector in one round trip
+        spec = {'body': 'body'}
+        for selector in selectors_to_try + [selector for selector, _ in tool_patterns]:
+            spec[f"count:{selector}"] = {'selector': selector, 'count': True}
+            spec[f"samples:{selector}"] = {'selector': selector, 'all': True, 'limit': 5}
+        fields = await scraper.extract(spec)
+
         # Get all text content first
-        body_text = await scraper.page.text_content("body")
+        body_text = fields['body'] or ""
         has_no_tools = "no tools" in body_text.lower() or "0 tools" in body_text.lower()
 
         if has_no_tools:
@@ -77,24 +95,17 @@ async def inspect_tools_tab(scraper, slug):
         # Try each selector
         found_items = []
         for selector in selectors_to_try:
-            try:
-                elements = await scraper.page.query_selector_all(selector)
-                if elements and len(elements) > 0:
-                    # Get text from first few elements
-                    sample_texts = []
-                    for i, elem in enumerate(elements[:5]):
-                        text = await elem.text_content()
-                        if text and len(text.strip()) > 0:
-                            sample_texts.append(text.strip()[:80])
-
-                    if sample_texts:
-                        found_items.append({
-                            'selector': selector,
-                            'count': len(elements),
-                            'samples': sample_texts
-                        })
-            except:
-                pass
+            count = fields[f"count:{selector}"]
+            if count > 0:
+                # Get text from first few elements
+                sample_texts = [text.strip()[:80] for text in fields[f"samples:{selector}"] if text.strip()]
+
+                if sample_texts:
+                    found_items.append({
+                        'selector': selector,
+                        'count': count,
+                        'samples': sample_texts
+                    })
 
         if found_items:
             print(f"\n  Found {len(found_items)} potential tool containers:")
@@ -108,32 +119,18 @@ async def inspect_tools_tab(scraper, slug):
         # Check for specific tool attributes
         print(f"\n  Checking for tool names/descriptions...")
 
-        # Common patterns for tool data
-        tool_patterns = [
-            ("h2", "Tool headings"),
-            ("h3", "Tool headings"),
-            ("[class*='name']", "Name fields"),
-            ("[class*='description']", "Description fields"),
-            ("code", "Code blocks (may contain schemas)"),
-            ("pre", "Pre-formatted text"),
-        ]
-
         tool_data_found = []
         for selector, description in tool_patterns:
-            try:
-                elements = await scraper.page.query_selector_all(selector)
-                if elements and len(elements) > 0:
-                    # Sample first element
-                    text = await elements[0].text_content()
-                    if text:
-                        tool_data_found.append({
-                            'type': description,
-                            'selector': selector,
-                            'count': len(elements),
-                            'sample': text.strip()[:100]
-                        })
-            except:
-                pass
+            count = fields[f"count:{selector}"]
+            samples = fields[f"samples:{selector}"]
+            if count > 0 and samples:
+                # Sample first element
+                tool_data_found.append({
+                    'type': description,
+                    'selector': selector,
+                    'count': count,
+                    'sample': samples[0].strip()[:100]
+                })
 
         if tool_data_found:
             print(f"  Found {len(tool_data_found)} types of tool data:")
@@ -0,0 +1,132 @@
+"""
+Stress benchmark for the README parsers
+Builds large and malformed markdown documents (long whitespace runs, lines
+of pipes, unclosed fences, docker commands without an image, deep lists...)
+at increasing sizes and times ReadmeParser, ToolsParser and the
+ToolIndex + ParametersParser lookup on each. Parsing is linear when the
+time per KB stays flat as documents grow; the script fails if it grows by
+more than MAX_GROWTH between the smallest and the largest size.
+
+Usage:
+    python scripts/tools/utils/benchmark_parser_stress.py
+    python scripts/tools/utils/benchmark_parser_stress.py --sizes 32 128 512
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Fix encoding for Windows
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+from src.parsers.markdown_document import parse_markdown
+from src.parsers.readme_parser import ReadmeParser
+from src.parsers.tools_parser import ToolsParser
+from src.parsers.parameters_parser import ParametersParser
+from src.parsers.tool_index import ToolIndex
+
+# Document sizes in KB
+DEFAULT_SIZES = [16, 64, 256]
+
+# Allowed ratio between the time per KB at the largest and smallest size
+MAX_GROWTH = 3.0
+
+# Runs per document (the fastest is kept)
+REPEAT = 3
+
+
+def repeat_to(unit: str, size: int) -> str:
+    """Repeat a snippet up to `size` characters"""
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def tools_readme(size: int) -> str:
+    """Well-formed README with a large Tools section"""
+    tool = ("### **browser_action_{i}**\nPerform action {i}.\n\n"
+            "- Parameters:\n"
+            "  - `element` (string): Element description\n"
+            "  - `timeout` (number, optional): Timeout, defaults to 30.\n\n")
+    body = ''.join(tool.format(i=i) for i in range(size // 150 + 1))
+    return "# Server\n\n## Tools\n\n" + body[:size]
+
+
+# Generators: size in characters -> markdown
+CORPUS = {
+    'tools_section': tools_readme,
+    'heading_whitespace': lambda n: '# a' + ' ' * n + 'b\n',
+    'table_whitespace': lambda n: ' ' * n + 'x|\n',
+    'pipe_lines': lambda n: repeat_to('|' * 200 + '\n', n),
+    'docker_without_image': lambda n: '```bash\ndocker run ' + 'a' * n + '\n```\n',
+    'env_name_run': lambda n: '```\n' + 'A' * n + '\n```\n',
+    'unclosed_fences': lambda n: repeat_to('```\n- item\n# heading\n````\n', n),
+    'deep_lists': lambda n: ''.join(' ' * (i % 60) + '- `param` - text\n' for i in range(n // 70)),
+    'unbalanced_inline': lambda n: repeat_to('**a `b ', n),
+    'single_line': lambda n: repeat_to('word ', n),
+}
+
+
+def run_parsers(text: str):
+    """Parse a document the way the pipeline does"""
+    parse_markdown.cache_clear()
+    ReadmeParser(text, max_seconds=None).parse_all()
+    # Tokenize lists and tables over the whole document, not only the Tools section
+    parse_markdown(text).tables
+    tools = ToolsParser(max_seconds=None).parse_tools(text)
+    index = ToolIndex(text)
+    parser = ParametersParser()
+    for tool in tools:
+        section = index.tool_section(tool['name'])
+        if section is not None:
+            parser.parse_parameters(section)
+
+
+def time_document(text: str) -> float:
+    """Fastest of REPEAT runs, in seconds"""
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        run_parsers(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Stress benchmark for the README parsers')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help=f'Document sizes in KB (default: {DEFAULT_SIZES})')
+    args = parser.parse_args()
+    sizes = sorted(args.sizes)
+
+    print("\n" + "=" * 70)
+    print("⏱️  README Parsers Stress Benchmark")
+    print("=" * 70)
+    print(f"Sizes: {', '.join(f'{size} KB' for size in sizes)}")
+    print(f"{'document':24s}" + ''.join(f"{f'{size} KB':>14s}" for size in sizes) + f"{'growth':>10s}")
+
+    failures = []
+    for name, generate in CORPUS.items():
+        per_kb = []
+        for size in sizes:
+            per_kb.append(time_document(generate(size * 1024)) / size * 1e6)
+        growth = per_kb[-1] / per_kb[0] if per_kb[0] else 0.0
+        status = "✅" if growth <= MAX_GROWTH else "❌"
+        print(f"{name:24s}" + ''.join(f"{value:11.0f}µs" for value in per_kb) + f"{growth:9.1f}x {status}")
+        if growth > MAX_GROWTH:
+            failures.append(name)
+
+    print("\n" + "=" * 70)
+    if failures:
+        print(f"❌ Time per KB grows more than {MAX_GROWTH}x for: {', '.join(failures)}")
+        sys.exit(1)
+    print(f"✅ Time per KB stays within {MAX_GROWTH}x across sizes (µs per KB shown)")
+
+
+if __name__ == '__main__':
+    main()
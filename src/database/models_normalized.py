@@ -101,6 +101,7 @@ class MarkdownContent(Base):
     word_count = Column(Integer)
     estimated_reading_time_minutes = Column(Integer)
     extracted_from = Column(Text)
+    source_sha = Column(Text)  # Git blob sha of the source file (READMEs), to detect unchanged content
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -660,6 +661,10 @@ class McpSoServerUrl(Base):
     phase2_last_attempt = Column(DateTime)
     phase2_error = Column(Text)
 
+    # Work queue lease (see src/database/work_queue.py)
+    lease_owner = Column(Text)
+    lease_expires_at = Column(DateTime)
+
     # GitHub information (populated in Phase 2)
     github_url = Column(Text)
     github_owner = Column(Text)
@@ -682,3 +687,24 @@ class McpSoServerUrl(Base):
 
     def __repr__(self):
         return f"<McpSoServerUrl(slug='{self.slug}', status='{self.phase2_status}')>"
+
+
+# ============================================================================
+# Parse Cache (see src/parsers/parse_cache.py)
+# ============================================================================
+
+class ParseCacheEntry(Base):
+    """
+    README parse result, keyed by content hash and parser version
+    Lets enrichers skip READMEs that did not change since the last run
+    """
+    __tablename__ = 'parse_cache'
+
+    content_sha256 = Column(String(64), primary_key=True)
+    parser = Column(String(50), primary_key=True)
+    parser_version = Column(String(20), primary_key=True)
+    result = Column(Text, nullable=False)  # JSON
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ParseCacheEntry(parser='{self.parser}', version='{self.parser_version}', sha='{self.content_sha256[:12]}')>"
@@ -0,0 +1,228 @@
+"""
+Leased work queue over mcp_so_server_urls for phase 2 workers
+Rows are claimed atomically with a lease; a worker that dies simply lets its
+lease expire and the rows go back to 'pending' for another worker.
+"""
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, List, Iterable, Dict
+
+from sqlalchemy import select, update, func, case, or_
+from loguru import logger
+
+from src.database.models_normalized import McpSoServerUrl
+
+
+class Phase2WorkQueue:
+    """
+    Claim/heartbeat/complete/fail API over the phase 2 staging table
+
+    Claims run as a single UPDATE ... WHERE id IN (SELECT ... LIMIT n):
+    SQLite serializes writers so the statement is atomic; on PostgreSQL the
+    inner SELECT uses FOR UPDATE SKIP LOCKED so concurrent workers (on any
+    machine) never block on or double-claim the same rows.
+    """
+
+    def __init__(self, session, worker_id: Optional[str] = None,
+                 lease_seconds: int = 300, max_attempts: int = 3):
+        """
+        Initialize the queue
+
+        Args:
+            session: SQLAlchemy session (one per worker process)
+            worker_id: Lease owner name (default: host:pid:random)
+            lease_seconds: Lease duration before a claim is considered abandoned
+            max_attempts: Attempts after which a row is marked 'failed'
+        """
+        self.session = session
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        dialect = session.get_bind().dialect.name
+        self.skip_locked = dialect == 'postgresql'
+
+    def _expiry(self, now: datetime) -> datetime:
+        """Lease expiry for a claim or heartbeat made at `now`"""
+        return now + timedelta(seconds=self.lease_seconds)
+
+    def reclaim_expired(self) -> int:
+        """
+        Put rows with an expired lease back in the queue
+
+        Rows that already used all their attempts are marked 'failed'.
+        'processing' rows without a lease (left by pre-queue runs) are
+        treated as expired.
+
+        Returns:
+            Number of rows reclaimed
+        """
+        now = datetime.utcnow()
+        result = self.session.execute(
+            update(McpSoServerUrl)
+            .where(McpSoServerUrl.phase2_status == 'processing')
+            .where(or_(McpSoServerUrl.lease_expires_at == None, McpSoServerUrl.lease_expires_at < now))
+            .values(
+                phase2_status=case(
+                    (McpSoServerUrl.phase2_attempts >= self.max_attempts, 'failed'),
+                    else_='pending'
+                ),
+                phase2_error=func.coalesce(McpSoServerUrl.phase2_error, 'lease expired'),
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+
+        if result.rowcount:
+            logger.info(f"Reclaimed {result.rowcount} expired lease(s)")
+        return result.rowcount
+
+    def claim(self, batch_size: int) -> List[McpSoServerUrl]:
+        """
+        Claim up to `batch_size` pending rows, highest priority first
+
+        Expired leases are reclaimed first, so abandoned work is picked up
+        without a separate janitor process.
+
+        Args:
+            batch_size: Maximum rows to claim
+
+        Returns:
+            Claimed rows (phase2_status 'processing', leased to this worker)
+        """
+        self.reclaim_expired()
+
+        now = datetime.utcnow()
+        candidates = (
+            select(McpSoServerUrl.id)
+            .where(McpSoServerUrl.phase2_status == 'pending')
+            .order_by(McpSoServerUrl.priority.desc(), McpSoServerUrl.discovered_at.asc())
+            .limit(batch_size)
+        )
+        if self.skip_locked:
+            candidates = candidates.with_for_update(skip_locked=True)
+
+        self.session.execute(
+            update(McpSoServerUrl)
+            .where(McpSoServerUrl.id.in_(candidates.scalar_subquery()))
+            .where(McpSoServerUrl.phase2_status == 'pending')
+            .values(
+                phase2_status='processing',
+                phase2_attempts=McpSoServerUrl.phase2_attempts + 1,
+                phase2_last_attempt=now,
+                lease_owner=self.worker_id,
+                lease_expires_at=self._expiry(now),
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+
+        # Rows of this claim: same owner and same claim timestamp
+        return self.session.execute(
+            select(McpSoServerUrl)
+            .where(McpSoServerUrl.lease_owner == self.worker_id)
+            .where(McpSoServerUrl.phase2_status == 'processing')
+            .where(McpSoServerUrl.phase2_last_attempt == now)
+            .order_by(McpSoServerUrl.priority.desc(), McpSoServerUrl.discovered_at.asc())
+        ).scalars().all()
+
+    def heartbeat(self, ids: Iterable[str]) -> int:
+        """
+        Extend the lease of rows still held by this worker
+
+        Args:
+            ids: Row ids to renew
+
+        Returns:
+            Number of leases renewed (fewer than requested means some were lost)
+        """
+        ids = list(ids)
+        if not ids:
+            return 0
+
+        now = datetime.utcnow()
+        result = self.session.execute(
+            update(McpSoServerUrl)
+            .where(McpSoServerUrl.id.in_(ids))
+            .where(McpSoServerUrl.lease_owner == self.worker_id)
+            .where(McpSoServerUrl.phase2_status == 'processing')
+            .values(lease_expires_at=self._expiry(now), updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        return result.rowcount
+
+    def complete(self, row_id: str, **fields) -> bool:
+        """
+        Mark a claimed row as completed
+
+        Args:
+            row_id: Row id
+            **fields: Extra columns to set (e.g. github_url, github_owner, github_repo)
+
+        Returns:
+            False if the lease was no longer held by this worker
+        """
+        now = datetime.utcnow()
+        result = self.session.execute(
+            update(McpSoServerUrl)
+            .where(McpSoServerUrl.id == row_id)
+            .where(McpSoServerUrl.lease_owner == self.worker_id)
+            .values(
+                phase2_status='completed',
+                phase2_error=None,
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=now,
+                **fields
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        return result.rowcount == 1
+
+    def fail(self, row_id: str, error: str) -> bool:
+        """
+        Release a claimed row after a failed attempt
+
+        The row goes back to 'pending' until it reaches max_attempts, then 'failed'.
+
+        Args:
+            row_id: Row id
+            error: Error message stored in phase2_error
+
+        Returns:
+            False if the lease was no longer held by this worker
+        """
+        now = datetime.utcnow()
+        result = self.session.execute(
+            update(McpSoServerUrl)
+            .where(McpSoServerUrl.id == row_id)
+            .where(McpSoServerUrl.lease_owner == self.worker_id)
+            .values(
+                phase2_status=case(
+                    (McpSoServerUrl.phase2_attempts >= self.max_attempts, 'failed'),
+                    else_='pending'
+                ),
+                phase2_error=error[:1000],
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        return result.rowcount == 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Count rows per phase2_status"""
+        rows = self.session.execute(
+            select(McpSoServerUrl.phase2_status, func.count()).group_by(McpSoServerUrl.phase2_status)
+        ).all()
+        return {status: count for status, count in rows}
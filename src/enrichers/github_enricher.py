@@ -3,20 +3,87 @@ GitHub Enricher - Fetches repository metadata and README content
 Uses GitHub REST API v3 with authentication
 """
 import os
-import time
+import re
+import codecs
+import hashlib
 import asyncio
+import json
 import aiohttp
-from datetime import datetime
-from typing import Dict, Optional, List
+from datetime import datetime, timedelta
+from typing import Dict, Optional, List, Tuple
 from pathlib import Path
 from dotenv import load_dotenv
 
+from src.network.http_pool import get_http_registry
+from src.network.response_cache import ResponseCache, get_response_cache
+from src.enrichers.github_rate_limit import TokenPool
+from src.enrichers.single_flight import SingleFlight, get_single_flight
+
 # Load environment variables from config/.env
 project_root = Path(__file__).parent.parent.parent
 load_dotenv(project_root / 'config' / '.env')
 
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
 GITHUB_API_BASE = 'https://api.github.com'
+GITHUB_GRAPHQL_URL = f'{GITHUB_API_BASE}/graphql'
+
+# Repositories fetched per GraphQL query (aliased repository() fields)
+GRAPHQL_BATCH_SIZE = 50
+
+# Repositories enriched at once by enrich_multiple / fetch_comprehensive_multiple
+DEFAULT_REPO_CONCURRENCY = 8
+
+# Retries of a request rejected by a (secondary) rate limit
+MAX_RATE_LIMIT_RETRIES = 3
+
+# README bodies are cut off beyond this size (raw mode)
+README_MAX_BYTES = 1024 * 1024
+README_CHUNK_SIZE = 16 * 1024
+RAW_MEDIA_TYPE = 'application/vnd.github.raw'
+SHA_MEDIA_TYPE = 'application/vnd.github.sha'
+
+# Last page number of a paginated response: <...&page=42>; rel="last"
+LINK_LAST_PAGE_PATTERN = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+# A strong ETag holding a 40-hex git object id
+SHA_ETAG_PATTERN = re.compile(r'^(?:W/)?"([0-9a-f]{40})"$')
+
+# Repositories checked per light-weight change-detection query
+PRECHECK_BATCH_SIZE = 100
+PRECHECK_REPO_FIELDS = "pushedAt stargazerCount forkCount"
+
+# Per-repository selection mirroring the REST calls of fetch_comprehensive_info
+# Aliases of the README lookups in GRAPHQL_REPO_FIELDS (the usual README paths)
+GRAPHQL_README_ALIASES = ('readme', 'readmeLower', 'readmePlain', 'readmeRst', 'githubReadme')
+
+GRAPHQL_REPO_FIELDS = """
+    url
+    description
+    stargazerCount
+    forkCount
+    pushedAt
+    createdAt
+    watchers { totalCount }
+    issues(states: OPEN) { totalCount }
+    pullRequests(states: OPEN) { totalCount }
+    primaryLanguage { name }
+    licenseInfo { name }
+    codeOfConduct { name }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    languages(first: 20, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }
+    latestRelease { tagName name publishedAt isPrerelease description }
+    contributing: object(expression: "HEAD:CONTRIBUTING.md") { id }
+    githubContributing: object(expression: "HEAD:.github/CONTRIBUTING.md") { id }
+    readme: object(expression: "HEAD:README.md") { id }
+    readmeLower: object(expression: "HEAD:readme.md") { id }
+    readmePlain: object(expression: "HEAD:README") { id }
+    readmeRst: object(expression: "HEAD:README.rst") { id }
+    githubReadme: object(expression: "HEAD:.github/README.md") { id }
+    defaultBranchRef {
+      name
+      target { ... on Commit { history(since: $since) { totalCount } } }
+    }
+"""
 
 
 class GitHubEnricher:
@@ -24,18 +91,26 @@ class GitHubEnricher:
     Enriches server data with GitHub repository information
     """
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, cache: Optional[ResponseCache] = None,
+                 pool: Optional[TokenPool] = None, single_flight: Optional[SingleFlight] = None):
         """
         Initialize GitHub enricher
 
         Args:
-            token: GitHub personal access token (optional, uses env var if not provided)
+            token: GitHub personal access token (optional, uses GITHUB_TOKENS / GITHUB_TOKEN if not provided)
+            cache: Conditional-request cache (default: shared cache when ENABLE_CACHE is set)
+            pool: Token pool routing and pacing every request (default: built from token / env)
+            single_flight: Per-repository request coalescer (default: shared process-wide)
         """
-        self.token = token or GITHUB_TOKEN
+        self.pool = pool or TokenPool.from_env(token)
+        self.token = self.pool.tokens[0]
+        self.cache = cache if cache is not None else get_response_cache()
+        self.single_flight = single_flight or get_single_flight()
         self.session: Optional[aiohttp.ClientSession] = None
         self.rate_limit_remaining = 5000
         self.rate_limit_reset = 0
         self.request_count = 0
+        self.graphql_request_count = 0
 
     async def __aenter__(self):
         """Async context manager entry"""
@@ -47,16 +122,14 @@ class GitHubEnricher:
         await self.close()
 
     async def start(self):
-        """Start HTTP session"""
+        """Start HTTP session (pooled connections shared process-wide)"""
+        # Authorization is set per request, by the token the pool picks
         headers = {
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': 'MCP-Hub-Scraper/1.0'
         }
 
-        if self.token:
-            headers['Authorization'] = f'token {self.token}'
-
-        self.session = aiohttp.ClientSession(headers=headers)
+        self.session = get_http_registry().session(headers=headers)
 
     async def close(self):
         """Close HTTP session"""
@@ -64,21 +137,37 @@ class GitHubEnricher:
             await self.session.close()
             self.session = None
 
-    async def _check_rate_limit(self):
-        """Check and wait if rate limit is exceeded"""
-        if self.rate_limit_remaining <= 1:
-            # Wait until rate limit resets
-            wait_time = max(0, self.rate_limit_reset - time.time())
-            if wait_time > 0:
-                print(f"  ⏳ Rate limit reached. Waiting {wait_time:.0f}s...")
-                await asyncio.sleep(wait_time + 1)
+    @staticmethod
+    def _flight_key(kind: str, owner: str, repo: str, *extra) -> str:
+        """Single-flight key: GitHub owner/repo names are case-insensitive"""
+        key = f"{kind}:{owner.lower()}/{repo.lower()}"
+        return ':'.join([key, *map(str, extra)]) if extra else key
+
+    async def _check_rate_limit(self, resource: str = 'core') -> Optional[str]:
+        """
+        Wait until a token of the pool may send the next request
+
+        Args:
+            resource: Rate-limit resource of the request ('core' for REST, 'graphql')
+
+        Returns:
+            The token to use (None when anonymous)
+        """
+        return await self.pool.acquire(resource)
+
+    def _auth_headers(self, token: Optional[str]) -> Dict[str, str]:
+        """Authorization header for a token (empty when anonymous)"""
+        return {'Authorization': f'token {token}'} if token else {}
 
-    async def _make_request(self, endpoint: str) -> Optional[Dict]:
+    async def _make_request(self, endpoint: str, use_cache: bool = True,
+                            response_headers: Optional[Dict] = None) -> Optional[Dict]:
         """
         Make authenticated API request with rate limit handling
 
         Args:
             endpoint: API endpoint (e.g., '/repos/owner/repo')
+            use_cache: Go through the conditional-request cache
+            response_headers: Dict filled with the headers of a 200 response
 
         Returns:
             JSON response or None if failed
@@ -86,36 +175,126 @@ class GitHubEnricher:
         if not self.session:
             await self.start()
 
-        await self._check_rate_limit()
-
         url = f"{GITHUB_API_BASE}{endpoint}"
-        self.request_count += 1
 
-        try:
-            async with self.session.get(url) as response:
-                # Update rate limit info
-                self.rate_limit_remaining = int(response.headers.get('X-RateLimit-Remaining', 5000))
-                self.rate_limit_reset = int(response.headers.get('X-RateLimit-Reset', 0))
-
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 404:
-                    print(f"    ⚠️  Repository not found: {endpoint}")
-                    return None
-                elif response.status == 403:
-                    print(f"    ⚠️  Rate limit exceeded or access forbidden")
-                    return None
-                elif response.status == 401:
-                    print(f"    ⚠️  Unauthorized - check your GitHub token")
-                    return None
-                else:
-                    print(f"    ⚠️  HTTP {response.status}: {endpoint}")
-                    return None
+        cached = self.cache.get(url) if self.cache and use_cache else None
+        if cached and self.cache.is_fresh(cached):
+            return json.loads(cached['body'])
 
-        except Exception as e:
-            print(f"    [ERROR] Request failed: {e}")
+        conditional = self.cache.conditional_headers(cached) if self.cache else {}
+
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            token = await self._check_rate_limit()
+            self.request_count += 1
+
+            try:
+                async with self.session.get(url, headers={**conditional, **self._auth_headers(token)}) as response:
+                    # Update rate limit info
+                    self.pool.update(token, response.status, response.headers)
+                    self.rate_limit_remaining = int(response.headers.get('X-RateLimit-Remaining', 5000))
+                    self.rate_limit_reset = int(response.headers.get('X-RateLimit-Reset', 0))
+
+                    if response.status == 304 and cached:
+                        # Unchanged since last fetch (not counted against the rate limit)
+                        self.cache.mark_not_modified(url)
+                        return json.loads(cached['body'])
+                    elif response.status == 200:
+                        body = await response.read()
+                        if self.cache and use_cache:
+                            self.cache.store(url, body, response.headers.get('ETag'),
+                                             response.headers.get('Last-Modified'))
+                        if response_headers is not None:
+                            response_headers.update(response.headers)
+                        return json.loads(body)
+                    elif self.pool.is_rate_limited(response.status, response.headers) \
+                            and attempt < MAX_RATE_LIMIT_RETRIES:
+                        # This token is now held back: retry, on another token if one has headroom
+                        continue
+                    elif response.status == 404:
+                        print(f"    ⚠️  Repository not found: {endpoint}")
+                        return None
+                    elif response.status == 403:
+                        print(f"    ⚠️  Rate limit exceeded or access forbidden")
+                        return None
+                    elif response.status == 401:
+                        print(f"    ⚠️  Unauthorized - check your GitHub token")
+                        return None
+                    else:
+                        print(f"    ⚠️  HTTP {response.status}: {endpoint}")
+                        return None
+
+            except Exception as e:
+                print(f"    [ERROR] Request failed: {e}")
+                return None
+
+        return None
+
+    async def _graphql_request(self, query: str, variables: Dict) -> Optional[Dict]:
+        """
+        Make an authenticated GraphQL request with rate limit handling
+
+        GraphQL points are governed per token apart from the REST budget;
+        rate-limited queries (403/429, or a RATE_LIMITED error) are retried
+        like REST requests once the governor allows.
+
+        Args:
+            query: GraphQL query
+            variables: Query variables
+
+        Returns:
+            The 'data' object (may hold nulls for missing repositories) or None if failed
+        """
+        if not self.pool.has_tokens:
+            # The GraphQL API has no anonymous access
             return None
 
+        if not self.session:
+            await self.start()
+
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            token = await self._check_rate_limit('graphql')
+            self.request_count += 1
+            self.graphql_request_count += 1
+
+            try:
+                async with self.session.post(GITHUB_GRAPHQL_URL, headers=self._auth_headers(token),
+                                             json={'query': query, 'variables': variables}) as response:
+                    self.pool.update(token, response.status, response.headers)
+
+                    if self.pool.is_rate_limited(response.status, response.headers) \
+                            and attempt < MAX_RATE_LIMIT_RETRIES:
+                        continue
+                    if response.status != 200:
+                        print(f"    ⚠️  GraphQL HTTP {response.status}")
+                        return None
+
+                    payload = await response.json()
+                    errors = payload.get('errors') or []
+                    if any(error.get('type') == 'RATE_LIMITED' for error in errors) \
+                            and attempt < MAX_RATE_LIMIT_RETRIES:
+                        # Primary limit: the headers above told the governor to wait for the reset
+                        continue
+
+                    data = payload.get('data')
+                    if not data:
+                        print(f"    ⚠️  GraphQL errors: {errors}")
+                        return None
+
+                    rate_limit = data.get('rateLimit')
+                    if rate_limit:
+                        self.rate_limit_remaining = rate_limit.get('remaining', self.rate_limit_remaining)
+                        reset_at = self._parse_datetime(rate_limit.get('resetAt'))
+                        if reset_at:
+                            self.rate_limit_reset = int(reset_at.timestamp())
+
+                    return data
+
+            except Exception as e:
+                print(f"    [ERROR] GraphQL request failed: {e}")
+                return None
+
+        return None
+
     async def fetch_repository_info(self, owner: str, repo: str) -> Optional[Dict]:
         """
         Fetch repository metadata
@@ -156,7 +335,126 @@ class GitHubEnricher:
             print(f"    [ERROR] Error parsing repository data: {e}")
             return None
 
-    async def fetch_readme(self, owner: str, repo: str, branch: str = 'main') -> Optional[Dict]:
+    async def _stream_raw(self, endpoint: str, max_bytes: int, accept: str = RAW_MEDIA_TYPE) -> Optional[Dict]:
+        """
+        Stream a raw-media response, decoding and counting words as it arrives
+
+        The body is read in chunks and never held twice; reading stops at
+        max_bytes. Only complete bodies are cached for conditional requests
+        (keyed by URL and media type, apart from the JSON envelope of the same URL).
+
+        Args:
+            endpoint: API endpoint (e.g., '/repos/owner/repo/readme')
+            max_bytes: Maximum body size kept
+            accept: Media type requested (raw file by default)
+
+        Returns:
+            Dict with 'content', 'word_count', 'size', 'truncated', 'sha' or None if failed
+        """
+        if not self.session:
+            await self.start()
+
+        url = f"{GITHUB_API_BASE}{endpoint}"
+        cache_key = f"{url}#{accept}"
+
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached and self.cache.is_fresh(cached):
+            return self._raw_result(cached['body'], cached['etag'])
+
+        conditional = self.cache.conditional_headers(cached) if self.cache else {}
+
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            token = await self._check_rate_limit()
+            self.request_count += 1
+            headers = {**conditional, **self._auth_headers(token), 'Accept': accept}
+
+            try:
+                async with self.session.get(url, headers=headers) as response:
+                    self.pool.update(token, response.status, response.headers)
+
+                    if response.status == 304 and cached:
+                        self.cache.mark_not_modified(cache_key)
+                        return self._raw_result(cached['body'], cached['etag'])
+                    elif self.pool.is_rate_limited(response.status, response.headers) \
+                            and attempt < MAX_RATE_LIMIT_RETRIES:
+                        continue
+                    elif response.status == 404:
+                        return None
+                    elif response.status != 200:
+                        print(f"    ⚠️  HTTP {response.status}: {endpoint}")
+                        return None
+
+                    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+                    parts = []
+                    size = 0
+                    word_count = 0
+                    in_word = False
+                    truncated = False
+
+                    async for chunk in response.content.iter_chunked(README_CHUNK_SIZE):
+                        if size + len(chunk) > max_bytes:
+                            chunk = chunk[:max_bytes - size]
+                            truncated = True
+                        size += len(chunk)
+                        parts.append(chunk)
+
+                        # Incremental str.split() count: a word cut by the chunk
+                        # boundary is only counted once
+                        text = decoder.decode(chunk)
+                        if text:
+                            word_count += len(text.split())
+                            if in_word and not text[0].isspace():
+                                word_count -= 1
+                            in_word = not text[-1].isspace()
+
+                        if truncated:
+                            break
+
+                    body = b''.join(parts)
+                    etag = response.headers.get('ETag')
+                    if self.cache and not truncated:
+                        self.cache.store(cache_key, body, etag, response.headers.get('Last-Modified'))
+
+                    return {
+                        'content': body.decode('utf-8', errors='ignore'),
+                        'word_count': word_count,
+                        'size': size,
+                        'truncated': truncated,
+                        'sha': self._blob_sha(body, etag, truncated),
+                    }
+
+            except Exception as e:
+                print(f"    [ERROR] Request failed: {e}")
+                return None
+
+        return None
+
+    def _raw_result(self, body: bytes, etag: Optional[str]) -> Dict:
+        """Build the _stream_raw() dict from a complete cached body"""
+        content = body.decode('utf-8', errors='ignore')
+        return {
+            'content': content,
+            'word_count': len(content.split()),
+            'size': len(body),
+            'truncated': False,
+            'sha': self._blob_sha(body, etag, truncated=False),
+        }
+
+    @staticmethod
+    def _blob_sha(body: bytes, etag: Optional[str], truncated: bool) -> Optional[str]:
+        """
+        Git blob sha of a file body (same value as the contents API 'sha')
+
+        A complete body is hashed like `git hash-object`; for a truncated one
+        the sha can only come from an ETag that carries it.
+        """
+        if not truncated:
+            return hashlib.sha1(b'blob %d\0' % len(body) + body).hexdigest()
+        match = SHA_ETAG_PATTERN.match(etag or '')
+        return match.group(1) if match else None
+
+    async def fetch_readme(self, owner: str, repo: str, branch: str = 'main', raw: bool = True,
+                           max_bytes: int = README_MAX_BYTES) -> Optional[Dict]:
         """
         Fetch README.md content
 
@@ -164,11 +462,38 @@ class GitHubEnricher:
             owner: Repository owner
             repo: Repository name
             branch: Branch name (default: main)
+            raw: Stream the raw file (size-capped) instead of the base64 JSON envelope
+            max_bytes: Size cap in raw mode; larger READMEs are truncated
 
         Returns:
             README info dict or None if failed
         """
+        key = self._flight_key('readme', owner, repo, raw, max_bytes)
+        return await self.single_flight.do(key, lambda: self._fetch_readme(owner, repo, raw, max_bytes))
+
+    async def _fetch_readme(self, owner: str, repo: str, raw: bool, max_bytes: int) -> Optional[Dict]:
+        """fetch_readme() without coalescing"""
         endpoint = f'/repos/{owner}/{repo}/readme'
+
+        if raw:
+            data = await self._stream_raw(endpoint, max_bytes)
+            if not data:
+                return None
+            if data['truncated']:
+                print(f"    ⚠️  README truncated at {max_bytes // 1024} KB: {owner}/{repo}")
+            return {
+                'content': data['content'],
+                'content_type': 'readme',
+                'word_count': data['word_count'],
+                # Estimate reading time (200 words per minute)
+                'estimated_reading_time_minutes': max(1, data['word_count'] // 200),
+                'extracted_from': f'https://github.com/{owner}/{repo}#readme',
+                'encoding': 'raw',
+                'size': data['size'],
+                'truncated': data['truncated'],
+                'sha': data['sha']
+            }
+
         data = await self._make_request(endpoint)
 
         if not data:
@@ -193,7 +518,9 @@ class GitHubEnricher:
                 'estimated_reading_time_minutes': reading_time,
                 'extracted_from': data.get('html_url'),
                 'encoding': data.get('encoding', 'base64'),
-                'size': data.get('size', 0)
+                'size': data.get('size', 0),
+                'truncated': False,
+                'sha': data.get('sha')
             }
         except Exception as e:
             print(f"    [ERROR] Error parsing README: {e}")
@@ -210,6 +537,11 @@ class GitHubEnricher:
         Returns:
             Combined enrichment data or None if failed
         """
+        key = self._flight_key('enrich', owner, repo)
+        return await self.single_flight.do(key, lambda: self._enrich_server(owner, repo))
+
+    async def _enrich_server(self, owner: str, repo: str) -> Optional[Dict]:
+        """enrich_server() without coalescing"""
         print(f"    🐙 Fetching GitHub data: {owner}/{repo}")
 
         # Fetch repository info
@@ -227,35 +559,55 @@ class GitHubEnricher:
             'enrichment_timestamp': datetime.utcnow()
         }
 
-    async def enrich_multiple(self, repositories: List[Dict[str, str]]) -> Dict[str, Optional[Dict]]:
+    async def _run_bounded(self, repositories: List[Dict[str, str]], fetch,
+                           concurrency: int) -> Dict[str, Optional[Dict]]:
+        """
+        Run fetch(owner, repo) for many repositories, at most `concurrency` at a time
+
+        Pacing is left to the rate-limit governor; a failing repository is
+        reported as None without affecting the others.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(owner: str, repo: str):
+            async with semaphore:
+                try:
+                    return await fetch(owner, repo)
+                except Exception as e:
+                    print(f"    [ERROR] Failed to enrich {owner}/{repo}: {e}")
+                    return None
+
+        keys = [f"{item['owner']}/{item['repo']}" for item in repositories]
+        values = await asyncio.gather(*[run(item['owner'], item['repo']) for item in repositories])
+        return dict(zip(keys, values))
+
+    async def enrich_multiple(self, repositories: List[Dict[str, str]],
+                              concurrency: int = DEFAULT_REPO_CONCURRENCY) -> Dict[str, Optional[Dict]]:
         """
         Enrich multiple repositories concurrently (with rate limiting)
 
         Args:
             repositories: List of {'owner': str, 'repo': str} dicts
+            concurrency: Repositories in flight at once
 
         Returns:
             Dict mapping 'owner/repo' to enrichment data
         """
-        results = {}
-
-        for repo_info in repositories:
-            owner = repo_info['owner']
-            repo = repo_info['repo']
-            key = f"{owner}/{repo}"
-
-            try:
-                data = await self.enrich_server(owner, repo)
-                results[key] = data
+        return await self._run_bounded(repositories, self.enrich_server, concurrency)
 
-                # Be nice to GitHub API - small delay between requests
-                await asyncio.sleep(0.5)
+    async def fetch_comprehensive_multiple(self, repositories: List[Dict[str, str]],
+                                           concurrency: int = DEFAULT_REPO_CONCURRENCY) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch comprehensive info for multiple repositories concurrently over REST
 
-            except Exception as e:
-                print(f"    [ERROR] Failed to enrich {key}: {e}")
-                results[key] = None
+        Args:
+            repositories: List of {'owner': str, 'repo': str} dicts
+            concurrency: Repositories in flight at once (each fans out to 6 requests)
 
-        return results
+        Returns:
+            Dict mapping 'owner/repo' to comprehensive data (None if not found)
+        """
+        return await self._run_bounded(repositories, self.fetch_comprehensive_info, concurrency)
 
     def _parse_datetime(self, dt_string: Optional[str]) -> Optional[datetime]:
         """
@@ -280,9 +632,13 @@ class GitHubEnricher:
         """Get enricher statistics"""
         return {
             'requests_made': self.request_count,
+            'graphql_requests': self.graphql_request_count,
             'rate_limit_remaining': self.rate_limit_remaining,
             'rate_limit_reset': datetime.fromtimestamp(self.rate_limit_reset) if self.rate_limit_reset else None,
-            'has_token': bool(self.token)
+            'has_token': self.pool.has_tokens,
+            'rate_limit': self.pool.get_stats(),
+            'single_flight': self.single_flight.get_stats(),
+            'cache': self.cache.get_stats() if self.cache else None
         }
 
     async def fetch_languages(self, owner: str, repo: str) -> Optional[Dict]:
@@ -338,6 +694,79 @@ class GitHubEnricher:
 
         return contributors
 
+    async def fetch_contributors_with_count(self, owner: str, repo: str,
+                                            limit: int = 10) -> Tuple[Optional[List[Dict]], Optional[int]]:
+        """
+        Fetch top contributors and the full contributor count
+
+        A first page shorter than `limit` is the whole list, so the count
+        only costs a second request for repositories with more contributors.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            limit: Number of top contributors to fetch
+
+        Returns:
+            Tuple (contributor dicts or None, count or None)
+        """
+        contributors = await self.fetch_contributors(owner, repo, limit)
+        if contributors is not None and len(contributors) < limit:
+            return contributors, len(contributors)
+        return contributors, await self.fetch_contributors_count(owner, repo)
+
+    async def count_items(self, endpoint: str) -> Optional[int]:
+        """
+        Count the items of a paginated list endpoint with a single tiny request
+
+        Asks for one item per page and reads the total from the page number
+        of the Link rel="last" URL (no Link header: the list fits on one page).
+
+        Args:
+            endpoint: List endpoint, with or without a query string
+
+        Returns:
+            Item count or None if the request failed
+        """
+        separator = '&' if '?' in endpoint else '?'
+        headers = {}
+        data = await self._make_request(f"{endpoint}{separator}per_page=1", use_cache=False,
+                                        response_headers=headers)
+        if data is None:
+            return None
+
+        match = LINK_LAST_PAGE_PATTERN.search(headers.get('Link', ''))
+        return int(match.group(1)) if match else len(data)
+
+    async def fetch_head_sha(self, owner: str, repo: str, ref: str = 'HEAD') -> Optional[str]:
+        """
+        Resolve a ref to its commit sha (a 40-byte body, 304 when unchanged)
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch, tag or 'HEAD' for the default branch
+
+        Returns:
+            Commit sha or None
+        """
+        data = await self._stream_raw(f'/repos/{owner}/{repo}/commits/{ref}', 64, accept=SHA_MEDIA_TYPE)
+        sha = data['content'].strip() if data else ''
+        return sha if re.fullmatch(r'[0-9a-f]{40}', sha) else None
+
+    async def fetch_contributors_count(self, owner: str, repo: str) -> Optional[int]:
+        """
+        Count all contributors of a repository
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+
+        Returns:
+            Contributor count or None
+        """
+        return await self.count_items(f'/repos/{owner}/{repo}/contributors')
+
     async def fetch_latest_release(self, owner: str, repo: str) -> Optional[Dict]:
         """
         Fetch latest release information
@@ -374,17 +803,15 @@ class GitHubEnricher:
         Returns:
             Activity stats or None
         """
-        # Get commits from last 30 days
-        from datetime import timedelta
-        since = (datetime.utcnow() - timedelta(days=30)).isoformat()
-        endpoint = f'/repos/{owner}/{repo}/commits?since={since}&per_page=100'
-        data = await self._make_request(endpoint)
+        # Count commits from last 30 days (one commit per page, total from the Link header)
+        since = (datetime.utcnow() - timedelta(days=30)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        count = await self.count_items(f'/repos/{owner}/{repo}/commits?since={since}')
 
-        if not data:
+        if count is None:
             return None
 
         return {
-            'commit_frequency': len(data)  # Number of commits in last 30 days
+            'commit_frequency': count  # Number of commits in last 30 days
         }
 
     async def fetch_community_files(self, owner: str, repo: str) -> Optional[Dict]:
@@ -468,6 +895,13 @@ class GitHubEnricher:
 
         return min(100, score)
 
+    @staticmethod
+    def _contributors_count(count: Optional[int], contributors_data: Optional[List[Dict]]) -> int:
+        """Full contributor count, falling back to the size of the top list"""
+        if count is not None:
+            return count
+        return len(contributors_data) if contributors_data else 0
+
     async def fetch_comprehensive_info(self, owner: str, repo: str) -> Optional[Dict]:
         """
         Fetch all GitHub information for comprehensive enrichment
@@ -479,6 +913,11 @@ class GitHubEnricher:
         Returns:
             Complete repository data dict or None
         """
+        key = self._flight_key('comprehensive', owner, repo)
+        return await self.single_flight.do(key, lambda: self._fetch_comprehensive_info(owner, repo))
+
+    async def _fetch_comprehensive_info(self, owner: str, repo: str) -> Optional[Dict]:
+        """fetch_comprehensive_info() without coalescing"""
         print(f"    [INFO] Fetching comprehensive GitHub data: {owner}/{repo}")
 
         # Fetch basic repository info (includes stars, forks, etc.)
@@ -486,12 +925,15 @@ class GitHubEnricher:
         if not repo_info:
             return None
 
-        # Fetch additional data in parallel where possible
-        languages_data = await self.fetch_languages(owner, repo)
-        contributors_data = await self.fetch_contributors(owner, repo)
-        release_data = await self.fetch_latest_release(owner, repo)
-        activity_data = await self.fetch_commits_activity(owner, repo)
-        community_data = await self.fetch_community_files(owner, repo)
+        # The remaining endpoints are independent: fetch them in parallel
+        (languages_data, (contributors_data, contributors_count), release_data,
+         activity_data, community_data) = await asyncio.gather(
+            self.fetch_languages(owner, repo),
+            self.fetch_contributors_with_count(owner, repo),
+            self.fetch_latest_release(owner, repo),
+            self.fetch_commits_activity(owner, repo),
+            self.fetch_community_files(owner, repo),
+        )
 
         # Combine all data
         comprehensive_data = {
@@ -519,7 +961,7 @@ class GitHubEnricher:
 
             # Contributors
             'top_contributors': contributors_data if contributors_data else [],
-            'contributors_count': len(contributors_data) if contributors_data else 0,
+            'contributors_count': self._contributors_count(contributors_count, contributors_data),
 
             # Release
             'latest_github_version': release_data.get('version') if release_data else None,
@@ -549,6 +991,204 @@ class GitHubEnricher:
 
         return comprehensive_data
 
+    async def fetch_comprehensive_batch(self, repositories: List[Dict[str, str]],
+                                        include_contributors: bool = True) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch comprehensive info for many repositories through GraphQL
+
+        Up to GRAPHQL_BATCH_SIZE repositories are fetched per query using
+        aliases. Results have the same shape as fetch_comprehensive_info().
+        Contributors aren't exposed by GraphQL and are fetched over REST
+        (one call, two for repositories with more than 10 contributors).
+        When a GraphQL query fails as a whole, its repositories fall back to
+        the REST path.
+
+        Args:
+            repositories: List of {'owner': str, 'repo': str} dicts
+            include_contributors: Fetch top contributors and their count over REST (1-2 calls per repo)
+
+        Returns:
+            Dict mapping 'owner/repo' to comprehensive data (None if not found)
+        """
+        results = {}
+        since = (datetime.utcnow() - timedelta(days=30)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        for start in range(0, len(repositories), GRAPHQL_BATCH_SIZE):
+            batch = repositories[start:start + GRAPHQL_BATCH_SIZE]
+            print(f"    [INFO] GraphQL batch: {len(batch)} repositories")
+
+            query, variables = self._aliased_query(batch, GRAPHQL_REPO_FIELDS,
+                                                   ['$since: GitTimestamp!'], {'since': since})
+            data = await self._graphql_request(query, variables)
+
+            if data is None:
+                # Whole query failed: REST fallback for this batch
+                results.update(await self.fetch_comprehensive_multiple(batch))
+                continue
+
+            contributors = [(None, None)] * len(batch)
+            if include_contributors:
+                contributors = await asyncio.gather(*[
+                    self.fetch_contributors_with_count(item['owner'], item['repo'])
+                    if data.get(f'r{i}') else asyncio.sleep(0, (None, None))
+                    for i, item in enumerate(batch)
+                ])
+
+            for i, item in enumerate(batch):
+                key = f"{item['owner']}/{item['repo']}"
+                node = data.get(f'r{i}')
+                if node is None:
+                    print(f"    ⚠️  Repository not found: {key}")
+                    results[key] = None
+                    continue
+                results[key] = self._comprehensive_from_graphql(item['owner'], item['repo'], node,
+                                                               *contributors[i])
+
+        return results
+
+    def _aliased_query(self, batch: List[Dict[str, str]], fields: str, declarations: Optional[List[str]] = None,
+                       variables: Optional[Dict] = None):
+        """
+        Build one GraphQL query selecting `fields` of every repository under aliases r0, r1, ...
+
+        Returns:
+            Tuple (query, variables)
+        """
+        declarations = list(declarations or [])
+        variables = dict(variables or {})
+        selections = []
+        for i, item in enumerate(batch):
+            declarations.append(f'$o{i}: String!, $n{i}: String!')
+            selections.append(f'r{i}: repository(owner: $o{i}, name: $n{i}) {{ {fields} }}')
+            variables[f'o{i}'] = item['owner']
+            variables[f'n{i}'] = item['repo']
+
+        query = (f"query({', '.join(declarations)}) {{ rateLimit {{ cost remaining resetAt }} "
+                 f"{' '.join(selections)} }}")
+        return query, variables
+
+    async def fetch_push_activity(self, repositories: List[Dict[str, str]]) -> Dict[str, Optional[Dict]]:
+        """
+        Cheap change detection: last push and counters of many repositories
+
+        Uses one GraphQL query per PRECHECK_BATCH_SIZE repositories. Without a
+        token (or when a query fails) it falls back to the repository endpoint,
+        which the response cache usually answers with a free 304.
+
+        Args:
+            repositories: List of {'owner': str, 'repo': str} dicts
+
+        Returns:
+            Dict mapping 'owner/repo' to {'pushed_at', 'stars', 'forks'}
+            (None if the repository no longer exists; missing if it couldn't be checked)
+        """
+        results = {}
+
+        for start in range(0, len(repositories), PRECHECK_BATCH_SIZE):
+            batch = repositories[start:start + PRECHECK_BATCH_SIZE]
+            data = None
+            if self.pool.has_tokens:
+                query, variables = self._aliased_query(batch, PRECHECK_REPO_FIELDS)
+                data = await self._graphql_request(query, variables)
+
+            if data is None:
+                infos = await self._run_bounded(batch, self.fetch_repository_info, DEFAULT_REPO_CONCURRENCY)
+                for key, info in infos.items():
+                    if info:
+                        results[key] = {
+                            'pushed_at': info.get('github_last_commit'),
+                            'stars': info.get('github_stars', 0),
+                            'forks': info.get('github_forks', 0),
+                        }
+                continue
+
+            for i, item in enumerate(batch):
+                node = data.get(f'r{i}')
+                results[f"{item['owner']}/{item['repo']}"] = {
+                    'pushed_at': self._parse_datetime(node.get('pushedAt')),
+                    'stars': node.get('stargazerCount', 0),
+                    'forks': node.get('forkCount', 0),
+                } if node else None
+
+        return results
+
+    async def fetch_rate_budget(self) -> int:
+        """
+        Read the remaining core budget of every token from /rate_limit (free of charge)
+
+        Returns:
+            Remaining REST requests summed over the pool
+        """
+        if not self.session:
+            await self.start()
+
+        total = 0
+        for token in self.pool.tokens:
+            try:
+                async with self.session.get(f"{GITHUB_API_BASE}/rate_limit",
+                                            headers=self._auth_headers(token)) as response:
+                    if response.status != 200:
+                        print(f"    ⚠️  HTTP {response.status}: /rate_limit")
+                        continue
+                    self.pool.update(token, response.status, response.headers)
+                    core = (await response.json())['resources']['core']
+                    total += core.get('remaining', 0)
+            except Exception as e:
+                print(f"    [ERROR] Rate limit check failed: {e}")
+
+        return total
+
+    def _comprehensive_from_graphql(self, owner: str, repo: str, node: Dict,
+                                    contributors_data: Optional[List[Dict]],
+                                    contributors_count: Optional[int] = None) -> Dict:
+        """Map a GraphQL repository node to the fetch_comprehensive_info() dict"""
+        languages = {edge['node']['name']: edge['size'] for edge in node['languages']['edges']}
+        release = node.get('latestRelease') or {}
+        branch = node.get('defaultBranchRef') or {}
+        history = (branch.get('target') or {}).get('history') or {}
+
+        comprehensive_data = {
+            'github_url': node.get('url'),
+            'github_owner': owner,
+            'github_repo': repo,
+            'github_full_name': f"{owner}/{repo}",
+            'github_description': node.get('description'),
+            'github_stars': node.get('stargazerCount', 0),
+            'github_forks': node.get('forkCount', 0),
+            'github_watchers': node['watchers']['totalCount'],
+            # REST open_issues_count includes open pull requests
+            'github_open_issues': node['issues']['totalCount'] + node['pullRequests']['totalCount'],
+            'github_last_commit': self._parse_datetime(node.get('pushedAt')),
+            'github_created_at': self._parse_datetime(node.get('createdAt')),
+            'default_branch': branch.get('name') or 'main',
+
+            'primary_language': next(iter(languages), None),
+            'languages': languages,
+            'github_topics': [t['topic']['name'] for t in node['repositoryTopics']['nodes']],
+
+            'license_name': (node.get('licenseInfo') or {}).get('name'),
+
+            'top_contributors': contributors_data if contributors_data else [],
+            'contributors_count': self._contributors_count(contributors_count, contributors_data),
+
+            'latest_github_version': release.get('tagName'),
+            'latest_release_date': self._parse_datetime(release.get('publishedAt')),
+            'release_notes': release.get('description') if release else None,
+            'is_prerelease': release.get('isPrerelease', False),
+
+            'commit_frequency': history.get('totalCount', 0),
+
+            'has_readme': any(node.get(alias) for alias in GRAPHQL_README_ALIASES),
+            'has_license': node.get('licenseInfo') is not None,
+            'has_contributing': bool(node.get('contributing') or node.get('githubContributing')),
+            'has_code_of_conduct': node.get('codeOfConduct') is not None,
+
+            'last_synced_at': datetime.utcnow()
+        }
+
+        comprehensive_data['github_health_score'] = self.calculate_health_score(comprehensive_data)
+        return comprehensive_data
+
 
 # Example usage
 if __name__ == '__main__':
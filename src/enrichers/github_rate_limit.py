@@ -0,0 +1,234 @@
+"""
+GitHub rate-limit governor and token pool
+Paces requests from the X-RateLimit-Remaining / X-RateLimit-Reset headers
+and Retry-After (secondary limits) instead of fixed sleeps, and spreads
+them across several tokens when more than one is configured.
+"""
+import os
+import time
+import asyncio
+from typing import Optional, Dict, List, Mapping
+
+# Assumed budget of a token whose window is unknown or has reset (authenticated core limit)
+UNKNOWN_BUDGET = 5000
+
+# Rate-limit buckets tracked per token (X-RateLimit-Resource): REST and GraphQL
+# points are counted separately by GitHub
+RESOURCES = ('core', 'graphql')
+
+
+class RateLimitGovernor:
+    """
+    Shared gate in front of every request to one GitHub token
+
+    - Primary limit: once `remaining` drops to `reserve`, requests wait for the reset.
+    - Pacing: below `pace_below` remaining, requests are spread evenly over the
+      time left until reset instead of bursting into the wall.
+    - Secondary limits: Retry-After (or a 403/429 with nothing remaining)
+      blocks every request until the given time.
+
+    The remaining budget is decremented optimistically on acquire(), so
+    concurrent requests don't all spend the last units before headers arrive.
+    """
+
+    def __init__(self, reserve: int = 1, pace_below: int = 100):
+        """
+        Initialize the governor
+
+        Args:
+            reserve: Remaining requests kept unused (wait for reset at this level)
+            pace_below: Start spacing requests when fewer than this remain
+        """
+        self.reserve = reserve
+        self.pace_below = pace_below
+
+        self.remaining: Optional[int] = None   # Unknown until the first response
+        self.reset_at: float = 0.0             # Epoch seconds
+        self.blocked_until: float = 0.0        # Secondary limit / Retry-After
+        self._next_slot: float = 0.0           # Earliest start for the next paced request
+        self._lock = asyncio.Lock()
+
+        self.stats = {'acquired': 0, 'waits': 0, 'wait_seconds': 0.0, 'secondary_limits': 0}
+
+    async def _sleep(self, seconds: float, reason: str):
+        """Sleep and account for it"""
+        if seconds <= 0:
+            return
+        if seconds >= 5:
+            print(f"  ⏳ {reason}. Waiting {seconds:.0f}s...")
+        self.stats['waits'] += 1
+        self.stats['wait_seconds'] += seconds
+        await asyncio.sleep(seconds)
+
+    async def acquire(self):
+        """Wait until a request may be sent, then reserve one unit of budget"""
+        async with self._lock:
+            now = time.time()
+            if now < self.blocked_until:
+                await self._sleep(self.blocked_until - now, "Secondary rate limit")
+
+            now = time.time()
+            if self.remaining is not None and now >= self.reset_at:
+                # Window has reset: budget unknown until the next response
+                self.remaining = None
+
+            if self.remaining is not None:
+                if self.remaining <= self.reserve:
+                    await self._sleep(self.reset_at - now + 1, "Rate limit reached")
+                    self.remaining = None
+                elif self.remaining < self.pace_below:
+                    interval = (self.reset_at - now) / self.remaining
+                    start = max(now, self._next_slot)
+                    self._next_slot = start + interval
+                    await self._sleep(start - now, "Pacing requests")
+
+            if self.remaining is not None:
+                self.remaining -= 1
+            self.stats['acquired'] += 1
+
+    def update(self, status: int, headers: Mapping[str, str]):
+        """
+        Feed response headers back into the governor
+
+        Args:
+            status: HTTP status code
+            headers: Response headers
+        """
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset_at = float(reset)
+
+        if status in (403, 429):
+            retry_after = headers.get('Retry-After')
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, time.time() + float(retry_after))
+                self.stats['secondary_limits'] += 1
+            elif self.remaining == 0:
+                self.blocked_until = max(self.blocked_until, self.reset_at + 1)
+
+    def is_rate_limited(self, status: int, headers: Mapping[str, str]) -> bool:
+        """True if a 403/429 response is a rate limit (worth retrying) rather than a permission error"""
+        return status in (403, 429) and (
+            headers.get('Retry-After') is not None or headers.get('X-RateLimit-Remaining') == '0'
+        )
+
+    def get_stats(self) -> Dict:
+        """Get governor statistics"""
+        return dict(self.stats, remaining=self.remaining,
+                    reset_at=self.reset_at or None)
+
+
+class TokenPool:
+    """
+    Routes requests across several GitHub tokens, one governor per token
+    and rate-limit resource (REST core, GraphQL)
+
+    Each request goes to the token with the most headroom: a token under a
+    secondary limit (Retry-After) is skipped until it clears, and a token
+    that has exhausted its window is only used again after its reset. The
+    pool only waits when every token is blocked, and then for the one that
+    frees up first.
+    """
+
+    def __init__(self, tokens: List[Optional[str]], reserve: int = 1, pace_below: int = 100):
+        """
+        Initialize the pool
+
+        Args:
+            tokens: Personal access tokens (an empty list means anonymous access)
+            reserve: Per-token reserve (see RateLimitGovernor)
+            pace_below: Per-token pacing threshold (see RateLimitGovernor)
+        """
+        # Preserve order, drop blanks and duplicates
+        unique = list(dict.fromkeys(token for token in tokens if token))
+        self.tokens: List[Optional[str]] = unique or [None]
+        self.resources: Dict[str, Dict[Optional[str], RateLimitGovernor]] = {
+            resource: {token: RateLimitGovernor(reserve=reserve, pace_below=pace_below) for token in self.tokens}
+            for resource in RESOURCES
+        }
+        self.governors = self.resources['core']
+        self.assigned: Dict[Optional[str], int] = {token: 0 for token in self.tokens}
+
+    @classmethod
+    def from_env(cls, token: Optional[str] = None) -> 'TokenPool':
+        """
+        Build a pool from GITHUB_TOKENS (comma-separated), falling back to GITHUB_TOKEN
+
+        Args:
+            token: Explicit single token; takes precedence over the environment
+        """
+        if token:
+            return cls([token])
+        tokens = [value.strip() for value in os.getenv('GITHUB_TOKENS', '').split(',')]
+        return cls(tokens + [os.getenv('GITHUB_TOKEN')])
+
+    @property
+    def has_tokens(self) -> bool:
+        """True if at least one token is configured"""
+        return self.tokens[0] is not None
+
+    def _headroom(self, token: Optional[str], now: float, resource: str = 'core') -> float:
+        """Requests the token can send right now (negative: seconds until it frees up)"""
+        governor = self.resources[resource][token]
+        if now < governor.blocked_until:
+            return -(governor.blocked_until - now)
+        if governor.remaining is None or now >= governor.reset_at:
+            # Unknown or reset window: assume a full budget
+            return float(UNKNOWN_BUDGET)
+        if governor.remaining <= governor.reserve:
+            return -(governor.reset_at - now)
+        return float(governor.remaining - governor.reserve)
+
+    async def acquire(self, resource: str = 'core') -> Optional[str]:
+        """
+        Pick the token with the most headroom and wait for its governor
+
+        Args:
+            resource: Rate-limit resource the request counts against ('core' or 'graphql')
+
+        Returns:
+            The token to send the request with (None when anonymous)
+        """
+        now = time.time()
+        # Ties (e.g. several unknown budgets) go to the least used token
+        token = max(self.tokens, key=lambda t: (self._headroom(t, now, resource), -self.assigned[t]))
+        self.assigned[token] += 1
+        await self.resources[resource][token].acquire()
+        return token
+
+    def update(self, token: Optional[str], status: int, headers: Mapping[str, str]):
+        """Feed a response back into the governor of the token and resource (X-RateLimit-Resource) it used"""
+        governors = self.resources.get(headers.get('X-RateLimit-Resource', 'core'))
+        if governors is not None:
+            governors[token].update(status, headers)
+
+    def is_rate_limited(self, status: int, headers: Mapping[str, str]) -> bool:
+        """True if a 403/429 response is a rate limit rather than a permission error"""
+        return self.governors[self.tokens[0]].is_rate_limited(status, headers)
+
+    def get_stats(self) -> Dict:
+        """
+        Get pool statistics
+
+        Returns:
+            REST totals across tokens plus a per-token breakdown (tokens masked),
+            and the GraphQL points left
+        """
+        per_token = {}
+        totals = {'acquired': 0, 'waits': 0, 'wait_seconds': 0.0, 'secondary_limits': 0}
+        now = time.time()
+        for index, token in enumerate(self.tokens, 1):
+            stats = self.governors[token].get_stats()
+            for key in totals:
+                totals[key] += stats[key]
+            label = f"token{index}:…{token[-4:]}" if token else 'anonymous'
+            per_token[label] = dict(stats, blocked=now < self.governors[token].blocked_until)
+
+        known = [g.remaining for g in self.governors.values() if g.remaining is not None]
+        graphql_known = [g.remaining for g in self.resources['graphql'].values() if g.remaining is not None]
+        return dict(totals, tokens=len(self.tokens) if self.has_tokens else 0,
+                    remaining=sum(known) if known else None,
+                    graphql_remaining=sum(graphql_known) if graphql_known else None, per_token=per_token)
@@ -0,0 +1,140 @@
+"""
+Staleness-driven GitHub refresh planner
+Decides which github_info rows deserve a full (expensive) re-enrichment:
+rows are ranked by sync age, popularity and push activity, checked in bulk
+for changes, and only changed repositories are refreshed, within the
+current rate-limit budget.
+"""
+import math
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# REST requests of one fetch_comprehensive_info() at most (repo, languages,
+# contributors, contributor count, release, commit count, community profile);
+# the count is skipped for repositories with 10 contributors or fewer
+REST_COST_PER_REPO = 7
+
+# REST requests per repository left on the GraphQL path at most (contributors + count)
+GRAPHQL_COST_PER_REPO = 2
+
+
+def _naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Drop tzinfo so API datetimes compare with values read back from SQLite"""
+    return value.replace(tzinfo=None) if value is not None else None
+
+
+class GitHubRefreshPlanner:
+    """
+    Plans an incremental refresh of GithubInfo rows
+
+    A row is a candidate once its last check (last_synced_at) is older than
+    min_age_hours. Candidates are pre-checked in bulk (fetch_push_activity);
+    a candidate is refreshed when it was pushed since the last full fetch,
+    was never fully fetched, or its last full fetch (github_updated_at) is
+    older than max_age_days (counters drift without pushes). Refreshes are
+    taken by descending score until the budget left after the pre-check is
+    spent.
+    """
+
+    def __init__(self, enricher, min_age_hours: float = 24, max_age_days: float = 30,
+                 budget_fraction: float = 0.5, cost_per_repo: int = REST_COST_PER_REPO):
+        """
+        Initialize the planner
+
+        Args:
+            enricher: Started GitHubEnricher
+            min_age_hours: Rows synced more recently are left alone
+            max_age_days: Rows synced longer ago are refreshed even if unchanged
+            budget_fraction: Share of the remaining rate limit a run may spend
+            cost_per_repo: REST requests one refresh costs
+        """
+        self.enricher = enricher
+        self.min_age_hours = min_age_hours
+        self.max_age_days = max_age_days
+        self.budget_fraction = budget_fraction
+        self.cost_per_repo = cost_per_repo
+
+    def score(self, row, now: datetime) -> float:
+        """
+        Refresh priority of a row (higher first)
+
+        Sync age in days, weighted by popularity (log of stars) and by how
+        recently the repository was pushed to. Never-synced rows come first.
+        """
+        if row.last_synced_at is None:
+            return math.inf
+
+        age_days = (now - _naive(row.last_synced_at)).total_seconds() / 86400
+        popularity = 1 + math.log10((row.github_stars or 0) + 1)
+
+        activity = 1.0
+        if row.github_last_commit is not None:
+            days_since_push = (now - _naive(row.github_last_commit)).days
+            if days_since_push < 7:
+                activity = 2.0
+            elif days_since_push < 30:
+                activity = 1.5
+
+        return age_days * popularity * activity
+
+    def is_due(self, row, now: datetime) -> bool:
+        """True if the row's last sync is older than min_age_hours"""
+        if row.last_synced_at is None:
+            return True
+        return (now - _naive(row.last_synced_at)).total_seconds() >= self.min_age_hours * 3600
+
+    def has_changed(self, row, activity: Optional[Dict], now: datetime) -> bool:
+        """True if the pre-check (or the age of the last full fetch) calls for a full refresh"""
+        if activity is None or row.github_updated_at is None or row.github_last_commit is None:
+            return True
+        if (now - _naive(row.github_updated_at)).days >= self.max_age_days:
+            return True
+        pushed_at = _naive(activity.get('pushed_at'))
+        return pushed_at is not None and pushed_at > _naive(row.github_last_commit)
+
+    async def plan(self, rows: List) -> Dict:
+        """
+        Build a refresh plan
+
+        Args:
+            rows: GithubInfo rows to consider
+
+        Returns:
+            Dict with:
+            - 'refresh': rows to fully re-enrich, highest score first
+            - 'unchanged': (row, activity) pairs that only need their counters updated
+            - 'missing': rows whose repository no longer exists
+            - 'deferred': changed rows left for a later run (budget exhausted)
+            - 'candidates', 'budget', 'capacity': planning figures
+        """
+        now = datetime.utcnow()
+        candidates = sorted((row for row in rows if self.is_due(row, now)),
+                            key=lambda row: self.score(row, now), reverse=True)
+
+        activity = await self.enricher.fetch_push_activity(
+            [{'owner': row.github_owner, 'repo': row.github_repo} for row in candidates]
+        )
+
+        # Read after the pre-check: its REST fallback can spend one request per candidate
+        budget = await self.enricher.fetch_rate_budget()
+        capacity = int(budget * self.budget_fraction) // max(1, self.cost_per_repo)
+
+        changed, unchanged, missing = [], [], []
+        for row in candidates:
+            key = f"{row.github_owner}/{row.github_repo}"
+            if key in activity and activity[key] is None:
+                missing.append(row)
+            elif self.has_changed(row, activity.get(key), now):
+                changed.append(row)
+            else:
+                unchanged.append((row, activity[key]))
+
+        return {
+            'refresh': changed[:capacity],
+            'unchanged': unchanged,
+            'missing': missing,
+            'deferred': changed[capacity:],
+            'candidates': len(candidates),
+            'budget': budget,
+            'capacity': capacity,
+        }
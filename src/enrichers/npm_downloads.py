@@ -0,0 +1,180 @@
+"""
+Batched npm download-counts client
+Reads weekly and monthly download totals from the npm downloads API with as
+few requests as possible: unscoped packages go in comma-separated bulk
+queries, scoped packages (not supported by bulk queries) get one request
+each. Both windows come from a single daily range and are summed locally.
+"""
+import asyncio
+import aiohttp
+from typing import Dict, Iterable, List, Optional
+
+from src.network.http_pool import get_http_registry
+
+NPM_DOWNLOADS_API = 'https://api.npmjs.org/downloads'
+
+# Range covering both windows: the last 30 days, the last 7 of which are "last week"
+DOWNLOADS_PERIOD = 'last-month'
+WEEK_DAYS = 7
+
+# Packages per bulk query (API limit)
+BULK_MAX_PACKAGES = 128
+
+# Requests in flight at once
+DEFAULT_DOWNLOADS_CONCURRENCY = 8
+
+# Retries of a request rejected with 429
+MAX_RETRIES = 3
+
+
+class NpmDownloadsClient:
+    """
+    Fetches download counts for many packages at once
+
+    Example:
+        async with NpmDownloadsClient() as client:
+            counts = await client.fetch(['express', '@modelcontextprotocol/sdk'])
+            # {'express': {'npm_downloads_weekly': ..., 'npm_downloads_monthly': ...}, ...}
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_DOWNLOADS_CONCURRENCY):
+        """
+        Initialize the client
+
+        Args:
+            concurrency: Requests in flight at once
+        """
+        self.concurrency = concurrency
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.stats = {'requests': 0, 'bulk_requests': 0, 'packages': 0, 'found': 0, 'failed_requests': 0}
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
+
+    async def start(self):
+        """Start HTTP session (pooled connections shared process-wide)"""
+        headers = {
+            'Accept': 'application/json',
+            'User-Agent': 'MCP-Hub-Scraper/1.0'
+        }
+        self.session = get_http_registry().session(headers=headers)
+
+    async def close(self):
+        """Close HTTP session"""
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    @staticmethod
+    def plan_requests(packages: Iterable[str]) -> List[List[str]]:
+        """
+        Group packages into requests
+
+        Args:
+            packages: Package names (duplicates ignored)
+
+        Returns:
+            List of package groups, one per request: bulk groups of up to
+            BULK_MAX_PACKAGES unscoped names, then one group per scoped name
+        """
+        unique = list(dict.fromkeys(package for package in packages if package))
+        unscoped = [package for package in unique if not package.startswith('@')]
+        scoped = [package for package in unique if package.startswith('@')]
+
+        groups = [unscoped[i:i + BULK_MAX_PACKAGES] for i in range(0, len(unscoped), BULK_MAX_PACKAGES)]
+        groups.extend([package] for package in scoped)
+        return groups
+
+    @staticmethod
+    def totals(days: Optional[List[Dict]]) -> Dict[str, int]:
+        """
+        Weekly and monthly totals from a daily range
+
+        Args:
+            days: 'downloads' list of a range response ([{'day': ..., 'downloads': n}, ...])
+
+        Returns:
+            Dict with 'npm_downloads_weekly' and 'npm_downloads_monthly'
+        """
+        counts = [day.get('downloads', 0) for day in sorted(days or [], key=lambda day: day.get('day', ''))]
+        return {
+            'npm_downloads_weekly': sum(counts[-WEEK_DAYS:]),
+            'npm_downloads_monthly': sum(counts),
+        }
+
+    async def _get(self, url: str) -> Optional[Dict]:
+        """GET a downloads API URL, retrying on 429; None if it failed"""
+        if not self.session:
+            await self.start()
+
+        for attempt in range(MAX_RETRIES + 1):
+            self.stats['requests'] += 1
+            try:
+                async with self.session.get(url) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    if response.status == 429 and attempt < MAX_RETRIES:
+                        retry_after = response.headers.get('Retry-After')
+                        await asyncio.sleep(float(retry_after) if retry_after else 2 ** attempt)
+                        continue
+                    if response.status != 404:
+                        print(f"    ⚠️  HTTP {response.status}: {url}")
+                    return None
+            except Exception as e:
+                print(f"    ❌ Request failed for {url}: {e}")
+                return None
+        return None
+
+    async def _fetch_group(self, group: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch one request's worth of packages"""
+        data = await self._get(f"{NPM_DOWNLOADS_API}/range/{DOWNLOADS_PERIOD}/{','.join(group)}")
+        if len(group) > 1:
+            self.stats['bulk_requests'] += 1
+        if data is None:
+            self.stats['failed_requests'] += 1
+            return {package: None for package in group}
+
+        if 'downloads' in data and len(group) == 1:
+            # Single-package responses are not keyed by name
+            data = {group[0]: data}
+
+        results = {}
+        for package in group:
+            entry = data.get(package)
+            results[package] = self.totals(entry.get('downloads')) if entry else None
+        return results
+
+    async def fetch(self, packages: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch download totals for many packages
+
+        Args:
+            packages: Package names (scoped or not)
+
+        Returns:
+            Dict mapping package name to its totals, or None if unknown/failed
+        """
+        groups = self.plan_requests(packages)
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+
+        async def run(group: List[str]):
+            async with semaphore:
+                return await self._fetch_group(group)
+
+        results = {}
+        for part in await asyncio.gather(*[run(group) for group in groups]):
+            results.update(part)
+
+        self.stats['packages'] += len(results)
+        self.stats['found'] += sum(1 for value in results.values() if value is not None)
+        return results
+
+    def get_stats(self) -> Dict:
+        """Get client statistics"""
+        return dict(self.stats)
@@ -2,24 +2,56 @@
 npm Enricher - Fetches package metadata from npm registry
 Uses npm Registry API (no authentication required)
 """
+import json
+import codecs
 import asyncio
 import aiohttp
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Any, Callable, Dict, Optional, List
+
+from src.network.http_pool import get_http_registry
+from src.network.response_cache import ResponseCache, get_response_cache
+from src.network.json_stream import JsonStreamExtractor, Path, DESCEND, CAPTURE, SKIP
+from src.enrichers.npm_downloads import NpmDownloadsClient
 
 
 NPM_REGISTRY_BASE = 'https://registry.npmjs.org'
 
+# Abbreviated metadata ("corgi"): name, modified, dist-tags and install-only version data
+NPM_ABBREVIATED_MEDIA_TYPE = 'application/vnd.npm.install-v1+json'
+
+# Chunk size when streaming packuments
+NPM_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Packages enriched at once by enrich_multiple
+DEFAULT_PACKAGE_CONCURRENCY = 8
+
+# Top-level packument fields read by fetch_package_info
+PACKUMENT_FIELDS = ('name', 'dist-tags', 'modified', 'description', 'keywords',
+                    'license', 'homepage', 'repository', 'maintainers')
+
 
 class NpmEnricher:
     """
     Enriches server data with npm package information
     """
 
-    def __init__(self):
-        """Initialize npm enricher"""
+    def __init__(self, cache: Optional[ResponseCache] = None, lean: bool = True):
+        """
+        Initialize npm enricher
+
+        Args:
+            cache: Conditional-request cache (default: shared cache when ENABLE_CACHE is set)
+            lean: Read the abbreviated packument plus the latest version manifest
+                  instead of the full packument
+        """
+        self.cache = cache if cache is not None else get_response_cache()
+        self.lean = lean
         self.session: Optional[aiohttp.ClientSession] = None
         self.request_count = 0
+        self.bytes_downloaded = 0
+        self.downloads = NpmDownloadsClient()
+        self._download_counts: Dict[str, Optional[Dict]] = {}
 
     async def __aenter__(self):
         """Async context manager entry"""
@@ -31,18 +63,20 @@ class NpmEnricher:
         await self.close()
 
     async def start(self):
-        """Start HTTP session"""
+        """Start HTTP session (pooled connections shared process-wide)"""
         headers = {
             'Accept': 'application/json',
             'User-Agent': 'MCP-Hub-Scraper/1.0'
         }
-        self.session = aiohttp.ClientSession(headers=headers)
+        self.session = get_http_registry().session(headers=headers)
+        await self.downloads.start()
 
     async def close(self):
         """Close HTTP session"""
         if self.session:
             await self.session.close()
             self.session = None
+        await self.downloads.close()
 
     async def _make_request(self, package_name: str) -> Optional[Dict]:
         """
@@ -59,12 +93,26 @@ class NpmEnricher:
 
         # URL encode the package name (handles scoped packages)
         url = f"{NPM_REGISTRY_BASE}/{package_name}"
+
+        cached = self.cache.get(url) if self.cache else None
+        if cached and self.cache.is_fresh(cached):
+            return json.loads(cached['body'])
+
         self.request_count += 1
 
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    return await response.json()
+            headers = self.cache.conditional_headers(cached) if self.cache else {}
+            async with self.session.get(url, headers=headers) as response:
+                if response.status == 304 and cached:
+                    self.cache.mark_not_modified(url)
+                    return json.loads(cached['body'])
+                elif response.status == 200:
+                    body = await response.read()
+                    self.bytes_downloaded += len(body)
+                    if self.cache:
+                        self.cache.store(url, body, response.headers.get('ETag'),
+                                         response.headers.get('Last-Modified'))
+                    return json.loads(body)
                 elif response.status == 404:
                     print(f"    ⚠️  Package not found: {package_name}")
                     return None
@@ -76,6 +124,132 @@ class NpmEnricher:
             print(f"    ❌ Request failed for {package_name}: {e}")
             return None
 
+    async def _stream_document(self, package_name: str, accept: str,
+                               select: Callable[[Path, Dict[Path, Any]], str]) -> Optional[Dict[Path, Any]]:
+        """
+        Stream a registry document and keep only the selected values
+
+        The body is parsed chunk by chunk (JsonStreamExtractor): skipped
+        subtrees such as the `versions` history are never built in memory.
+        The extracted values, not the document, are cached for conditional
+        requests (keyed by URL and media type).
+
+        Args:
+            package_name: Package name (can include scope, e.g. @org/package)
+            accept: Media type requested (abbreviated or full packument)
+            select: Path selector (see JsonStreamExtractor)
+
+        Returns:
+            Dict mapping captured paths to values or None if failed
+        """
+        if not self.session:
+            await self.start()
+
+        url = f"{NPM_REGISTRY_BASE}/{package_name}"
+        cache_key = f"{url}#{accept}"
+
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached and self.cache.is_fresh(cached):
+            return {tuple(path): value for path, value in json.loads(cached['body'])}
+
+        self.request_count += 1
+
+        try:
+            headers = self.cache.conditional_headers(cached) if self.cache else {}
+            headers['Accept'] = accept
+            async with self.session.get(url, headers=headers) as response:
+                if response.status == 304 and cached:
+                    self.cache.mark_not_modified(cache_key)
+                    return {tuple(path): value for path, value in json.loads(cached['body'])}
+                elif response.status == 404:
+                    print(f"    ⚠️  Package not found: {package_name}")
+                    return None
+                elif response.status != 200:
+                    print(f"    ⚠️  HTTP {response.status}: {package_name}")
+                    return None
+
+                decoder = codecs.getincrementaldecoder('utf-8')()
+                extractor = JsonStreamExtractor(select)
+                async for chunk in response.content.iter_chunked(NPM_STREAM_CHUNK_SIZE):
+                    self.bytes_downloaded += len(chunk)
+                    extractor.feed(decoder.decode(chunk))
+                extractor.feed(decoder.decode(b'', final=True))
+                results = extractor.close()
+
+                if self.cache:
+                    body = json.dumps([[list(path), value] for path, value in results.items()])
+                    self.cache.store(cache_key, body.encode('utf-8'), response.headers.get('ETag'),
+                                     response.headers.get('Last-Modified'))
+                return results
+
+        except Exception as e:
+            print(f"    ❌ Request failed for {package_name}: {e}")
+            return None
+
+    def _select_packument(self, path: Path, results: Dict[Path, Any]) -> str:
+        """
+        Selector for a (full or abbreviated) packument
+
+        Keeps the top-level fields fetch_package_info reads and, under
+        `versions` and `time`, only the entry of the latest version (known
+        once `dist-tags` has been captured; it precedes `versions` in
+        registry documents). Abbreviated versions only hold install data,
+        so lean mode skips them entirely.
+        """
+        if not path:
+            return DESCEND
+        if len(path) == 1:
+            if path[0] == 'time' or (path[0] == 'versions' and not self.lean):
+                return DESCEND
+            return CAPTURE if path[0] in PACKUMENT_FIELDS else SKIP
+        if len(path) == 2:
+            latest = (results.get(('dist-tags',)) or {}).get('latest')
+            return CAPTURE if latest is not None and path[1] == latest else SKIP
+        return SKIP
+
+    async def _fetch_packument(self, package_name: str) -> Optional[Dict]:
+        """
+        Fetch the parts of a packument fetch_package_info reads
+
+        Lean mode streams the abbreviated document (name, modified, dist-tags)
+        without materializing its `versions`, then reads description, license,
+        repository, etc. from the latest version manifest, the only fields
+        the abbreviated format lacks. Otherwise the full packument is
+        streamed, keeping the latest version only.
+
+        Args:
+            package_name: npm package name
+
+        Returns:
+            Packument-shaped dict ('dist-tags', 'versions' and 'time' reduced
+            to the latest version) or None if failed
+        """
+        accept = NPM_ABBREVIATED_MEDIA_TYPE if self.lean else 'application/json'
+        results = await self._stream_document(package_name, accept, self._select_packument)
+        if results is None:
+            return None
+
+        data = {path[0]: value for path, value in results.items() if len(path) == 1}
+        latest_version = (data.get('dist-tags') or {}).get('latest', '')
+        manifest = results.get(('versions', latest_version))
+        published = results.get(('time', latest_version))
+
+        if manifest is None and latest_version:
+            # Abbreviated document (or dist-tags after versions): ask for the version manifest
+            manifest = await self._make_request(f"{package_name}/{latest_version}") or {}
+            for field in PACKUMENT_FIELDS:
+                if field not in data and field in manifest:
+                    data[field] = manifest[field]
+
+        if published is None and self.lean:
+            # The abbreviated format has no `time`: its `modified` is the
+            # last publish in the common case
+            published = data.get('modified')
+
+        data['versions'] = {latest_version: manifest or {}}
+        data['time'] = {latest_version: published} if published else {}
+        return data
+
     async def fetch_package_info(self, package_name: str) -> Optional[Dict]:
         """
         Fetch package metadata from npm registry
@@ -88,7 +262,7 @@ class NpmEnricher:
         """
         print(f"    📦 Fetching npm data: {package_name}")
 
-        data = await self._make_request(package_name)
+        data = await self._fetch_packument(package_name)
         if not data:
             return None
 
@@ -150,7 +324,10 @@ class NpmEnricher:
 
     async def _fetch_download_stats(self, package_name: str) -> tuple[Optional[int], Optional[int]]:
         """
-        Fetch download statistics from npm download counts API
+        Get download statistics from the npm download counts API
+
+        Counts prefetched in bulk by enrich_multiple are used as is; otherwise
+        one range request covers both windows.
 
         Args:
             package_name: npm package name
@@ -158,56 +335,48 @@ class NpmEnricher:
         Returns:
             Tuple of (weekly_downloads, monthly_downloads) or (None, None) if failed
         """
-        try:
-            # npm download counts API
-            # last-week and last-month endpoints
-            weekly_url = f"https://api.npmjs.org/downloads/point/last-week/{package_name}"
-            monthly_url = f"https://api.npmjs.org/downloads/point/last-month/{package_name}"
-
-            async with self.session.get(weekly_url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    weekly = data.get('downloads', 0)
-                else:
-                    weekly = None
+        if package_name in self._download_counts:
+            counts = self._download_counts.pop(package_name)
+        else:
+            counts = (await self.downloads.fetch([package_name])).get(package_name)
 
-            async with self.session.get(monthly_url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    monthly = data.get('downloads', 0)
-                else:
-                    monthly = None
-
-            return weekly, monthly
-
-        except Exception:
+        if not counts:
             return None, None
+        return counts['npm_downloads_weekly'], counts['npm_downloads_monthly']
 
-    async def enrich_multiple(self, packages: List[str]) -> Dict[str, Optional[Dict]]:
+    async def enrich_multiple(self, packages: List[str],
+                              concurrency: int = DEFAULT_PACKAGE_CONCURRENCY) -> Dict[str, Optional[Dict]]:
         """
         Enrich multiple packages concurrently
 
+        Download counts are fetched up front in bulk (NpmDownloadsClient),
+        then packuments at most `concurrency` at a time.
+
         Args:
             packages: List of package names
+            concurrency: Packages in flight at once
 
         Returns:
             Dict mapping package name to enrichment data
         """
-        results = {}
-
-        for package in packages:
-            try:
-                data = await self.fetch_package_info(package)
-                results[package] = data
-
-                # Small delay between requests
-                await asyncio.sleep(0.2)
+        self._download_counts.update(await self.downloads.fetch(packages))
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(package: str):
+            async with semaphore:
+                try:
+                    return await self.fetch_package_info(package)
+                except Exception as e:
+                    print(f"    ❌ Failed to enrich {package}: {e}")
+                    return None
 
-            except Exception as e:
-                print(f"    ❌ Failed to enrich {package}: {e}")
-                results[package] = None
+        unique = list(dict.fromkeys(packages))
+        values = await asyncio.gather(*[run(package) for package in unique])
 
-        return results
+        # Drop counts left unused by packages whose packument failed
+        for package in unique:
+            self._download_counts.pop(package, None)
+        return dict(zip(unique, values))
 
     def _parse_datetime(self, dt_string: Optional[str]) -> Optional[datetime]:
         """
@@ -231,7 +400,11 @@ class NpmEnricher:
     def get_stats(self) -> Dict:
         """Get enricher statistics"""
         return {
-            'requests_made': self.request_count
+            'requests_made': self.request_count,
+            'bytes_downloaded': self.bytes_downloaded,
+            'lean': self.lean,
+            'downloads': self.downloads.get_stats(),
+            'cache': self.cache.get_stats() if self.cache else None
         }
 
 
@@ -256,5 +429,6 @@ if __name__ == '__main__':
             stats = enricher.get_stats()
             print(f"\n📊 Stats:")
             print(f"  Requests: {stats['requests_made']}")
+            print(f"  Downloaded: {stats['bytes_downloaded'] / 1024:.1f} KB")
 
     asyncio.run(test())
@@ -4,7 +4,7 @@ Parameters enricher - Extract parameters from tool documentation and populate to
 import sys
 import sqlite3
 import uuid
-import re
+from itertools import groupby
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -15,7 +15,9 @@ if sys.platform == 'win32':
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from parsers.parameters_parser import ParametersParser
+from parsers.parameters_parser import ParametersParser, PARSER_VERSION
+from parsers.tool_index import ToolIndex, normalize_tool_name
+from parsers.parse_cache import ParseCache
 
 
 class ParametersEnricher:
@@ -23,9 +25,11 @@ class ParametersEnricher:
     Extract parameters from tool documentation and populate the tool_parameters table
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, use_parse_cache: bool = True):
         self.db_path = db_path
         self.parser = ParametersParser()
+        self.use_parse_cache = use_parse_cache
+        self.parse_cache = None
         self.conn = None
         self.cursor = None
 
@@ -79,42 +83,24 @@ class ParametersEnricher:
 
         return tools
 
-    def extract_tool_section(self, readme: str, tool_name: str) -> Optional[str]:
+    def extract_parameters_for_tool(self, tool: Dict, index: Optional[ToolIndex] = None) -> List[Dict]:
         """
-        Extract the section for a specific tool from README
-        Returns ~2000 chars of context around the tool
+        Extract parameters for a specific tool
+
+        Args:
+            tool: Tool row from get_tools_with_readmes()
+            index: ToolIndex of the tool's README (built if not given)
+
+        Returns:
+            List of parameter dictionaries
         """
+        if index is None:
+            index = ToolIndex(tool['readme_content'])
 
-        # Try multiple patterns to find the tool
-        # IMPORTANT: Order matters! Try more specific patterns first
-        patterns = [
-            rf'###\s+{re.escape(tool_name)}\s*\n',  # Exact heading match (most specific)
-            rf'###\s+[^#\n]*{re.escape(tool_name)}[^#\n]*\n',  # Heading with tool name somewhere
-            rf'\*\*{re.escape(tool_name)}\*\*',  # Bold format
-            rf'`{re.escape(tool_name)}`',  # Backtick format (least specific, matches references)
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, readme, re.IGNORECASE)
-            if match:
-                start = match.start()
-                # Get context: 200 chars before, 2000 chars after
-                context_start = max(0, start - 200)
-                context_end = min(len(readme), start + 2000)
-                return readme[context_start:context_end]
-
-        return None
-
-    def extract_parameters_for_tool(self, tool: Dict) -> List[Dict]:
-        """Extract parameters for a specific tool"""
-
-        # Extract the tool's section from README
-        tool_section = self.extract_tool_section(
-            tool['readme_content'],
-            tool['tool_name']
-        )
-
-        if not tool_section:
+        # Locate the tool's section in the README
+        tool_section = index.tool_section(tool['tool_name'])
+
+        if tool_section is None:
             return []
 
         # Parse parameters from the section
@@ -229,55 +215,83 @@ class ParametersEnricher:
             print(f"Processing {len(tools)} tools...")
             print()
 
-            for tool in tools:
-                stats['tools_processed'] += 1
-
-                try:
-                    # Extract parameters
-                    params = self.extract_parameters_for_tool(tool)
-                    stats['params_extracted'] += len(params)
-
-                    if params:
-                        stats['tools_with_params'] += 1
-
-                    # Save parameters
-                    inserted = 0
-                    updated = 0
-
-                    for param in params:
-                        # Check if exists before saving
-                        self.cursor.execute("""
-                            SELECT id FROM tool_parameters
-                            WHERE tool_id = ? AND name = ?
-                        """, (param['tool_id'], param['name']))
-
-                        if self.cursor.fetchone():
-                            updated += 1
+            # One bulk lookup for all READMEs
+            self.parse_cache = ParseCache(self.conn, 'parameters', PARSER_VERSION, enabled=self.use_parse_cache)
+            self.parse_cache.prefetch(dict.fromkeys(tool['readme_content'] for tool in tools))
+
+            # One index per README: every tool of a server is looked up in it
+            for _, server_tools in groupby(tools, key=lambda t: (t['server_id'], t['readme_content'])):
+                server_tools = list(server_tools)
+                readme = server_tools[0]['readme_content']
+                index = None
+
+                # Parameters by tool name; tools missing from the cached entry
+                # (new tools, or a changed README) are parsed and added to it
+                parsed = dict(self.parse_cache.get(readme) or {})
+                cached_count = len(parsed)
+
+                for tool in server_tools:
+                    stats['tools_processed'] += 1
+
+                    try:
+                        # Extract parameters
+                        name = normalize_tool_name(tool['tool_name'])
+                        if name in parsed:
+                            params = [dict(param, tool_id=tool['tool_id']) for param in parsed[name]]
                         else:
-                            inserted += 1
-
-                        self.save_parameter(param)
-
-                    stats['params_inserted'] += inserted
-                    stats['params_updated'] += updated
-
-                    # Log details
-                    status = "✅" if params else "⚠️ "
-                    tool_display = f"{tool['server_slug']}::{tool['tool_name']}"
-                    print(f"{status} {tool_display:45s} | {len(params):2d} params | +{inserted} ~{updated}")
-
-                    stats['tool_details'].append({
-                        'server_slug': tool['server_slug'],
-                        'tool_name': tool['tool_name'],
-                        'params_count': len(params),
-                        'inserted': inserted,
-                        'updated': updated
-                    })
-
-                except Exception as e:
-                    stats['errors'] += 1
-                    tool_display = f"{tool['server_slug']}::{tool['tool_name']}"
-                    print(f"❌ {tool_display:45s} | ERROR: {str(e)}")
+                            if index is None:
+                                index = ToolIndex(readme)
+                            params = self.extract_parameters_for_tool(tool, index)
+                            parsed[name] = [{key: value for key, value in param.items() if key != 'tool_id'}
+                                            for param in params]
+                        stats['params_extracted'] += len(params)
+
+                        if params:
+                            stats['tools_with_params'] += 1
+
+                        # Save parameters
+                        inserted = 0
+                        updated = 0
+
+                        for param in params:
+                            # Check if exists before saving
+                            self.cursor.execute("""
+                                SELECT id FROM tool_parameters
+                                WHERE tool_id = ? AND name = ?
+                            """, (param['tool_id'], param['name']))
+
+                            if self.cursor.fetchone():
+                                updated += 1
+                            else:
+                                inserted += 1
+
+                            self.save_parameter(param)
+
+                        stats['params_inserted'] += inserted
+                        stats['params_updated'] += updated
+
+                        # Log details
+                        status = "✅" if params else "⚠️ "
+                        tool_display = f"{tool['server_slug']}::{tool['tool_name']}"
+                        print(f"{status} {tool_display:45s} | {len(params):2d} params | +{inserted} ~{updated}")
+
+                        stats['tool_details'].append({
+                            'server_slug': tool['server_slug'],
+                            'tool_name': tool['tool_name'],
+                            'params_count': len(params),
+                            'inserted': inserted,
+                            'updated': updated
+                        })
+
+                    except Exception as e:
+                        stats['errors'] += 1
+                        tool_display = f"{tool['server_slug']}::{tool['tool_name']}"
+                        print(f"❌ {tool_display:45s} | ERROR: {str(e)}")
+
+                if len(parsed) > cached_count:
+                    self.parse_cache.put(readme, parsed)
+
+            stats['parse_cache'] = self.parse_cache.summary()
 
             # Commit or rollback
             if commit:
@@ -312,6 +326,8 @@ class ParametersEnricher:
         print(f"  • New parameters inserted: {stats['params_inserted']}")
         print(f"  • Existing parameters updated: {stats['params_updated']}")
         print(f"Errors: {stats['errors']}")
+        if 'parse_cache' in stats:
+            print(f"Parse cache (READMEs): {stats['parse_cache']}")
         print()
 
         # Show top tools by parameter count
@@ -338,6 +354,7 @@ def main():
     parser.add_argument('--limit', type=int, help='Limit number of tools to process')
     parser.add_argument('--dry-run', action='store_true', help='Dry-run mode (no commit)')
     parser.add_argument('--db', default='data/mcp_servers.db', help='Database path')
+    parser.add_argument('--no-cache', action='store_true', help='Reparse every README (ignore the parse cache)')
 
     args = parser.parse_args()
 
@@ -353,10 +370,11 @@ def main():
     print(f"Database: {db_path}")
     print(f"Limit: {args.limit or 'None (all tools)'}")
     print(f"Mode: {'DRY-RUN' if args.dry_run else 'COMMIT'}")
+    print(f"Parse cache: {'disabled' if args.no_cache else 'enabled'}")
     print("=" * 70)
     print()
 
-    enricher = ParametersEnricher(str(db_path))
+    enricher = ParametersEnricher(str(db_path), use_parse_cache=not args.no_cache)
     stats = enricher.enrich(limit=args.limit, commit=not args.dry_run)
     enricher.print_summary(stats)
 
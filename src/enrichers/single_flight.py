@@ -0,0 +1,115 @@
+"""
+Single-flight request coalescing
+Many servers resolve to the same owner/repo (monorepo subpackages): one
+in-flight fetch per key is shared by every concurrent caller, and its result
+is memoized for a while so later callers don't repeat it either.
+"""
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls per key and memoizes their results with a TTL
+
+    - A caller arriving while the key is being fetched awaits that fetch.
+    - A caller arriving within ttl_seconds after it gets the memoized result.
+    - Failures (exceptions) and None results are not memoized.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 10000):
+        """
+        Initialize the coalescer
+
+        Args:
+            ttl_seconds: How long a result is reused
+            max_entries: Memoized results kept (oldest dropped beyond it)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._memo: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.stats = {'calls': 0, 'executed': 0, 'joined_inflight': 0, 'memo_hits': 0}
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run factory() once for all callers of the same key
+
+        Args:
+            key: Deduplication key (e.g. 'readme:owner/repo')
+            factory: Coroutine function performing the actual fetch
+
+        Returns:
+            The (possibly shared) result of factory()
+        """
+        self.stats['calls'] += 1
+        now = time.monotonic()
+
+        entry = self._memo.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self.stats['memo_hits'] += 1
+                return entry[1]
+            del self._memo[key]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['joined_inflight'] += 1
+            # shield: a cancelled waiter must not cancel the shared fetch
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.stats['executed'] += 1
+
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if value is not None:
+                self._remember(key, value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def _remember(self, key: str, value: Any):
+        """Memoize a result, dropping the oldest entries beyond max_entries"""
+        self._memo[key] = (time.monotonic() + self.ttl_seconds, value)
+        while len(self._memo) > self.max_entries:
+            del self._memo[next(iter(self._memo))]
+
+    def clear(self):
+        """Forget memoized results (in-flight fetches are unaffected)"""
+        self._memo.clear()
+
+    def get_stats(self) -> Dict:
+        """
+        Get coalescing statistics
+
+        Returns:
+            Counters plus 'coalesced' (calls answered without their own fetch)
+        """
+        return dict(self.stats, coalesced=self.stats['joined_inflight'] + self.stats['memo_hits'],
+                    memoized=len(self._memo))
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide coalescer shared by every enricher"""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
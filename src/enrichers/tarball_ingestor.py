@@ -0,0 +1,410 @@
+"""
+Repository tarball ingestion
+Downloads a repository once as /tarball/{sha} and keeps, in memory, only a
+whitelist of files (README, package.json, pyproject.toml, Dockerfile) plus
+what the file listing itself tells: community files and language sizes.
+One download replaces the README, languages and community profile calls
+of the config backfill (apply_snapshot_profile), and gives manifests to
+read package names and configs from.
+"""
+import io
+import os
+import re
+import json
+import queue
+import asyncio
+import tarfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from loguru import logger
+
+from src.enrichers.github_enricher import GitHubEnricher, GITHUB_API_BASE, README_MAX_BYTES
+from src.parsers.readme_parser import ReadmeParser
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+project_root = Path(__file__).parent.parent.parent
+DEFAULT_SNAPSHOT_DIR = project_root / 'data' / 'cache' / 'tarballs'
+
+TARBALL_CHUNK_SIZE = 64 * 1024
+
+# Root-level files whose content is kept
+README_PATTERN = re.compile(r'^readme(\.(md|markdown|mdx|rst|txt))?$', re.IGNORECASE)
+MANIFEST_FILES = ('package.json', 'pyproject.toml', 'Dockerfile')
+
+# Files only recorded as present (community profile equivalent)
+LICENSE_PATTERN = re.compile(r'^(license|licence|copying)(\.\w+)?$', re.IGNORECASE)
+CONTRIBUTING_PATTERN = re.compile(r'^(\.github/|docs/)?contributing(\.\w+)?$', re.IGNORECASE)
+CODE_OF_CONDUCT_PATTERN = re.compile(r'^(\.github/|docs/)?code_of_conduct(\.\w+)?$', re.IGNORECASE)
+
+# Directories left out of language sizes (dependencies, build output)
+SKIPPED_DIRS = ('node_modules/', 'vendor/', 'dist/', 'build/', '.git/')
+
+LANGUAGE_EXTENSIONS = {
+    '.ts': 'TypeScript', '.tsx': 'TypeScript', '.mts': 'TypeScript',
+    '.js': 'JavaScript', '.jsx': 'JavaScript', '.mjs': 'JavaScript', '.cjs': 'JavaScript',
+    '.py': 'Python', '.go': 'Go', '.rs': 'Rust', '.java': 'Java', '.kt': 'Kotlin',
+    '.cs': 'C#', '.rb': 'Ruby', '.php': 'PHP', '.swift': 'Swift', '.c': 'C', '.h': 'C',
+    '.cpp': 'C++', '.cc': 'C++', '.hpp': 'C++', '.sh': 'Shell', '.lua': 'Lua',
+    '.dart': 'Dart', '.scala': 'Scala', '.ex': 'Elixir', '.exs': 'Elixir', '.zig': 'Zig',
+}
+
+
+class _ChunkReader(io.RawIOBase):
+    """
+    Blocking file-like view over chunks pushed from the event loop
+
+    tarfile reads synchronously in a worker thread while the event loop
+    keeps downloading; the bounded queue is the only buffer between them.
+    """
+
+    def __init__(self, max_chunks: int = 16):
+        self.chunks = queue.Queue(maxsize=max_chunks)
+        self.buffer = b''
+        self.eof = False
+        self.abandoned = False  # Set by the reader when it stops early
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        while not self.buffer and not self.eof:
+            chunk = self.chunks.get()
+            if chunk is None:
+                self.eof = True
+            else:
+                self.buffer = chunk
+        size = min(len(target), len(self.buffer))
+        target[:size] = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+        return size
+
+    def push(self, chunk: Optional[bytes]):
+        """Hand a chunk (None = end of stream) to the reader, unless it gave up"""
+        while not self.abandoned:
+            try:
+                self.chunks.put(chunk, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+
+class SnapshotCache:
+    """
+    Bounded on-disk cache of extracted snapshots, keyed by commit sha
+
+    A commit never changes, so entries never go stale; the least recently
+    used ones are dropped beyond max_entries.
+    """
+
+    def __init__(self, directory: Path = DEFAULT_SNAPSHOT_DIR, max_entries: int = 2000):
+        """
+        Initialize the cache
+
+        Args:
+            directory: Cache directory (one JSON file per commit)
+            max_entries: Snapshots kept
+        """
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, sha: str) -> Path:
+        return self.directory / f"{sha}.json"
+
+    def get(self, sha: str) -> Optional[Dict]:
+        """Load a snapshot (None if absent or unreadable)"""
+        path = self._path(sha)
+        try:
+            snapshot = json.loads(path.read_text(encoding='utf-8'))
+            os.utime(path)  # Recently used
+            return snapshot
+        except (OSError, ValueError):
+            return None
+
+    def put(self, sha: str, snapshot: Dict):
+        """Store a snapshot and evict the least recently used beyond max_entries"""
+        path = self._path(sha)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(snapshot), encoding='utf-8')
+        tmp_path.replace(path)
+
+        entries = sorted(self.directory.glob('*.json'), key=lambda p: p.stat().st_mtime)
+        for stale in entries[:max(0, len(entries) - self.max_entries)]:
+            stale.unlink(missing_ok=True)
+
+
+class TarballIngestor:
+    """
+    Builds repository snapshots from tarballs
+
+    A snapshot is a JSON-serializable dict:
+    - 'sha', 'owner', 'repo'
+    - 'files': {path: text} for the README and MANIFEST_FILES at the root
+    - 'truncated': paths cut at max_file_bytes
+    - 'has_license', 'has_contributing', 'has_code_of_conduct'
+    - 'languages': {language: bytes} from file extensions
+    """
+
+    def __init__(self, enricher: GitHubEnricher, cache: Optional[SnapshotCache] = None,
+                 max_file_bytes: int = README_MAX_BYTES):
+        """
+        Initialize the ingestor
+
+        Args:
+            enricher: Started GitHubEnricher (session, token pool, rate limits)
+            cache: Snapshot cache (default: data/cache/tarballs)
+            max_file_bytes: Size cap per extracted file
+        """
+        self.enricher = enricher
+        self.cache = cache or SnapshotCache()
+        self.max_file_bytes = max_file_bytes
+
+        self.stats = {'snapshots': 0, 'cache_hits': 0, 'downloads': 0, 'bytes_downloaded': 0, 'failed': 0}
+
+    async def ingest(self, owner: str, repo: str, ref: str = 'HEAD') -> Optional[Dict]:
+        """
+        Get the snapshot of a repository at a ref
+
+        The ref is resolved to a commit sha first (tiny, usually 304); the
+        tarball is only downloaded when that commit isn't cached yet.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch, tag or 'HEAD' for the default branch
+
+        Returns:
+            Snapshot dict or None if failed
+        """
+        sha = await self.enricher.fetch_head_sha(owner, repo, ref)
+        if not sha:
+            self.stats['failed'] += 1
+            return None
+
+        snapshot = self.cache.get(sha)
+        if snapshot is not None:
+            self.stats['cache_hits'] += 1
+            self.stats['snapshots'] += 1
+            return snapshot
+
+        snapshot = await self._download(owner, repo, sha)
+        if snapshot is None:
+            self.stats['failed'] += 1
+            return None
+
+        self.cache.put(sha, snapshot)
+        self.stats['snapshots'] += 1
+        return snapshot
+
+    async def _download(self, owner: str, repo: str, sha: str) -> Optional[Dict]:
+        """Stream /tarball/{sha} through the tar scanner"""
+        enricher = self.enricher
+        if not enricher.session:
+            await enricher.start()
+
+        reader = _ChunkReader()
+        scan = asyncio.create_task(asyncio.to_thread(self._scan, reader))
+        url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/tarball/{sha}"
+
+        downloaded = False
+        try:
+            token = await enricher._check_rate_limit()
+            enricher.request_count += 1
+            self.stats['downloads'] += 1
+
+            # Redirects to codeload.github.com (the Authorization header isn't forwarded)
+            async with enricher.session.get(url, headers=enricher._auth_headers(token)) as response:
+                enricher.pool.update(token, response.status, response.headers)
+                if response.status != 200:
+                    print(f"    ⚠️  HTTP {response.status}: tarball {owner}/{repo}")
+                    return None
+
+                async for chunk in response.content.iter_chunked(TARBALL_CHUNK_SIZE):
+                    if reader.abandoned:
+                        break
+                    self.stats['bytes_downloaded'] += len(chunk)
+                    await asyncio.to_thread(reader.push, chunk)
+                downloaded = True
+
+        except Exception as e:
+            print(f"    [ERROR] Tarball download failed for {owner}/{repo}: {e}")
+
+        finally:
+            # Unblock the scanner and collect it on every exit path (non-200, errors, cancellation)
+            await asyncio.to_thread(reader.push, None)
+            if not downloaded:
+                await asyncio.gather(scan, return_exceptions=True)
+
+        if not downloaded:
+            return None
+
+        try:
+            snapshot = await scan
+        except Exception as e:
+            logger.warning(f"Could not read tarball of {owner}/{repo}: {e}")
+            return None
+
+        snapshot.update(sha=sha, owner=owner, repo=repo)
+        return snapshot
+
+    def _scan(self, reader: _ChunkReader) -> Dict:
+        """Walk the tar stream once, keeping whitelisted files (runs in a thread)"""
+        snapshot = {'files': {}, 'truncated': [], 'languages': {}, 'has_license': False,
+                    'has_contributing': False, 'has_code_of_conduct': False}
+        try:
+            with tarfile.open(fileobj=reader, mode='r|gz') as tar:
+                for member in tar:
+                    if not member.isfile():
+                        continue
+                    # Entries live under a single "{owner}-{repo}-{sha}/" directory
+                    path = member.name.split('/', 1)[1] if '/' in member.name else member.name
+                    self._record(snapshot, path, member.size)
+
+                    if path in MANIFEST_FILES or README_PATTERN.match(path):
+                        handle = tar.extractfile(member)
+                        data = handle.read(self.max_file_bytes)
+                        snapshot['files'][path] = data.decode('utf-8', errors='ignore')
+                        if member.size > self.max_file_bytes:
+                            snapshot['truncated'].append(path)
+        finally:
+            reader.abandoned = True
+        return snapshot
+
+    def _record(self, snapshot: Dict, path: str, size: int):
+        """Account for a file of the listing (community files, language sizes)"""
+        if LICENSE_PATTERN.match(path):
+            snapshot['has_license'] = True
+        elif CONTRIBUTING_PATTERN.match(path):
+            snapshot['has_contributing'] = True
+        elif CODE_OF_CONDUCT_PATTERN.match(path):
+            snapshot['has_code_of_conduct'] = True
+
+        padded = f"/{path}"
+        if any(f"/{directory}" in padded for directory in SKIPPED_DIRS):
+            return
+        language = LANGUAGE_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if language:
+            snapshot['languages'][language] = snapshot['languages'].get(language, 0) + size
+
+    def get_stats(self) -> Dict:
+        """Get ingestion statistics"""
+        return dict(self.stats)
+
+
+def snapshot_readme(snapshot: Dict) -> Optional[str]:
+    """README text of a snapshot (None if the repository has none)"""
+    for path, content in snapshot['files'].items():
+        if README_PATTERN.match(path):
+            return content
+    return None
+
+
+def _package_json(snapshot: Dict) -> Optional[Dict]:
+    try:
+        data = json.loads(snapshot['files'].get('package.json') or 'null')
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _pyproject(snapshot: Dict) -> Optional[Dict]:
+    content = snapshot['files'].get('pyproject.toml')
+    if not content:
+        return None
+    if tomllib is not None:
+        try:
+            return tomllib.loads(content)
+        except ValueError:
+            return None
+    # No TOML parser: the project name is all we need
+    match = re.search(r'^\[project\][^\[]*?^name\s*=\s*["\']([^"\']+)["\']', content, re.MULTILINE | re.DOTALL)
+    return {'project': {'name': match.group(1)}} if match else None
+
+
+def npm_package_name(snapshot: Dict) -> Optional[str]:
+    """
+    Published npm package name from package.json
+
+    Returns:
+        Package name, or None for private/unnamed packages
+    """
+    package = _package_json(snapshot)
+    if not package or package.get('private') or not package.get('name'):
+        return None
+    return package['name']
+
+
+def manifest_config(snapshot: Dict) -> Optional[Dict]:
+    """
+    Installation config derived from manifests, in ReadmeParser's format
+
+    An npm package with a 'bin' runs through npx; a Python project with
+    [project.scripts] runs through uvx.
+    """
+    package = _package_json(snapshot)
+    name = npm_package_name(snapshot)
+    if name and package.get('bin'):
+        return {'type': 'npm', 'command': 'npx', 'args': ['-y', name], 'package': name}
+
+    project = (_pyproject(snapshot) or {}).get('project') or {}
+    # Without tomllib only the name is known: assume it is runnable
+    if project.get('name') and (project.get('scripts') or tomllib is None):
+        return {'type': 'npm', 'command': 'uvx', 'args': [project['name']],
+                'package': project['name'], 'runtime': 'python'}
+
+    return None
+
+
+def apply_snapshot_profile(gh_info, snapshot: Dict):
+    """
+    Copy what a snapshot's file listing tells onto a GithubInfo row, in place
+    of the languages and community profile calls
+
+    Community files are exact and always copied (the health score follows
+    their 5 points each). Language sizes are approximated from file sizes by
+    extension, so they only fill rows GitHub's linguist data hasn't.
+
+    Args:
+        gh_info: GithubInfo instance
+        snapshot: Snapshot dict from TarballIngestor.ingest()
+    """
+    flags = {
+        'has_readme': snapshot_readme(snapshot) is not None,
+        'has_license': snapshot['has_license'],
+        'has_contributing': snapshot['has_contributing'],
+        'has_code_of_conduct': snapshot['has_code_of_conduct'],
+    }
+    if gh_info.github_health_score is not None:
+        delta = sum(5 * (int(value) - (getattr(gh_info, name) or 0)) for name, value in flags.items())
+        gh_info.github_health_score = max(0, min(100, gh_info.github_health_score + delta))
+    for name, value in flags.items():
+        setattr(gh_info, name, 1 if value else 0)
+
+    languages = snapshot['languages']
+    if languages and not gh_info.languages_dict:
+        languages = dict(sorted(languages.items(), key=lambda item: item[1], reverse=True))
+        gh_info.languages_dict = languages
+        gh_info.primary_language = gh_info.primary_language or next(iter(languages))
+
+
+def parse_snapshot(snapshot: Dict) -> Dict:
+    """
+    Parse a snapshot like a README, with manifests as fallback
+
+    Returns:
+        Dict shaped like ReadmeParser.parse_all()
+    """
+    readme = snapshot_readme(snapshot)
+    if readme:
+        config_data = ReadmeParser(readme).parse_all()
+    else:
+        config_data = {'installation_config': None, 'env_required': [], 'env_descriptions': {}}
+
+    if not config_data.get('installation_config'):
+        config_data['installation_config'] = manifest_config(snapshot)
+    return config_data
@@ -14,7 +14,8 @@ if sys.platform == 'win32':
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from parsers.tools_parser import ToolsParser
+from parsers.tools_parser import ToolsParser, PARSER_VERSION
+from parsers.parse_cache import ParseCache
 
 
 class ToolsEnricher:
@@ -22,9 +23,12 @@ class ToolsEnricher:
     Extract tools from server READMEs and populate the tools table
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, use_parse_cache: bool = True):
         self.db_path = db_path
         self.parser = ToolsParser()
+        self.use_parse_cache = use_parse_cache
+        self.parse_cache = None
+        self.budget_exceeded = None
         self.conn = None
         self.cursor = None
 
@@ -72,8 +76,18 @@ class ToolsEnricher:
         return servers
 
     def extract_tools_for_server(self, server: Dict) -> List[Dict]:
-        """Extract tools from server README"""
-        tools = self.parser.parse_tools(server['content'])
+        """Extract tools from server README (served from the parse cache when unchanged)"""
+        self.budget_exceeded = None
+        cached = self.parse_cache.get(server['content']) if self.parse_cache else None
+
+        if cached is not None:
+            tools = [dict(tool) for tool in cached]
+        else:
+            tools = self.parser.parse_tools(server['content'])
+            self.budget_exceeded = self.parser.budget_exceeded
+            # A README cut short by the parse budget is parsed again next run
+            if self.parse_cache and not self.budget_exceeded:
+                self.parse_cache.put(server['content'], tools)
 
         # Add server_id to each tool
         for tool in tools:
@@ -167,6 +181,7 @@ class ToolsEnricher:
             'tools_extracted': 0,
             'tools_inserted': 0,
             'tools_updated': 0,
+            'budget_exceeded': 0,
             'errors': 0,
             'server_details': []
         }
@@ -176,6 +191,10 @@ class ToolsEnricher:
             servers = self.get_servers_with_readmes(limit=limit)
             stats['servers_total'] = len(servers)
 
+            # One bulk lookup for all READMEs
+            self.parse_cache = ParseCache(self.conn, 'tools', PARSER_VERSION, enabled=self.use_parse_cache)
+            self.parse_cache.prefetch(server['content'] for server in servers)
+
             print(f"Processing {len(servers)} servers...")
             print()
 
@@ -186,6 +205,9 @@ class ToolsEnricher:
                     # Extract tools
                     tools = self.extract_tools_for_server(server)
                     stats['tools_extracted'] += len(tools)
+                    if self.budget_exceeded:
+                        stats['budget_exceeded'] += 1
+                        print(f"⏱️  {server['slug']:30s} | {self.budget_exceeded}")
 
                     if tools:
                         stats['servers_with_tools'] += 1
@@ -226,6 +248,8 @@ class ToolsEnricher:
                     stats['errors'] += 1
                     print(f"❌ {server['slug']:30s} | ERROR: {str(e)}")
 
+            stats['parse_cache'] = self.parse_cache.summary()
+
             # Commit or rollback
             if commit:
                 self.conn.commit()
@@ -258,7 +282,11 @@ class ToolsEnricher:
         print(f"Total tools extracted: {stats['tools_extracted']}")
         print(f"  • New tools inserted: {stats['tools_inserted']}")
         print(f"  • Existing tools updated: {stats['tools_updated']}")
+        if stats.get('budget_exceeded'):
+            print(f"READMEs cut short by the parse budget: {stats['budget_exceeded']}")
         print(f"Errors: {stats['errors']}")
+        if 'parse_cache' in stats:
+            print(f"Parse cache: {stats['parse_cache']}")
         print()
 
         if success_rate >= 80:
@@ -275,6 +303,7 @@ def main():
     parser.add_argument('--limit', type=int, help='Limit number of servers to process')
     parser.add_argument('--dry-run', action='store_true', help='Dry-run mode (no commit)')
     parser.add_argument('--db', default='data/mcp_servers.db', help='Database path')
+    parser.add_argument('--no-cache', action='store_true', help='Reparse every README (ignore the parse cache)')
 
     args = parser.parse_args()
 
@@ -290,10 +319,11 @@ def main():
     print(f"Database: {db_path}")
     print(f"Limit: {args.limit or 'None (all servers)'}")
     print(f"Mode: {'DRY-RUN' if args.dry_run else 'COMMIT'}")
+    print(f"Parse cache: {'disabled' if args.no_cache else 'enabled'}")
     print("=" * 70)
     print()
 
-    enricher = ToolsEnricher(str(db_path))
+    enricher = ToolsEnricher(str(db_path), use_parse_cache=not args.no_cache)
     stats = enricher.enrich(limit=args.limit, commit=not args.dry_run)
     enricher.print_summary(stats)
 
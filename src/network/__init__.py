@@ -0,0 +1,18 @@
+"""
+Shared HTTP plumbing (connection pooling, caching) for enrichers and scrapers
+"""
+from .http_pool import (
+    HttpClientRegistry,
+    get_http_registry,
+    close_http_registry,
+    http_client_scope,
+    run_in_http_scope
+)
+
+__all__ = [
+    'HttpClientRegistry',
+    'get_http_registry',
+    'close_http_registry',
+    'http_client_scope',
+    'run_in_http_scope'
+]
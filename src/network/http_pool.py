@@ -0,0 +1,158 @@
+"""
+Process-wide HTTP client registry
+One keep-alive TCPConnector (per-host limit, DNS cache) shared by every
+aiohttp session in the process, so enrichers and scripts reuse connections
+and TLS sessions instead of opening a new pool per object.
+"""
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional, Dict
+
+import aiohttp
+from dotenv import load_dotenv
+from loguru import logger
+
+# Load environment variables from config/.env
+project_root = Path(__file__).parent.parent.parent
+load_dotenv(project_root / 'config' / '.env')
+
+
+class HttpClientRegistry:
+    """
+    Owns the shared connector and hands out sessions bound to it
+
+    Sessions are created with connector_owner=False: closing a session (e.g.
+    in an enricher's close()) releases nothing but the session itself. The
+    connector, and with it every pooled connection, is closed by close().
+    """
+
+    def __init__(self, limit: Optional[int] = None, limit_per_host: Optional[int] = None,
+                 ttl_dns_cache: Optional[int] = None, keepalive_timeout: Optional[float] = None,
+                 total_timeout: Optional[float] = None, connect_timeout: Optional[float] = None):
+        """
+        Initialize the registry (unset values are read from the environment)
+
+        Args:
+            limit: Total connection limit (HTTP_MAX_CONNECTIONS, default 100)
+            limit_per_host: Connections per host (MAX_CONCURRENT_REQUESTS, default 10)
+            ttl_dns_cache: DNS cache lifetime in seconds (HTTP_DNS_CACHE_SECONDS, default 300)
+            keepalive_timeout: Idle keep-alive in seconds (HTTP_KEEPALIVE_SECONDS, default 30)
+            total_timeout: Default request timeout in seconds (HTTP_TIMEOUT_SECONDS, default 30)
+            connect_timeout: Default connect timeout in seconds (HTTP_CONNECT_TIMEOUT_SECONDS, default 10)
+        """
+        self.limit = limit or int(os.getenv('HTTP_MAX_CONNECTIONS', 100))
+        self.limit_per_host = limit_per_host or int(os.getenv('MAX_CONCURRENT_REQUESTS', 10))
+        self.ttl_dns_cache = ttl_dns_cache or int(os.getenv('HTTP_DNS_CACHE_SECONDS', 300))
+        self.keepalive_timeout = keepalive_timeout or float(os.getenv('HTTP_KEEPALIVE_SECONDS', 30))
+        self.timeout = aiohttp.ClientTimeout(
+            total=total_timeout or float(os.getenv('HTTP_TIMEOUT_SECONDS', 30)),
+            connect=connect_timeout or float(os.getenv('HTTP_CONNECT_TIMEOUT_SECONDS', 10))
+        )
+
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.sessions_created = 0
+
+    def connector(self) -> aiohttp.TCPConnector:
+        """
+        Get the shared connector, creating it on first use
+
+        A connector is bound to its event loop: a new loop (e.g. a second
+        asyncio.run() in the same process) gets a fresh connector.
+        """
+        loop = asyncio.get_running_loop()
+        if self._connector is None or self._connector.closed or self._loop is not loop:
+            if self._connector is not None and not self._connector.closed and self._loop is not loop:
+                logger.debug("Event loop changed, dropping previous HTTP connector")
+            self._connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.ttl_dns_cache,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._loop = loop
+        return self._connector
+
+    def session(self, headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[aiohttp.ClientTimeout] = None, **kwargs) -> aiohttp.ClientSession:
+        """
+        Create a session over the shared connector
+
+        The caller owns the session and should close it; the connector stays open.
+
+        Args:
+            headers: Default headers for the session
+            timeout: Request timeout (default: registry timeout)
+            **kwargs: Extra ClientSession arguments (e.g. cookies)
+
+        Returns:
+            aiohttp.ClientSession
+        """
+        self.sessions_created += 1
+        return aiohttp.ClientSession(
+            connector=self.connector(),
+            connector_owner=False,
+            headers=headers,
+            timeout=timeout or self.timeout,
+            **kwargs
+        )
+
+    async def close(self):
+        """Close the shared connector and every pooled connection"""
+        if self._connector is not None and not self._connector.closed:
+            await self._connector.close()
+        self._connector = None
+        self._loop = None
+
+    def get_stats(self) -> Dict:
+        """Get registry statistics"""
+        return {
+            'sessions_created': self.sessions_created,
+            'limit_per_host': self.limit_per_host,
+            'connector_open': self._connector is not None and not self._connector.closed,
+        }
+
+
+_registry: Optional[HttpClientRegistry] = None
+
+
+def get_http_registry() -> HttpClientRegistry:
+    """Get the process-wide registry"""
+    global _registry
+    if _registry is None:
+        _registry = HttpClientRegistry()
+    return _registry
+
+
+async def close_http_registry():
+    """Close the process-wide registry's connections (call once at shutdown)"""
+    if _registry is not None:
+        await _registry.close()
+
+
+@asynccontextmanager
+async def http_client_scope():
+    """
+    Scope for a script's main(): pooled connections are closed on exit
+
+    Example:
+        async with http_client_scope():
+            await run_pipeline()
+    """
+    try:
+        yield get_http_registry()
+    finally:
+        await close_http_registry()
+
+
+async def run_in_http_scope(coro):
+    """
+    Await a coroutine inside http_client_scope()
+
+    Example:
+        asyncio.run(run_in_http_scope(main()))
+    """
+    async with http_client_scope():
+        return await coro
@@ -0,0 +1,262 @@
+"""
+Incremental JSON field extraction
+Parses a JSON document as it streams in and materializes only selected
+subtrees; everything else is scanned past without building Python objects.
+Used for npm packuments, whose `versions` history can weigh megabytes.
+"""
+import re
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Path = Tuple[Any, ...]
+
+# What to do with the value found at a path
+DESCEND = 'descend'   # Walk into the object/array, asking again for each child
+CAPTURE = 'capture'   # Materialize the whole value
+SKIP = 'skip'         # Scan past it
+
+# Next character that matters while scanning past a value
+_IN_STRING = re.compile(r'["\\]')
+_OUT_OF_STRING = re.compile(r'["{}\[\]]')
+_LITERAL_END = re.compile(r'[\s,\]}]')
+_STRING_REST = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+_WHITESPACE = re.compile(r'\s*')
+
+
+class _Frame:
+    """A container being walked (DESCEND)"""
+    __slots__ = ('is_object', 'path', 'state', 'key', 'index')
+
+    def __init__(self, is_object: bool, path: Path):
+        self.is_object = is_object
+        self.path = path
+        self.state = 'first'   # first | key | colon | value | comma
+        self.key = None
+        self.index = 0
+
+
+class _Scan:
+    """A value being scanned past or captured"""
+    __slots__ = ('path', 'parts', 'depth', 'in_string', 'escape', 'literal')
+
+    def __init__(self, path: Path, capture: bool, first: str):
+        self.path = path
+        self.parts: Optional[List[str]] = [] if capture else None
+        self.depth = 0
+        self.in_string = first == '"'
+        self.escape = False
+        self.literal = first not in '"{['
+
+
+class JsonStreamExtractor:
+    """
+    Push parser returning the values at selected paths
+
+    Paths are tuples of object keys and array indexes, () being the root.
+    `select(path, results)` decides, for every value reached, whether to
+    DESCEND, CAPTURE or SKIP it; it can look at what was captured so far
+    (e.g. capture versions[latest] once dist-tags is known).
+
+    Example:
+        extractor = JsonStreamExtractor(select)
+        for text in chunks:
+            extractor.feed(text)
+        results = extractor.close()   # {('dist-tags',): {...}, ...}
+    """
+
+    def __init__(self, select: Callable[[Path, Dict[Path, Any]], str]):
+        self.select = select
+        self.results: Dict[Path, Any] = {}
+        self._stack: List[_Frame] = []
+        self._scan: Optional[_Scan] = None
+        self._buffer = ''
+        self._done = False
+
+    def feed(self, text: str):
+        """Consume the next piece of the document"""
+        self._buffer += text
+        position = self._run(0)
+        self._buffer = self._buffer[position:]
+
+    def close(self) -> Dict[Path, Any]:
+        """
+        Finish parsing
+
+        Returns:
+            Dict mapping each captured path to its value
+
+        Raises:
+            ValueError: If the document is truncated or malformed
+        """
+        if self._scan is not None and self._scan.literal:
+            # A top-level literal ends with the document
+            self._finish_scan(self._buffer)
+            self._buffer = ''
+        if not self._done or self._buffer.strip():
+            raise ValueError("Truncated or malformed JSON document")
+        return self.results
+
+    def _run(self, i: int) -> int:
+        """Advance as far as the buffer allows; returns the first unconsumed index"""
+        buffer = self._buffer
+        while True:
+            if self._scan is not None:
+                i, finished = self._advance_scan(buffer, i)
+                if not finished:
+                    return i
+                continue
+
+            i = _WHITESPACE.match(buffer, i).end()
+            if i >= len(buffer):
+                return i
+            char = buffer[i]
+
+            if not self._stack:
+                if self._done:
+                    raise ValueError(f"Unexpected data after JSON document: {char!r}")
+                i = self._start_value((), char, i)
+                continue
+
+            frame = self._stack[-1]
+            if frame.state in ('first', 'comma'):
+                closer = '}' if frame.is_object else ']'
+                if char == closer:
+                    self._pop()
+                    i += 1
+                    continue
+                if frame.state == 'comma':
+                    if char != ',':
+                        raise ValueError(f"Expected ',' or {closer!r}, got {char!r}")
+                    frame.state = 'key' if frame.is_object else 'value'
+                    i += 1
+                    continue
+                frame.state = 'key' if frame.is_object else 'value'
+
+            if frame.state == 'key':
+                if char != '"':
+                    raise ValueError(f"Expected object key, got {char!r}")
+                end = self._string_end(buffer, i)
+                if end is None:
+                    return i  # Key split across chunks: wait for the rest
+                frame.key = json.loads(buffer[i:end])
+                frame.state = 'colon'
+                i = end
+            elif frame.state == 'colon':
+                if char != ':':
+                    raise ValueError(f"Expected ':', got {char!r}")
+                frame.state = 'value'
+                i += 1
+            else:  # value
+                child = frame.path + ((frame.key,) if frame.is_object else (frame.index,))
+                frame.state = 'comma'
+                frame.index += 1
+                i = self._start_value(child, char, i)
+
+    def _start_value(self, path: Path, char: str, i: int) -> int:
+        """Begin a value at `path` whose first character is buffer[i]"""
+        action = self.select(path, self.results)
+        if action == DESCEND and char in '{[':
+            self._stack.append(_Frame(char == '{', path))
+            return i + 1
+
+        self._scan = _Scan(path, action == CAPTURE, char)
+        if self._scan.literal:
+            return i
+        if self._scan.parts is not None:
+            self._scan.parts.append(char)
+        if not self._scan.in_string:
+            self._scan.depth = 1
+        return i + 1
+
+    def _advance_scan(self, buffer: str, i: int) -> Tuple[int, bool]:
+        """Scan the current value; returns (index, finished)"""
+        scan = self._scan
+        start = i
+
+        if scan.literal:
+            match = _LITERAL_END.search(buffer, i)
+            end = match.start() if match else len(buffer)
+            if scan.parts is not None:
+                scan.parts.append(buffer[start:end])
+            if match is None:
+                return end, False
+            self._finish_scan(None)
+            return end, True
+
+        while True:
+            if scan.escape:
+                if i >= len(buffer):
+                    break
+                scan.escape = False
+                i += 1
+                continue
+
+            pattern = _IN_STRING if scan.in_string else _OUT_OF_STRING
+            match = pattern.search(buffer, i)
+            if match is None:
+                i = len(buffer)
+                break
+
+            char = match.group()
+            i = match.end()
+            if scan.in_string:
+                if char == '\\':
+                    scan.escape = True
+                    continue
+                scan.in_string = False
+                if scan.depth == 0:
+                    return self._end_scan(buffer, start, i)
+            elif char == '"':
+                # Jump over the whole string at once when it is complete in the buffer
+                string = _STRING_REST.match(buffer, i)
+                if string is None:
+                    scan.in_string = True
+                else:
+                    i = string.end()
+            elif char in '{[':
+                scan.depth += 1
+            else:
+                scan.depth -= 1
+                if scan.depth == 0:
+                    return self._end_scan(buffer, start, i)
+
+        if scan.parts is not None:
+            scan.parts.append(buffer[start:i])
+        return i, False
+
+    def _end_scan(self, buffer: str, start: int, end: int) -> Tuple[int, bool]:
+        if self._scan.parts is not None:
+            self._scan.parts.append(buffer[start:end])
+        self._finish_scan(None)
+        return end, True
+
+    def _finish_scan(self, tail: Optional[str]):
+        """Store a captured value and hand control back to the enclosing container"""
+        scan = self._scan
+        if scan.parts is not None:
+            if tail:
+                scan.parts.append(tail)
+            self.results[scan.path] = json.loads(''.join(scan.parts))
+        self._scan = None
+        if not self._stack:
+            self._done = True
+
+    def _pop(self):
+        self._stack.pop()
+        if not self._stack:
+            self._done = True
+
+    @staticmethod
+    def _string_end(buffer: str, i: int) -> Optional[int]:
+        """Index just past the string starting at buffer[i], or None if incomplete"""
+        j = i + 1
+        while True:
+            match = _IN_STRING.search(buffer, j)
+            if match is None:
+                return None
+            if match.group() == '\\':
+                j = match.end() + 1
+                if j > len(buffer):
+                    return None
+                continue
+            return match.end()
@@ -0,0 +1,206 @@
+"""
+Persistent HTTP response cache for conditional requests
+Stores body + ETag/Last-Modified per URL in SQLite so later requests can be
+sent with If-None-Match / If-Modified-Since and answered by a 304.
+"""
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Dict
+
+from dotenv import load_dotenv
+from loguru import logger
+
+# Load environment variables from config/.env
+project_root = Path(__file__).parent.parent.parent
+load_dotenv(project_root / 'config' / '.env')
+
+DEFAULT_CACHE_DIR = project_root / 'data' / 'cache'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_http_responses_accessed ON http_responses(accessed_at);
+"""
+
+
+class ResponseCache:
+    """
+    URL-keyed response cache with LRU eviction
+
+    Entries are never expired by age on lookup: a stale entry still carries
+    the validator that turns the next request into a cheap 304. Age only
+    matters for eviction, which drops entries unused for max_age_seconds and
+    then the least recently used ones beyond max_bytes.
+
+    Counters:
+    - hits: served from cache without a request (entry younger than fresh_seconds)
+    - not_modified: revalidated by a 304 (GitHub doesn't count these against the rate limit)
+    - misses: no usable entry, or the server sent a new body
+    """
+
+    def __init__(self, path: Path, max_age_seconds: float = 30 * 24 * 3600, fresh_seconds: float = 0,
+                 max_bytes: int = 256 * 1024 * 1024):
+        """
+        Open (or create) a cache database
+
+        Args:
+            path: SQLite file path
+            max_age_seconds: Entries not stored or revalidated for this long are evicted
+            fresh_seconds: Entries younger than this are served without any request
+            max_bytes: Total body size cap; least recently used entries are evicted beyond it
+        """
+        self.path = Path(path)
+        self.max_age_seconds = max_age_seconds
+        self.fresh_seconds = fresh_seconds
+        self.max_bytes = max_bytes
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        # WAL lets several worker processes share the cache file
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'stored': 0, 'evicted': 0}
+
+    @classmethod
+    def from_env(cls) -> Optional['ResponseCache']:
+        """
+        Build a cache from ENABLE_CACHE, CACHE_DIR, CACHE_MAX_AGE_DAYS,
+        CACHE_FRESH_MINUTES and CACHE_MAX_MB
+
+        Returns:
+            ResponseCache or None when caching is disabled
+        """
+        if os.getenv('ENABLE_CACHE', 'false').lower() not in ('1', 'true', 'yes'):
+            return None
+
+        cache_dir = Path(os.getenv('CACHE_DIR') or DEFAULT_CACHE_DIR)
+        if not cache_dir.is_absolute():
+            cache_dir = project_root / cache_dir
+
+        return cls(
+            cache_dir / 'http_cache.db',
+            max_age_seconds=float(os.getenv('CACHE_MAX_AGE_DAYS', 30)) * 24 * 3600,
+            fresh_seconds=float(os.getenv('CACHE_FRESH_MINUTES', 0)) * 60,
+            max_bytes=int(float(os.getenv('CACHE_MAX_MB', 256)) * 1024 * 1024)
+        )
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Look up an entry, however old (read-only: recency is recorded when
+        the entry is revalidated or stored)
+
+        Returns:
+            Dict with 'body', 'etag', 'last_modified', 'fetched_at' or None
+        """
+        row = self.conn.execute(
+            'SELECT body, etag, last_modified, fetched_at FROM http_responses WHERE url = ?', (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'body': row[0], 'etag': row[1], 'last_modified': row[2], 'fetched_at': row[3]}
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """True if the entry can be served without revalidation (counted as a hit)"""
+        if self.fresh_seconds and time.time() - entry['fetched_at'] < self.fresh_seconds:
+            self.stats['hits'] += 1
+            return True
+        return False
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for an entry"""
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def mark_not_modified(self, url: str):
+        """Record a 304: the cached body is current again"""
+        self.stats['not_modified'] += 1
+        now = time.time()
+        self.conn.execute('UPDATE http_responses SET fetched_at = ?, accessed_at = ? WHERE url = ?', (now, now, url))
+        self.conn.commit()
+
+    def store(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]):
+        """
+        Store a fresh response (counted as a miss)
+
+        Responses without a validator are not stored: they could never be revalidated.
+        """
+        self.stats['misses'] += 1
+        if not etag and not last_modified:
+            return
+
+        now = time.time()
+        self.conn.execute(
+            'INSERT OR REPLACE INTO http_responses (url, etag, last_modified, body, size, fetched_at, accessed_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (url, etag, last_modified, body, len(body), now, now)
+        )
+        self.conn.commit()
+        self.stats['stored'] += 1
+        self._evict()
+
+    def _evict(self):
+        """Drop entries unused for max_age_seconds, then least recently used ones beyond the size cap"""
+        expired = self.conn.execute(
+            'DELETE FROM http_responses WHERE accessed_at < ?', (time.time() - self.max_age_seconds,)
+        ).rowcount
+        if expired:
+            self.conn.commit()
+            self.stats['evicted'] += expired
+
+        total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM http_responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for url, size in self.conn.execute('SELECT url, size FROM http_responses ORDER BY accessed_at ASC'):
+            victims.append((url,))
+            freed += size
+            if freed >= excess:
+                break
+
+        self.conn.executemany('DELETE FROM http_responses WHERE url = ?', victims)
+        self.conn.commit()
+        self.stats['evicted'] += len(victims)
+        logger.debug(f"Response cache evicted {len(victims)} entries ({freed / 1024:.0f} KB)")
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        return dict(self.stats)
+
+    def close(self):
+        """Close the cache database"""
+        self.conn.close()
+
+
+_cache: Optional[ResponseCache] = None
+_cache_loaded = False
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the process-wide cache configured from the environment (None if disabled)"""
+    global _cache, _cache_loaded
+    if not _cache_loaded:
+        try:
+            _cache = ResponseCache.from_env()
+        except Exception as e:
+            logger.warning(f"HTTP response cache disabled: {e}")
+            _cache = None
+        _cache_loaded = True
+    return _cache
@@ -0,0 +1,69 @@
+"""
+Per-document parse budget
+The README parsers scan in linear time, but a huge README still costs
+proportionally. Documents are clipped to MAX_DOCUMENT_CHARS before parsing,
+and each parse gets a wall-clock deadline checked between stages: when it is
+exceeded, the parser stops and returns what it found so far.
+"""
+import time
+from typing import Optional
+
+# Largest README parsed in full (longer ones are clipped at a line boundary)
+MAX_DOCUMENT_CHARS = 1024 * 1024
+
+# Wall-clock budget for parsing one document
+MAX_PARSE_SECONDS = 2.0
+
+
+class ParseBudgetExceeded(Exception):
+    """Raised by ParseBudget.check() once the deadline has passed"""
+
+    def __init__(self, stage: str, elapsed: float):
+        super().__init__(f"Parse budget exceeded during {stage} ({elapsed:.2f}s)")
+        self.stage = stage
+        self.elapsed = elapsed
+
+
+class ParseBudget:
+    """Deadline for one document, checked cooperatively by the parsers"""
+
+    def __init__(self, max_seconds: Optional[float] = MAX_PARSE_SECONDS):
+        """
+        Start the clock
+
+        Args:
+            max_seconds: Budget in seconds (None for no deadline)
+        """
+        self.started = time.perf_counter()
+        self.deadline = self.started + max_seconds if max_seconds is not None else None
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def check(self, stage: str):
+        """
+        Raise ParseBudgetExceeded if the deadline has passed
+
+        Args:
+            stage: What the parser is doing, for the error message
+        """
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise ParseBudgetExceeded(stage, self.elapsed)
+
+
+def clip_document(text: str, max_chars: int = MAX_DOCUMENT_CHARS) -> str:
+    """
+    Clip a document to max_chars, at the last line break before the limit
+
+    Args:
+        text: Markdown content
+        max_chars: Size limit
+
+    Returns:
+        The text, or its first max_chars characters (whole lines)
+    """
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind('\n', 0, max_chars)
+    return text[:cut + 1 if cut > 0 else max_chars]
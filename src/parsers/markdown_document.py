@@ -0,0 +1,518 @@
+"""
+Markdown document model shared by the README parsers
+A README is tokenized once into headings (with their section tree), fenced
+code blocks, tables and list items. ReadmeParser, ToolsParser
+and ParametersParser all read this model instead of re-scanning the text
+with their own regexes, so they agree on where sections and blocks start
+and end.
+"""
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from .budget import clip_document
+
+_LINE_TOKEN = re.compile(
+    r'^(?:(?P<fence>[ \t]*(?:`{3,}|~{3,}))'
+    r'|(?P<heading>#)'
+    r'|(?P<item>(?P<indent>[ \t]*)(?P<marker>[-*+]|\d+[.)])[ \t]+)'
+    r'|(?P<pipe>[^\n]*\|))',
+    re.MULTILINE)
+_STRUCTURE_TOKEN = re.compile(r'^(?:(?P<fence>[ \t]*(?:`{3,}|~{3,}))|(?P<heading>#))', re.MULTILINE)
+_NEWLINE = re.compile(r'\n')
+_PARAGRAPH_LINE = re.compile(r'^[^\s]', re.MULTILINE)
+_FENCE = re.compile(r'^\s*(`{3,}|~{3,})\s*([^`\s]*)')
+_CLOSING_FENCES = {
+    '`': re.compile(r'^[ \t]*(`{3,})[ \t\r]*$', re.MULTILINE),
+    '~': re.compile(r'^[ \t]*(~{3,})[ \t\r]*$', re.MULTILINE),
+}
+_LIST_MARKER = re.compile(r'\s*(?:[-*+]|\d+[.)])\s')
+# Each run of whitespace can only be matched one way, so a failed match
+# costs one pass over the line
+_TABLE_DELIMITER = re.compile(r'^\s*(?:\|\s*)?:?-+:?\s*(?:\|\s*:?-+:?\s*)*(?:\|\s*)?$')
+
+# Documents kept by parse_markdown()
+DOCUMENT_CACHE_SIZE = 32
+
+
+class Heading:
+    """An ATX heading (`## Title`)"""
+    __slots__ = ('level', 'title', 'line', 'start', 'end')
+
+    def __init__(self, level: int, title: str, line: int, start: int, end: int):
+        self.level = level
+        self.title = title
+        self.line = line      # Line number (0-based)
+        self.start = start    # Offset of the heading line
+        self.end = end        # Offset just past the heading line (start of its body)
+
+    def __repr__(self):
+        return f"<Heading h{self.level} {self.title!r}>"
+
+
+class CodeBlock:
+    """A fenced code block"""
+    __slots__ = ('language', 'content', 'line', 'start', 'end')
+
+    def __init__(self, language: str, content: str, line: int, start: int, end: int):
+        self.language = language  # Lowercased info-string word ('' if none)
+        self.content = content    # Lines between the fences
+        self.line = line
+        self.start = start        # Offset of the opening fence
+        self.end = end            # Offset just past the closing fence
+
+    def __repr__(self):
+        return f"<CodeBlock {self.language or 'plain'} {len(self.content)} chars>"
+
+
+class ListItem:
+    """A bullet or numbered list item (its first line)"""
+    __slots__ = ('indent', 'marker', 'text', 'line', 'start', 'end', 'parent', 'intro')
+
+    def __init__(self, indent: int, marker: str, text: str, line: int, start: int, end: int,
+                 parent: Optional['ListItem'], intro: Optional[str]):
+        self.indent = indent
+        self.marker = marker
+        self.text = text      # Item text without the marker
+        self.line = line
+        self.start = start
+        self.end = end
+        self.parent = parent  # Enclosing item of a nested list
+        self.intro = intro    # Last non-blank line before the list began (e.g. '**Parameters:**')
+
+    def __repr__(self):
+        return f"<ListItem {self.marker} {self.text[:40]!r}>"
+
+
+class Table:
+    """A pipe table"""
+    __slots__ = ('rows', 'line', 'start', 'end')
+
+    def __init__(self, rows: List[List[str]], line: int, start: int, end: int):
+        self.rows = rows      # Cells of every row, delimiter row excluded
+        self.line = line
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"<Table {len(self.rows)} rows>"
+
+
+class Section:
+    """A heading and everything up to the next heading of the same or a higher level"""
+    __slots__ = ('heading', 'level', 'start', 'body_start', 'end', 'parent', 'children')
+
+    def __init__(self, heading: Optional[Heading], parent: Optional['Section'], start: int):
+        self.heading = heading   # None for the document root
+        self.level = heading.level if heading else 0
+        self.start = start
+        self.body_start = heading.end if heading else start
+        self.end = start         # Set when the section is closed
+        self.parent = parent
+        self.children: List['Section'] = []
+
+    @property
+    def title(self) -> str:
+        return self.heading.title if self.heading else ''
+
+    def __repr__(self):
+        return f"<Section h{self.level} {self.title!r} [{self.start}:{self.end}]>"
+
+
+def _between(items: list, starts: List[int], start: int, end: int) -> list:
+    """Items whose start offset lies in [start, end)"""
+    return items[bisect_left(starts, start):bisect_left(starts, end)]
+
+
+def _parse_heading(line: str) -> Optional[Tuple[int, str]]:
+    """
+    (level, title) of an ATX heading line, or None
+
+    String operations rather than a regex: a lazy title group followed by an
+    optional closing sequence backtracks quadratically on whitespace runs.
+    """
+    title = line.lstrip('#')
+    level = len(line) - len(title)
+    if level > 6:
+        return None
+    title = title.strip()
+    # Optional closing sequence: "## Title ##"
+    closed = title.rstrip('#')
+    if closed != title and closed[-1:].isspace():
+        title = closed.rstrip()
+    return level, title
+
+
+def _split_row(line: str) -> List[str]:
+    """Cells of a pipe-table row"""
+    row = line.strip()
+    if row.startswith('|'):
+        row = row[1:]
+    if row.endswith('|'):
+        row = row[:-1]
+    return [cell.strip() for cell in row.split('|')]
+
+
+class MarkdownDocument:
+    """
+    Tokenized markdown
+
+    Headings (with their section tree) and fenced code blocks are tokenized
+    up front in one pass. List items and tables are tokenized on first use,
+    over the document or only over a `region()` of it: parsers that read the
+    lists of one section don't pay for the lists of the whole README.
+    Headings, list items and tables inside code blocks are ignored. All
+    offsets index into `text`.
+    """
+
+    def __init__(self, text: str):
+        """
+        Tokenize a markdown document
+
+        Args:
+            text: Markdown content
+        """
+        self.text = text
+        self.start = 0
+        self.end = len(text)
+
+        self.headings: List[Heading] = []
+        self.code_blocks: List[CodeBlock] = []
+        self._scan_structure()
+
+        self.root = Section(None, None, 0)
+        self.sections: List[Section] = []
+        self._build_sections()
+
+        self._root = self
+        self._lines: Optional[List[str]] = None
+        self._newlines: Optional[List[int]] = None
+        self._list_items: Optional[List[ListItem]] = None
+        self._tables: Optional[List[Table]] = None
+        self._index()
+
+    # ------------------------------------------------------------------
+    # Tokenization
+    # ------------------------------------------------------------------
+
+    def _scan_structure(self):
+        """
+        Single pass collecting headings and code blocks
+
+        _STRUCTURE_TOKEN jumps from one fence or heading line to the next,
+        so everything else is skipped at regex speed; code blocks are
+        consumed whole.
+        """
+        text = self.text
+        pos = 0
+        line = 0
+        line_pos = 0
+
+        while True:
+            token = _STRUCTURE_TOKEN.search(text, pos)
+            if token is None:
+                break
+
+            start = token.start()
+            line += text.count('\n', line_pos, start)
+            line_pos = start
+            stop, end = self._line_end(start)
+
+            if token.lastgroup == 'fence':
+                block = self._read_code_block(text[start:stop], line, start, end)
+                self.code_blocks.append(block)
+                pos = block.end
+            else:
+                heading = _parse_heading(text[start:stop])
+                if heading:
+                    self.headings.append(Heading(heading[0], heading[1], line, start, end))
+                pos = end
+
+    def _line_end(self, start: int) -> Tuple[int, int]:
+        """(offset of the line's newline or the end, offset of the next line)"""
+        stop = self.text.find('\n', start)
+        if stop < 0:
+            return len(self.text), len(self.text)
+        return stop, stop + 1
+
+    def _read_code_block(self, opening: str, line: int, start: int, end: int) -> CodeBlock:
+        """Read a code block whose opening fence line is `opening`"""
+        text = self.text
+        fence = _FENCE.match(opening)
+        marker = fence.group(1)
+        closing = _CLOSING_FENCES[marker[0]]
+
+        close = closing.search(text, end)
+        while close is not None and len(close.group(1)) < len(marker):
+            close = closing.search(text, close.end())
+
+        if close is None:
+            # Unclosed fence: the block runs to the end of the document
+            body, block_end = text[end:], len(text)
+        else:
+            body, block_end = text[end:max(end, close.start() - 1)], self._line_end(close.start())[1]
+        return CodeBlock(fence.group(2).lower(), body, line, start, block_end)
+
+    def _scan_lists(self):
+        """Collect the list items and tables of [start, end), skipping code blocks"""
+        text = self.text
+        self._list_items, self._tables = [], []
+        blocks = {block.start: block for block in self.code_blocks}
+
+        pos = self.start
+        inside = self._root._block_containing(pos)
+        if inside is not None:
+            pos = inside.end
+        line = self._root._line_number(pos)
+        line_pos = pos
+        open_items: List[ListItem] = []
+        intro: Optional[str] = None
+
+        while True:
+            token = _LINE_TOKEN.search(text, pos, self.end)
+            if token is None:
+                break
+
+            start = token.start()
+            line += text.count('\n', line_pos, start)
+            line_pos = start
+            stop, end = self._line_end(start)
+            kind = token.lastgroup
+
+            if kind == 'fence':
+                block = blocks.get(start)
+                pos = block.end if block is not None else end
+                continue
+
+            if open_items and _PARAGRAPH_LINE.search(text, pos, start):
+                # Unindented paragraph text since the last token ends any open list
+                open_items = []
+
+            if kind == 'heading':
+                open_items = []
+                pos = end
+
+            elif kind == 'pipe':
+                following = text[end:self._line_end(end)[0]]
+                if text[start:stop].lstrip().startswith('|') or \
+                        ('|' in following and _TABLE_DELIMITER.match(following)):
+                    pos = self._read_table(text[start:stop], line, start, end)
+                    open_items = []
+                else:
+                    if not text[start:start + 1].isspace():
+                        open_items = []
+                    pos = end
+
+            else:  # item
+                indent = len(token.group('indent').expandtabs(4))
+                if not open_items:
+                    # A new list: remember the line introducing it
+                    previous = self._previous_line(start)
+                    if not _LIST_MARKER.match(previous):
+                        intro = previous.strip() or None
+                while open_items and open_items[-1].indent >= indent:
+                    open_items.pop()
+                item = ListItem(indent, token.group('marker'), text[token.end():stop].strip(), line, start, end,
+                                open_items[-1] if open_items else None, intro)
+                self._list_items.append(item)
+                open_items.append(item)
+                pos = end
+
+        self._item_starts = [item.start for item in self._list_items]
+        self._table_starts = [table.start for table in self._tables]
+
+    def _read_table(self, first: str, line: int, start: int, end: int) -> int:
+        """Read a table whose first row is `first`; returns the offset past it"""
+        text = self.text
+        rows = [_split_row(first)]
+        cursor = end
+        while cursor < self.end:
+            stop, following = self._line_end(cursor)
+            row = text[cursor:stop]
+            if '|' not in row or row.startswith('#'):
+                break
+            if not _TABLE_DELIMITER.match(row):
+                rows.append(_split_row(row))
+            cursor = following
+        self._tables.append(Table(rows, line, start, cursor))
+        return cursor
+
+    def _previous_line(self, start: int) -> str:
+        """Last non-blank line before offset `start` (a line start)"""
+        text = self.text
+        stop = start - 1
+        while stop > 0:
+            begin = text.rfind('\n', 0, stop) + 1
+            if text[begin:stop].strip():
+                return text[begin:stop]
+            stop = begin - 1
+        return ''
+
+    def _line_number(self, offset: int) -> int:
+        """0-based line of an offset (newline offsets are indexed on first use)"""
+        if self._newlines is None:
+            self._newlines = [match.start() for match in _NEWLINE.finditer(self.text)]
+        return bisect_left(self._newlines, offset)
+
+    def _block_containing(self, offset: int) -> Optional[CodeBlock]:
+        """Code block spanning an offset, if any"""
+        index = bisect_left(self._block_starts, offset + 1) - 1
+        if index >= 0 and self.code_blocks[index].end > offset:
+            return self.code_blocks[index]
+        return None
+
+    def _build_sections(self):
+        """Nest sections by heading level"""
+        stack = [self.root]
+        for heading in self.headings:
+            while stack[-1].level >= heading.level:
+                stack.pop().end = heading.start
+            section = Section(heading, stack[-1], heading.start)
+            stack[-1].children.append(section)
+            stack.append(section)
+            self.sections.append(section)
+        for section in stack:
+            section.end = len(self.text)
+
+    def _index(self):
+        """Start offsets for range lookups"""
+        self._heading_starts = [heading.start for heading in self.headings]
+        self._block_starts = [block.start for block in self.code_blocks]
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    @property
+    def content(self) -> str:
+        """Text of the document (or region)"""
+        return self.text[self.start:self.end]
+
+    @property
+    def lines(self) -> List[str]:
+        """Lines of the whole text"""
+        if self._lines is None:
+            self._lines = self.text.split('\n')
+        return self._lines
+
+    @property
+    def list_items(self) -> List[ListItem]:
+        """List items in document order (tokenized on first use)"""
+        if self._list_items is None:
+            self._scan_lists()
+        return self._list_items
+
+    @property
+    def tables(self) -> List[Table]:
+        """Tables in document order (tokenized on first use)"""
+        if self._tables is None:
+            self._scan_lists()
+        return self._tables
+
+    def region(self, start: int, end: int) -> 'MarkdownDocument':
+        """
+        Narrow the document to [start, end) without tokenizing it again
+
+        Headings, sections and code blocks starting inside the range are
+        kept with their offsets unchanged. List items and tables are taken
+        from the document if it has tokenized them, else tokenized for the
+        range only. A start inside a line is moved back to the line start.
+        """
+        start = self.text.rfind('\n', 0, max(start, self.start)) + 1
+        end = min(end, self.end)
+        view = object.__new__(MarkdownDocument)
+        view.text = self.text
+        view.start = start
+        view.end = end
+        view.headings = self.headings_between(start, end)
+        view.code_blocks = self.code_blocks_between(start, end)
+        view.root = self.root
+        # Sections and headings are in the same order
+        view.sections = _between(self.sections, self._heading_starts, start, end)
+        view._root = self._root
+        view._lines = self._lines
+        view._newlines = None
+        view._list_items = None
+        view._tables = None
+        view._index()
+        if self._list_items is not None:
+            view._list_items = self.list_items_between(start, end)
+            view._tables = self.tables_between(start, end)
+            view._item_starts = [item.start for item in view._list_items]
+            view._table_starts = [table.start for table in view._tables]
+        return view
+
+    def headings_between(self, start: int, end: int) -> List[Heading]:
+        return _between(self.headings, self._heading_starts, start, end)
+
+    def code_blocks_between(self, start: int, end: int) -> List[CodeBlock]:
+        return _between(self.code_blocks, self._block_starts, start, end)
+
+    def list_items_between(self, start: int, end: int) -> List[ListItem]:
+        return _between(self.list_items, self._item_starts, start, end)
+
+    def tables_between(self, start: int, end: int) -> List[Table]:
+        return _between(self.tables, self._table_starts, start, end)
+
+    def next_heading_start(self, offset: int, max_level: int = 6) -> int:
+        """Offset of the first heading at or after `offset` with level <= max_level (else the end)"""
+        for heading in self.headings[bisect_left(self._heading_starts, offset):]:
+            if heading.level <= max_level:
+                return heading.start
+        return self.end
+
+    def heading_body(self, heading: Heading) -> str:
+        """Text between a heading and the next heading of any level"""
+        return self.text[heading.end:self.next_heading_start(heading.end)]
+
+    def next_line(self, offset: int) -> str:
+        """First non-blank line at or after `offset`, stripped ('' if none before the end)"""
+        text = self.text
+        while offset < self.end:
+            stop, following = self._line_end(offset)
+            line = text[offset:min(stop, self.end)].strip()
+            if line:
+                return line
+            offset = following
+        return ''
+
+    def section_text(self, section: Section) -> str:
+        """Body of a section (without its heading line), subsections included"""
+        return self.text[section.body_start:min(section.end, self.end)]
+
+    def find_section(self, keywords: Iterable[str], exact: bool = False, min_level: int = 1) -> Optional[Section]:
+        """
+        First section whose heading matches one of the keywords
+
+        Keywords are tried in order, so earlier keywords win over later ones
+        anywhere in the document.
+
+        Args:
+            keywords: Lowercase heading keywords
+            exact: Match the whole title instead of a substring
+            min_level: Ignore headings above this level (e.g. 2 skips the title)
+
+        Returns:
+            Section or None
+        """
+        for keyword in keywords:
+            for section in self.sections:
+                if section.level < min_level:
+                    continue
+                title = section.title.lower()
+                if (title == keyword) if exact else (keyword in title):
+                    return section
+        return None
+
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def parse_markdown(text: str) -> MarkdownDocument:
+    """
+    Tokenize a README, reusing the document when the same text is parsed again
+
+    ReadmeParser, ToolsParser and ParametersParser called on the same README
+    share one MarkdownDocument. Documents longer than MAX_DOCUMENT_CHARS are
+    clipped (see budget.py).
+    """
+    return MarkdownDocument(clip_document(text))
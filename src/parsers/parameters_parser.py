@@ -5,25 +5,39 @@ Supports multiple documentation patterns with priority-based parsing
 import re
 import json
 import sys
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
+
+from .markdown_document import ListItem, MarkdownDocument, parse_markdown
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
+_DETAILED_PARAMETER = re.compile(r'`([^`]+)`\s*\(([^)]+)\):?\s*(.+)$')
+_SIMPLE_PARAMETER = re.compile(r'`([^`]+)`\s*-\s*([^(\n]+)(?:\(([^)]+)\))?')
+_ARGUMENT = re.compile(r'`([^`]+)`:\s*(.+)$')
+
+# Part of the parse_cache key, covering ToolIndex lookups too: bump when
+# the parameters extracted for a README change
+PARSER_VERSION = '3'
+
 
 class ParametersParser:
     """Extract parameters from tool documentation using multiple strategies"""
 
-    def parse_parameters(self, tool_section: str) -> List[Dict]:
+    def parse_parameters(self, tool_section: Union[str, MarkdownDocument]) -> List[Dict]:
         """
         Parse parameters using multiple strategies in priority order
 
         Args:
-            tool_section: The markdown section for a specific tool
+            tool_section: The markdown section for a specific tool, as text or
+                          as a region of the README's MarkdownDocument
 
         Returns:
             List of parameter dictionaries with: name, type, description, required, default, example
         """
+        if isinstance(tool_section, str):
+            tool_section = parse_markdown(tool_section)
+
         # Strategy 1: Detailed "Parameters:" section (playwright-mcp style)
         params = self._parse_detailed_parameters(tool_section)
         if params:
@@ -46,7 +60,45 @@ class ParametersParser:
 
         return []  # No parameters found
 
-    def _parse_detailed_parameters(self, text: str) -> Optional[List[Dict]]:
+    def _parameter_items(self, document: MarkdownDocument, intro: str, nested: bool) -> List[ListItem]:
+        """
+        Items of the first parameter list introduced by `intro`
+
+        Args:
+            document: Tool section
+            intro: Lowercase introduction ('parameters:', '**parameters:**', ...)
+            nested: The list is nested under a "- Parameters:" item rather than
+                    following an introduction line
+
+        Returns:
+            The leading run of `- \`name\`` items of that list (empty if none)
+        """
+        items = document.list_items
+        for index, item in enumerate(items):
+            if nested:
+                text = item.text.lower()
+                if item.marker == '-' and text.startswith(intro) and text != intro:
+                    # "- Parameters: None": the tool's own list is inline, so
+                    # a later list belongs to the next tool
+                    return []
+                found = item.marker == '-' and text == intro
+            else:
+                found = item.marker == '-' and item.parent is None and (item.intro or '').lower() == intro
+            if not found:
+                continue
+
+            group = []
+            for candidate in items[index + (1 if nested else 0):]:
+                belongs = candidate.parent is item if nested else (
+                    candidate.parent is None and candidate.intro == item.intro)
+                if not belongs or candidate.marker != '-' or not candidate.text.startswith('`'):
+                    break
+                group.append(candidate)
+            return group
+
+        return []
+
+    def _parse_detailed_parameters(self, document: MarkdownDocument) -> Optional[List[Dict]]:
         """
         Strategy 1: Parse playwright-mcp style parameters
         Format: - Parameters:\n    - `name` (type, optional): description
@@ -54,17 +106,18 @@ class ParametersParser:
         Most complete format with all metadata.
         """
         # Look for "- Parameters:" or "  - Parameters:"
-        match = re.search(r'- Parameters:\s*\n((?:\s*- `[^`]+`.*\n)+)', text, re.IGNORECASE)
-        if not match:
+        items = self._parameter_items(document, 'parameters:', nested=True)
+        if not items:
             return None
 
-        params_text = match.group(1)
         params = []
 
         # Parse each parameter line
         # Pattern: - `name` (type, optional): description
-        pattern = r'- `([^`]+)`\s*\(([^)]+)\):?\s*(.+)$'
-        for match in re.finditer(pattern, params_text, re.MULTILINE):
+        for item in items:
+            match = _DETAILED_PARAMETER.match(item.text)
+            if not match:
+                continue
             name = match.group(1).strip()
             type_info = match.group(2).strip()
             description = match.group(3).strip()
@@ -99,24 +152,25 @@ class ParametersParser:
 
         return params if params else None
 
-    def _parse_simple_parameters(self, text: str) -> Optional[List[Dict]]:
+    def _parse_simple_parameters(self, document: MarkdownDocument) -> Optional[List[Dict]]:
         """
         Strategy 2: Parse jina-mcp-tools style parameters
         Format: **Parameters:**\n- `name` - description (optional/required/default: value)
 
         Simpler format with less structure.
         """
-        match = re.search(r'\*\*Parameters:\*\*\s*\n((?:- `[^`]+`.*\n)+)', text)
-        if not match:
+        items = self._parameter_items(document, '**parameters:**', nested=False)
+        if not items:
             return None
 
-        params_text = match.group(1)
         params = []
 
         # Parse each parameter line
         # Pattern: - `name` - description (info)
-        pattern = r'- `([^`]+)`\s*-\s*([^(\n]+)(?:\(([^)]+)\))?'
-        for match in re.finditer(pattern, params_text):
+        for item in items:
+            match = _SIMPLE_PARAMETER.match(item.text)
+            if not match:
+                continue
             name = match.group(1).strip()
             description = match.group(2).strip()
             optional_info = match.group(3).strip() if match.group(3) else ''
@@ -144,23 +198,24 @@ class ParametersParser:
 
         return params if params else None
 
-    def _parse_arguments_section(self, text: str) -> Optional[List[Dict]]:
+    def _parse_arguments_section(self, document: MarkdownDocument) -> Optional[List[Dict]]:
         """
         Strategy 3: Parse **Arguments:** section (firecrawl style)
         Format: **Arguments:**\n- `name`: description
 
         Minimal format with just names and descriptions.
         """
-        match = re.search(r'\*\*Arguments:\*\*\s*\n((?:- `[^`]+`:.*\n)+)', text)
-        if not match:
+        items = self._parameter_items(document, '**arguments:**', nested=False)
+        if not items:
             return None
 
-        args_text = match.group(1)
         params = []
 
         # Parse each argument line
-        pattern = r'- `([^`]+)`:\s*(.+)$'
-        for match in re.finditer(pattern, args_text, re.MULTILINE):
+        for item in items:
+            match = _ARGUMENT.match(item.text)
+            if not match:
+                continue
             name = match.group(1).strip()
             description = match.group(2).strip()
 
@@ -175,20 +230,19 @@ class ParametersParser:
 
         return params if params else None
 
-    def _parse_json_examples(self, text: str) -> Optional[List[Dict]]:
+    def _parse_json_examples(self, document: MarkdownDocument) -> Optional[List[Dict]]:
         """
         Strategy 4: Extract parameters from JSON usage examples
         Format: ```json\n{"name": "tool", "arguments": {...}}
 
         Infers types from example values.
         """
-        # Find JSON code blocks
-        pattern = r'```json\s*\n({.*?})\s*\n```'
-        matches = re.finditer(pattern, text, re.DOTALL)
-
-        for match in matches:
+        # JSON code blocks holding an object
+        for block in document.code_blocks:
+            if block.language != 'json' or not block.content.strip().startswith('{'):
+                continue
             try:
-                data = json.loads(match.group(1))
+                data = json.loads(block.content)
                 if 'arguments' in data and isinstance(data['arguments'], dict):
                     params = []
                     for name, value in data['arguments'].items():
@@ -0,0 +1,162 @@
+"""
+Parse result cache keyed by README content
+Enrichers reparse every README on every run although most did not change.
+ParseCache stores each parser's result in the parse_cache table (migration
+008), keyed by (sha256 of the README, parser name, parser version): an
+unchanged README is served from the table, and bumping a parser's
+PARSER_VERSION invalidates its entries.
+"""
+import json
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+# Same table as migrations/schema/008_add_parse_cache.sql
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parse_cache (
+    content_sha256 TEXT NOT NULL,
+    parser TEXT NOT NULL,
+    parser_version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (content_sha256, parser, parser_version)
+)
+"""
+
+# Hashes per SELECT ... IN (...) (SQLite allows 999 variables)
+LOOKUP_BATCH_SIZE = 500
+
+
+def content_hash(content: str) -> str:
+    """sha256 hex digest of a README"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class ParseCache:
+    """
+    Cache of one parser's results in the parse_cache table
+
+    Reads and writes go through the caller's connection (or SQLAlchemy
+    session) and are committed, or rolled back in dry-run mode, with the
+    caller's own changes.
+
+    Usage:
+        cache = ParseCache(conn, 'tools', PARSER_VERSION)
+        cache.prefetch(readmes)            # one query per LOOKUP_BATCH_SIZE READMEs
+        tools = cache.get(readme)
+        if tools is None:
+            tools = parser.parse_tools(readme)
+            cache.put(readme, tools)
+    """
+
+    def __init__(self, conn, parser: str, version: str, enabled: bool = True):
+        """
+        Args:
+            conn: sqlite3 connection, or SQLAlchemy session (its current
+                  transaction's connection is used)
+            parser: Parser name ('tools', 'parameters', 'readme_config')
+            version: Parser version (its module's PARSER_VERSION)
+            enabled: False to always miss and never write (forced reparse)
+        """
+        self.conn = conn
+        self.parser = parser
+        self.version = version
+        self.enabled = enabled
+        self._entries: Dict[str, Any] = {}
+        self._looked_up = set()  # Hashes already queried, found or not
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0}
+
+        if enabled:
+            self._cursor().execute(SCHEMA)
+
+    def _cursor(self):
+        """Cursor on the caller's connection"""
+        if callable(getattr(self.conn, 'connection', None)):
+            # SQLAlchemy session: DB-API connection of the running transaction
+            return self.conn.connection().connection.cursor()
+        return self.conn.cursor()
+
+    def prefetch(self, contents: Iterable[str]):
+        """
+        Load the cached results of many READMEs in bulk
+
+        Args:
+            contents: README contents about to be parsed
+        """
+        if not self.enabled:
+            return
+
+        hashes = list({content_hash(content) for content in contents if content} - self._looked_up)
+        self._looked_up.update(hashes)
+        cursor = self._cursor()
+        for i in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+            batch = hashes[i:i + LOOKUP_BATCH_SIZE]
+            cursor.execute(
+                f"""
+                SELECT content_sha256, result FROM parse_cache
+                WHERE parser = ? AND parser_version = ?
+                AND content_sha256 IN ({', '.join('?' * len(batch))})
+                """,
+                [self.parser, self.version, *batch]
+            )
+            for sha, result in cursor.fetchall():
+                self._entries[sha] = json.loads(result)
+
+    def get(self, content: str) -> Optional[Any]:
+        """
+        Cached result for a README (counted as a hit or a miss)
+
+        Args:
+            content: README content
+
+        Returns:
+            The stored result, or None on a miss
+        """
+        if not self.enabled or not content:
+            self.stats['misses'] += 1
+            return None
+
+        sha = content_hash(content)
+        if sha not in self._looked_up:
+            self.prefetch([content])
+
+        result = self._entries.get(sha)
+        self.stats['hits' if result is not None else 'misses'] += 1
+        return result
+
+    def put(self, content: str, result: Any):
+        """
+        Store the result of parsing a README
+
+        Args:
+            content: README content
+            result: JSON-serializable parse result
+        """
+        if not self.enabled or not content:
+            return
+
+        sha = content_hash(content)
+        self._cursor().execute(
+            """
+            INSERT OR REPLACE INTO parse_cache (content_sha256, parser, parser_version, result, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (sha, self.parser, self.version, json.dumps(result), datetime.utcnow().isoformat())
+        )
+        self._entries[sha] = result
+        self._looked_up.add(sha)
+        self.stats['stored'] += 1
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache (0-100)"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups * 100 if lookups else 0.0
+
+    def summary(self) -> str:
+        """One-line summary for enricher reports"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        if not self.enabled:
+            return "disabled"
+        return (f"{self.stats['hits']}/{lookups} hits ({self.hit_rate:.1f}%), "
+                f"{self.stats['stored']} stored")
@@ -5,21 +5,41 @@ import re
 import json
 from typing import Dict, List, Optional, Tuple
 
+from .budget import MAX_PARSE_SECONDS, ParseBudget, ParseBudgetExceeded
+from .markdown_document import MarkdownDocument, parse_markdown
+
+# Patterns below are linear: no nested or adjacent repetitions that can
+# match the same text in several ways
+_DOCKER_RUN = re.compile(r'docker\s+run\s')
+_IMAGE_SLASH = re.compile(r'\w/\w')
+_IMAGE_REST = re.compile(r'\w+(?::\w+)?')
+# Leading digits are consumed so a match can only start at the beginning of
+# a run of name characters (instead of retrying from every character of it)
+_ENV_ASSIGNMENT = re.compile(r'(?<![A-Z0-9_])[0-9]*([A-Z_][A-Z0-9_]*)\s*=')
+
+# parse_cache key component; bump when parse_all() results change
+PARSER_VERSION = '2'
+
 
 class ReadmeParser:
     """
     Parses README markdown to extract installation configuration
     """
 
-    def __init__(self, readme_content: str):
+    def __init__(self, readme_content: str, max_seconds: Optional[float] = MAX_PARSE_SECONDS):
         """
         Initialize parser with README content
 
         Args:
             readme_content: Full README markdown content
+            max_seconds: Parse budget for this README (None for no limit)
         """
-        self.content = readme_content
-        self.lines = readme_content.split('\n')
+        self.budget = ParseBudget(max_seconds)
+        self.budget_exceeded: Optional[ParseBudgetExceeded] = None
+        self.document: MarkdownDocument = parse_markdown(readme_content)
+        # Clipped to MAX_DOCUMENT_CHARS by parse_markdown()
+        self.content = self.document.text
+        self.lines = self.document.lines
 
     def extract_installation_config(self) -> Optional[Dict]:
         """
@@ -65,6 +85,8 @@ class ReadmeParser:
         code_blocks = self._extract_code_blocks()
 
         for block in code_blocks:
+            self.budget.check('json config')
+
             # Look for JSON blocks containing mcpServers or claude_desktop_config
             if 'mcpServers' in block or 'claude_desktop_config' in block.lower():
                 try:
@@ -104,6 +126,8 @@ class ReadmeParser:
         code_blocks = self._extract_code_blocks()
 
         for block in code_blocks:
+            self.budget.check('npm config')
+
             # Look for npx command (improved pattern)
             npx_match = re.search(r'npx\s+((?:--?[\w-]+\s+)*)([@\w\-\/\.]+)', block)
             if npx_match:
@@ -153,6 +177,8 @@ class ReadmeParser:
         code_blocks = self._extract_code_blocks()
 
         for block in code_blocks:
+            self.budget.check('python config')
+
             # PHASE 1: uvx support (Python package runner)
             uvx_pattern = r'uvx\s+((?:--[\w-]+\s+)*)([@\w\-\/\.]+)'
             uvx_match = re.search(uvx_pattern, block)
@@ -262,11 +288,12 @@ class ReadmeParser:
         code_blocks = self._extract_code_blocks()
 
         for block in code_blocks:
+            self.budget.check('docker config')
+
             # Look for docker run command
-            docker_match = re.search(r'docker\s+run\s+(.*?)(\w+/\w+(?::\w+)?)', block, re.DOTALL)
-            if docker_match:
-                flags = docker_match.group(1).strip()
-                image = docker_match.group(2)
+            docker_run = self._find_docker_run(block)
+            if docker_run:
+                flags, image = docker_run
 
                 # Parse image and tag
                 if ':' in image:
@@ -299,6 +326,32 @@ class ReadmeParser:
 
         return None
 
+    def _find_docker_run(self, block: str) -> Optional[Tuple[str, str]]:
+        """
+        Find `docker run [flags] owner/image[:tag]` in a code block
+
+        Linear scan equivalent to r'docker\\s+run\\s+(.*?)(\\w+/\\w+(?::\\w+)?)'
+        (DOTALL), which retries the image pattern from every character after
+        `docker run` and goes quadratic on long blocks without an image.
+
+        Returns:
+            (flags, image) or None
+        """
+        run = _DOCKER_RUN.search(block)
+        if not run:
+            return None
+
+        # The image is the first word/word after `docker run`, taken from the
+        # start of its word
+        slash = _IMAGE_SLASH.search(block, run.end())
+        if not slash:
+            return None
+        start = slash.start()
+        while start > run.end() and (block[start - 1].isalnum() or block[start - 1] == '_'):
+            start -= 1
+        image = block[start:slash.start() + 2] + _IMAGE_REST.match(block, slash.start() + 2).group(0)
+        return block[run.end():start].strip(), image
+
     def extract_environment_variables(self) -> Tuple[List[str], Dict[str, Dict]]:
         """
         Extract required environment variables and their descriptions
@@ -317,13 +370,17 @@ class ReadmeParser:
             code_blocks = self._extract_code_blocks()
             for block in code_blocks:
                 # Look for export VAR=value or VAR=value patterns
-                var_matches = re.findall(r'(?:export\s+)?([A-Z_][A-Z0-9_]*)\s*=', block)
+                self.budget.check('environment variables')
+                var_matches = _ENV_ASSIGNMENT.findall(block)
                 env_vars.extend(var_matches)
         else:
             # Parse environment variable documentation
             lines = env_section.split('\n')
 
             for i, line in enumerate(lines):
+                if i % 100 == 0:
+                    self.budget.check('environment variables')
+
                 # Look for variable names (usually in code blocks or bold)
                 var_match = re.search(r'`([A-Z_][A-Z0-9_]*)`', line)
                 if not var_match:
@@ -378,26 +435,9 @@ class ReadmeParser:
         Extract all code blocks from markdown
 
         Returns:
-            List of code block contents
+            List of code block contents (tokenized once, see MarkdownDocument)
         """
-        blocks = []
-        in_block = False
-        current_block = []
-
-        for line in self.lines:
-            if line.strip().startswith('```'):
-                if in_block:
-                    # End of block
-                    blocks.append('\n'.join(current_block))
-                    current_block = []
-                    in_block = False
-                else:
-                    # Start of block
-                    in_block = True
-            elif in_block:
-                current_block.append(line)
-
-        return blocks
+        return [block.content for block in self.document.code_blocks]
 
     def _find_section(self, keywords: List[str]) -> Optional[str]:
         """
@@ -407,49 +447,35 @@ class ReadmeParser:
             keywords: List of keywords to search for in headers
 
         Returns:
-            Section content or None
+            Section content (until the next header of same or higher level) or None
         """
-        section_start = None
-
-        for i, line in enumerate(self.lines):
-            # Check if this is a header line
-            if line.startswith('#'):
-                header_text = line.lstrip('#').strip().lower()
-
-                # Check if any keyword matches
-                if any(keyword in header_text for keyword in keywords):
-                    section_start = i + 1
-                    break
-
-        if section_start is None:
-            return None
-
-        # Extract section until next header of same or higher level
-        section_lines = []
-        start_level = self.lines[section_start - 1].count('#')
-
-        for i in range(section_start, len(self.lines)):
-            line = self.lines[i]
-
-            # Check if this is a header of same or higher level
-            if line.startswith('#'):
-                current_level = line.count('#')
-                if current_level <= start_level:
-                    break
+        # First matching header in document order, whichever keyword it contains
+        for section in self.document.sections:
+            header_text = section.title.lower()
+            if any(keyword in header_text for keyword in keywords):
+                return self.document.section_text(section)
 
-            section_lines.append(line)
-
-        return '\n'.join(section_lines)
+        return None
 
     def parse_all(self) -> Dict:
         """
         Parse all available information from README
 
+        Stops at the parse budget, keeping what was found so far
+        (see self.budget_exceeded).
+
         Returns:
             Dict with all parsed data
         """
-        installation_config = self.extract_installation_config()
-        env_vars, env_descriptions = self.extract_environment_variables()
+        installation_config = None
+        env_vars, env_descriptions = [], {}
+
+        try:
+            installation_config = self.extract_installation_config()
+            env_vars, env_descriptions = self.extract_environment_variables()
+        except ParseBudgetExceeded as e:
+            # Keep whatever was extracted before the deadline
+            self.budget_exceeded = e
 
         return {
             'installation_config': installation_config,
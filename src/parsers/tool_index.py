@@ -0,0 +1,124 @@
+"""
+Index of where each tool is documented in a README
+Parameter extraction needs the part of the README documenting one tool.
+Searching the README once per tool is O(tools x README length); ToolIndex
+scans it once and answers every tool lookup from dictionaries.
+"""
+import re
+from typing import Dict, Optional, Union
+
+from .markdown_document import MarkdownDocument, parse_markdown
+
+# Context kept from an anchor onwards
+WINDOW_AFTER = 2000
+
+_NAME_TOKEN = re.compile(r'[A-Za-z0-9_-]+')
+_BOLD = re.compile(r'\*\*([^*\n]+)\*\*')
+_BACKTICK = re.compile(r'`([^`\n]+)`')
+
+# Anchor kinds, in lookup priority order
+ANCHOR_KINDS = ('heading', 'heading_mention', 'bold', 'backtick')
+
+
+def normalize_tool_name(name: str) -> str:
+    """Key used to match tool names (case-insensitive, surrounding spaces ignored)"""
+    return name.strip().lower()
+
+
+class ToolAnchor:
+    """Where a tool is documented"""
+    __slots__ = ('kind', 'offset', 'section_end')
+
+    def __init__(self, kind: str, offset: int, section_end: Optional[int] = None):
+        self.kind = kind                # One of ANCHOR_KINDS
+        self.offset = offset            # Offset of the heading / bold / backtick mention
+        self.section_end = section_end  # End of the heading's section (heading anchors only)
+
+    def __repr__(self):
+        return f"<ToolAnchor {self.kind} @{self.offset}>"
+
+
+class ToolIndex:
+    """
+    One-pass index of tool anchors in a README
+
+    A tool is looked up, in priority order, as:
+    1. a heading (### or deeper) whose title is the tool name
+    2. a heading (### or deeper) mentioning the tool name
+    3. a bold mention (**tool_name**)
+    4. a backtick mention (`tool_name`)
+    The first occurrence in the README wins within each kind.
+    """
+
+    def __init__(self, readme: Union[str, MarkdownDocument]):
+        """
+        Index a README
+
+        Args:
+            readme: README content, or its MarkdownDocument
+        """
+        self.document = parse_markdown(readme) if isinstance(readme, str) else readme
+        self._anchors: Dict[str, Dict[str, ToolAnchor]] = {kind: {} for kind in ANCHOR_KINDS}
+        self._index_headings()
+        self._index_mentions('bold', _BOLD)
+        self._index_mentions('backtick', _BACKTICK)
+
+    def _index_headings(self):
+        """Index ### (and deeper) headings by title and by the names they mention"""
+        exact = self._anchors['heading']
+        mentions = self._anchors['heading_mention']
+        section_ends = {section.start: section.end for section in self.document.sections}
+
+        for heading in self.document.headings:
+            if heading.level < 3:
+                continue
+            anchor = ToolAnchor('heading', heading.start, section_ends.get(heading.start))
+            exact.setdefault(normalize_tool_name(heading.title), anchor)
+            for token in _NAME_TOKEN.findall(heading.title):
+                mentions.setdefault(normalize_tool_name(token),
+                                    ToolAnchor('heading_mention', heading.start, anchor.section_end))
+
+    def _index_mentions(self, kind: str, pattern: re.Pattern):
+        """Index the first inline mention of each name"""
+        anchors = self._anchors[kind]
+        text = self.document.text
+        for match in pattern.finditer(text, self.document.start, self.document.end):
+            anchors.setdefault(normalize_tool_name(match.group(1)), ToolAnchor(kind, match.start()))
+
+    def find(self, tool_name: str) -> Optional[ToolAnchor]:
+        """
+        Best anchor for a tool
+
+        Args:
+            tool_name: Tool name as parsed from the README
+
+        Returns:
+            ToolAnchor, or None if the README never mentions the tool
+        """
+        if not tool_name:
+            return None
+        key = normalize_tool_name(tool_name)
+        for kind in ANCHOR_KINDS:
+            anchor = self._anchors[kind].get(key)
+            if anchor is not None:
+                return anchor
+        return None
+
+    def tool_section(self, tool_name: str) -> Optional[MarkdownDocument]:
+        """
+        Region of the README documenting a tool, ready for ParametersParser
+
+        The region starts at the anchor's line: regions begin on whole
+        lines, so any lookback would pull in the previous tool's complete
+        parameter list, which the parser would then take for this tool's.
+
+        Args:
+            tool_name: Tool name
+
+        Returns:
+            MarkdownDocument region, or None if the tool is not found
+        """
+        anchor = self.find(tool_name)
+        if anchor is None:
+            return None
+        return self.document.region(anchor.offset, min(self.document.end, anchor.offset + WINDOW_AFTER))
@@ -5,202 +5,194 @@ import re
 from typing import List, Dict, Optional
 import json
 
+from .budget import MAX_PARSE_SECONDS, ParseBudget, ParseBudgetExceeded
+from .markdown_document import Heading, ListItem, MarkdownDocument, Section, parse_markdown
+
+# Tool names as written in headings, lists and tables
+_TOOL_NAME = r'[a-zA-Z0-9_-]+'
+_BOLD_HEADING = re.compile(rf'\*\*({_TOOL_NAME})\*\*$')
+_NUMBERED_HEADING = re.compile(rf'\d+\.\s*.*?\(`({_TOOL_NAME})`\)$')
+_BACKTICK_ITEM = re.compile(rf'`({_TOOL_NAME})`\s*[-–—]\s*(.+)')
+_BACKTICK_CELL = re.compile(rf'`({_TOOL_NAME})`$')
+_BOLD_ITEM = re.compile(rf'\*\*({_TOOL_NAME})\*\*:?\s*(.*)')
+_PLAIN_HEADING = re.compile(r'[a-zA-Z0-9_/-]+$')
+
+# Introductions of parameter lists, whose items are not tools
+_PARAMETER_INTROS = ('parameters:', '**parameters:**', '**arguments:**')
+
+# Tools section headings, in priority order
+TOOLS_SECTION_TITLES = ('available tools', 'tools')
+
+# Part of the parse_cache key: bump whenever parse_tools() output changes
+PARSER_VERSION = '3'
+
 
 class ToolsParser:
     """Extract tools from README markdown content"""
 
+    def __init__(self, max_seconds: Optional[float] = MAX_PARSE_SECONDS):
+        """
+        Args:
+            max_seconds: Parse budget per README (None for no limit)
+        """
+        self.max_seconds = max_seconds
+        self.budget = ParseBudget(max_seconds)
+        self.budget_exceeded: Optional[ParseBudgetExceeded] = None
+
     def parse_tools(self, markdown: str) -> List[Dict]:
         """
         Parse tools from README markdown content
 
+        Stops at the parse budget and returns the tools found by the
+        strategies that completed (see self.budget_exceeded).
+
         Args:
             markdown: README content as markdown string
 
         Returns:
             List of tool dictionaries with name, display_name, description
         """
+        self.budget = ParseBudget(self.max_seconds)
+        self.budget_exceeded = None
+        document = parse_markdown(markdown)
         tools = []
 
-        # Strategy 1: Look for "Available Tools" or "Tools" section
-        tools_section = self._extract_tools_section(markdown)
-        if tools_section:
-            tools.extend(self._parse_tools_from_section(tools_section))
+        try:
+            # Strategy 1: Look for "Available Tools" or "Tools" section
+            section = self._find_tools_section(document)
+            if section:
+                tools.extend(self._parse_tools_from_section(document.region(section.body_start, section.end)))
 
-        # Strategy 2: Look for tool listings in code blocks (JSON schemas)
-        if not tools:
-            tools.extend(self._parse_tools_from_code_blocks(markdown))
+            # Strategy 2: Look for tool listings in code blocks (JSON schemas)
+            if not tools:
+                tools.extend(self._parse_tools_from_code_blocks(document))
 
-        # Strategy 3: Look for function/method names with descriptions
-        if not tools:
-            tools.extend(self._parse_tools_from_headings(markdown))
+            # Strategy 3: Look for function/method names with descriptions
+            if not tools:
+                tools.extend(self._parse_tools_from_headings(document))
+        except ParseBudgetExceeded as e:
+            self.budget_exceeded = e
 
         return tools
 
+    def _find_tools_section(self, document: MarkdownDocument) -> Optional[Section]:
+        """Find the 'Available Tools' (preferred) or 'Tools' section (## or deeper)"""
+        return document.find_section(TOOLS_SECTION_TITLES, exact=True, min_level=2)
+
     def _extract_tools_section(self, markdown: str) -> Optional[str]:
         """Extract the 'Tools' or 'Available Tools' section from markdown"""
-
-        # Pattern to find Tools section (heading + content until next same-level heading)
-        # Note: (?=\n##[^#]) ensures we match ## but not ### (prevents premature cutoff)
-        patterns = [
-            r'##\s*Available\s+Tools\s*\n(.*?)(?=\n##[^#]|\Z)',
-            r'##\s*Tools\s*\n(.*?)(?=\n##[^#]|\Z)',
-            r'###\s*Available\s+Tools\s*\n(.*?)(?=\n###[^#]|\n##[^#]|\Z)',
-            r'###\s*Tools\s*\n(.*?)(?=\n###[^#]|\n##[^#]|\Z)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, markdown, re.DOTALL | re.IGNORECASE)
-            if match:
-                return match.group(1)
-
-        return None
-
-    def _parse_tools_from_section(self, section: str) -> List[Dict]:
-        """Parse tools from a tools section"""
+        document = parse_markdown(markdown)
+        section = self._find_tools_section(document)
+        return document.section_text(section) if section else None
+
+    def _tool(self, name: str, description: str) -> Dict:
+        """Build a tool dict"""
+        return {
+            'name': name,
+            'display_name': self._name_to_display(name),
+            'description': description
+        }
+
+    def _parse_tools_from_section(self, section: MarkdownDocument) -> List[Dict]:
+        """Parse tools from a tools section (a region of the README)"""
         tools = []
+        headings = [heading for heading in section.headings if heading.level >= 3]
 
-        # Pattern 1: Heading-based (### **tool_name** or ### tool_name)
+        # Pattern 1: Heading-based (### **tool_name**)
         # Example: ### **perplexity_search**
-        # Note: \n+ allows for multiple blank lines between tools
-        heading_pattern = r'###\s*\*\*([a-zA-Z0-9_-]+)\*\*\s*\n(.*?)(?=\n+###\s*\*\*|\Z)'
-        matches = re.finditer(heading_pattern, section, re.DOTALL)
-
-        for match in matches:
-            name = match.group(1)
-            description = match.group(2).strip()
-            # Clean description (remove extra newlines, keep first line or paragraph)
-            description = self._clean_description(description)
-
-            tools.append({
-                'name': name,
-                'display_name': self._name_to_display(name),
-                'description': description
-            })
+        for heading in headings:
+            match = _BOLD_HEADING.match(heading.title)
+            if match:
+                description = self._clean_description(section.heading_body(heading).strip())
+                tools.append(self._tool(match.group(1), description))
 
         # Pattern 2: Numbered heading with backticks (### 1. Tool Name (`tool_name`))
         # Example: ### 1. Scrape Tool (`firecrawl_scrape`)
         if not tools:
-            numbered_pattern = r'###\s*\d+\.\s*.*?\(`([a-zA-Z0-9_-]+)`\)\s*\n(.*?)(?=\n+###\s*\d+\.|\Z)'
-            matches = re.finditer(numbered_pattern, section, re.DOTALL)
+            for heading in headings:
+                match = _NUMBERED_HEADING.match(heading.title)
+                if match:
+                    description = self._clean_description(section.heading_body(heading).strip())
+                    tools.append(self._tool(match.group(1), description))
 
-            for match in matches:
-                name = match.group(1)
-                description = match.group(2).strip()
-                description = self._clean_description(description)
-
-                tools.append({
-                    'name': name,
-                    'display_name': self._name_to_display(name),
-                    'description': description
-                })
+        self.budget.check('tools section headings')
 
         # Pattern 3: List with backticks (- `tool_name` - description)
         # Example: - `google_search` - Set all the parameters
-        # IMPORTANT: Exclude lines under "Parameters:" or "**Parameters:**" sections
+        # IMPORTANT: Exclude items of "Parameters:" / "**Parameters:**" lists
         if not tools:
-            # First, remove any "Parameters:" sections to avoid false positives
-            cleaned_section = self._remove_parameters_sections(section)
-
-            backtick_list_pattern = r'-\s*`([a-zA-Z0-9_-]+)`\s*[-–—]\s*([^\n]+)'
-            matches = re.finditer(backtick_list_pattern, cleaned_section)
-
-            for match in matches:
-                name = match.group(1)
-                description = match.group(2).strip()
-
-                tools.append({
-                    'name': name,
-                    'display_name': self._name_to_display(name),
-                    'description': description
-                })
+            for item in section.list_items:
+                if item.marker != '-' or self._is_parameter_item(item):
+                    continue
+                match = _BACKTICK_ITEM.match(item.text)
+                if match:
+                    tools.append(self._tool(match.group(1), match.group(2).strip()))
 
         # Pattern 4: Markdown table (| `tool_name` | description |)
         # Example: |`text_to_audio`|Convert text to audio...|
         if not tools:
-            # Look for markdown table rows with backticked tool names
-            table_pattern = r'\|\s*`([a-zA-Z0-9_-]+)`\s*\|\s*([^|\n]+)\s*\|'
-            matches = re.finditer(table_pattern, section)
-
-            for match in matches:
-                name = match.group(1)
-                description = match.group(2).strip()
-
-                tools.append({
-                    'name': name,
-                    'display_name': self._name_to_display(name),
-                    'description': description
-                })
+            for table in section.tables:
+                for row in table.rows:
+                    for cell, description in zip(row, row[1:]):
+                        match = _BACKTICK_CELL.match(cell)
+                        if match and description:
+                            tools.append(self._tool(match.group(1), description))
+                            break
 
         # Pattern 5: List-based with bold (- **tool_name**: description)
         # Example: - **search**: Perform a web search
+        # or a bare - **browser_click** whose description is on the next line
+        # (e.g. a nested "- Title: Click" item)
         if not tools:
-            list_pattern = r'-\s*\*\*([a-zA-Z0-9_-]+)\*\*:?\s*([^\n]+)'
-            matches = re.finditer(list_pattern, section)
-
-            for match in matches:
-                name = match.group(1)
-                description = match.group(2).strip()
+            for item in section.list_items:
+                match = _BOLD_ITEM.match(item.text) if item.marker == '-' else None
+                if match:
+                    description = match.group(2).strip() or section.next_line(item.end)
+                    if description:
+                        tools.append(self._tool(match.group(1), description))
 
-                tools.append({
-                    'name': name,
-                    'display_name': self._name_to_display(name),
-                    'description': description
-                })
+        self.budget.check('tools section lists')
 
         # Pattern 6: Simple heading format (### tool_name or ### tool1 / tool2)
         # Example: ### jina_reader or ### jina_search / jina_search_vip
         # This handles plain headings including multi-tool headings
         if not tools:
-            # Capture entire heading line (including spaces) up to newline
-            simple_heading_pattern = r'###\s+([^\n]+?)\s*\n(.*?)(?=\n###|\n##|\Z)'
-            matches = re.finditer(simple_heading_pattern, section, re.DOTALL)
-
-            for match in matches:
-                names_str = match.group(1)
-                content = match.group(2).strip()
-
-                # Check if multiple tool names separated by /
-                if '/' in names_str:
-                    # Split by / and process each tool
-                    tool_names = [n.strip() for n in names_str.split('/')]
-                    for name in tool_names:
-                        # Only include if name looks like a tool (snake_case or kebab-case)
-                        if '_' in name or '-' in name:
-                            description = self._clean_description(content)
-                            if description:
-                                tools.append({
-                                    'name': name,
-                                    'display_name': self._name_to_display(name),
-                                    'description': description
-                                })
-                else:
-                    # Single tool name
-                    name = names_str
-                    # Only include if name looks like a tool (snake_case or kebab-case)
-                    if '_' in name or '-' in name:
-                        description = self._clean_description(content)
-                        if description:
-                            tools.append({
-                                'name': name,
-                                'display_name': self._name_to_display(name),
-                                'description': description
-                            })
+            for heading in headings:
+                tools.extend(self._tools_from_plain_heading(section, heading))
 
         return tools
 
-    def _parse_tools_from_code_blocks(self, markdown: str) -> List[Dict]:
-        """Parse tools from JSON schema code blocks"""
+    def _is_parameter_item(self, item: ListItem) -> bool:
+        """True if a list item documents a parameter rather than a tool"""
+        if item.parent is not None:
+            return item.parent.text.lower() in _PARAMETER_INTROS
+        return (item.intro or '').lower() in _PARAMETER_INTROS
+
+    def _tools_from_plain_heading(self, document: MarkdownDocument, heading: Heading) -> List[Dict]:
+        """Tools named by a plain heading, several names separated by /"""
         tools = []
+        content = document.heading_body(heading).strip()
 
-        # Find JSON code blocks
-        code_block_pattern = r'```(?:json|javascript|typescript)?\n(.*?)```'
-        matches = re.finditer(code_block_pattern, markdown, re.DOTALL)
+        # Only include names that look like tools (snake_case or kebab-case)
+        for name in [n.strip() for n in heading.title.split('/')]:
+            if '_' in name or '-' in name:
+                description = self._clean_description(content)
+                if description:
+                    tools.append(self._tool(name, description))
 
-        for match in matches:
-            code = match.group(1)
+        return tools
+
+    def _parse_tools_from_code_blocks(self, document: MarkdownDocument) -> List[Dict]:
+        """Parse tools from JSON schema code blocks"""
+        tools = []
+
+        for block in document.code_blocks:
+            if block.language not in ('', 'json', 'javascript', 'typescript'):
+                continue
+            self.budget.check('code blocks')
             try:
                 # Try to parse as JSON
-                data = json.loads(code)
+                data = json.loads(block.content)
 
                 # Look for tool-like structures
                 if isinstance(data, dict):
@@ -228,64 +220,20 @@ class ToolsParser:
 
         return tools
 
-    def _parse_tools_from_headings(self, markdown: str) -> List[Dict]:
+    def _parse_tools_from_headings(self, document: MarkdownDocument) -> List[Dict]:
         """Parse tools from heading patterns throughout the document"""
         tools = []
 
         # Look for patterns like:
         # ### tool_name / tool_name2 (multiple tools on one line)
         # Description text
-        pattern_multi = r'###\s+([a-zA-Z0-9_/-]+)\s*\n(.*?)(?=\n###|\n##|\Z)'
-        matches = re.finditer(pattern_multi, markdown, re.DOTALL)
-
-        for match in matches:
-            names_str = match.group(1)
-            content = match.group(2).strip()
-
-            # Check if multiple tool names separated by /
-            if '/' in names_str:
-                # Split by / and process each tool
-                tool_names = [n.strip() for n in names_str.split('/')]
-                for name in tool_names:
-                    if '_' in name or '-' in name:
-                        description = self._clean_description(content)
-                        if description:
-                            tools.append({
-                                'name': name,
-                                'display_name': self._name_to_display(name),
-                                'description': description
-                            })
-            else:
-                # Single tool name
-                name = names_str
-                # Only include if name looks like a tool (snake_case or kebab-case)
-                if '_' in name or '-' in name:
-                    description = self._clean_description(content)
-                    if description:
-                        tools.append({
-                            'name': name,
-                            'display_name': self._name_to_display(name),
-                            'description': description
-                        })
+        for heading in document.headings:
+            self.budget.check('headings')
+            if heading.level >= 3 and _PLAIN_HEADING.match(heading.title):
+                tools.extend(self._tools_from_plain_heading(document, heading))
 
         return tools
 
-    def _remove_parameters_sections(self, text: str) -> str:
-        """
-        Remove Parameters/Arguments sections from text to avoid extracting
-        parameters as tools
-        """
-        # Pattern 1: Remove "- Parameters:" sections
-        text = re.sub(r'- Parameters:\s*\n(?:\s*- `[^`]+`.*\n)+', '', text, flags=re.IGNORECASE)
-
-        # Pattern 2: Remove "**Parameters:**" sections
-        text = re.sub(r'\*\*Parameters:\*\*\s*\n(?:- `[^`]+`.*\n)+', '', text, flags=re.IGNORECASE)
-
-        # Pattern 3: Remove "**Arguments:**" sections
-        text = re.sub(r'\*\*Arguments:\*\*\s*\n(?:- `[^`]+`:.*\n)+', '', text, flags=re.IGNORECASE)
-
-        return text
-
     def _clean_description(self, text: str) -> str:
         """Clean and format description text"""
         # Remove markdown formatting
@@ -351,12 +299,6 @@ Advanced reasoning and problem-solving using the `sonar-reasoning-pro` model. Pe
         print("=" * 70)
         print()
 
-        # Debug: check pattern matching
-        heading_pattern = r'###\s*\*\*([a-zA-Z0-9_-]+)\*\*\s*\n(.*?)(?=\n+###\s*\*\*|\Z)'
-        matches = list(re.finditer(heading_pattern, section, re.DOTALL))
-        print(f"Found {len(matches)} pattern matches")
-        print()
-
     tools = parser.parse_tools(sample_md)
 
     print(f"Found {len(tools)} tools:")
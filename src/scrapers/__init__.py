@@ -2,5 +2,6 @@
 Scrapers module for web scraping functionality
 """
 from .base_scraper import BaseScraper
+from .fetch_strategy import HybridFetcher
 
-__all__ = ['BaseScraper']
+__all__ = ['BaseScraper', 'HybridFetcher']
@@ -4,18 +4,112 @@ Provides common scraping functionality with anti-detection measures
 """
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 from loguru import logger
+from contextlib import asynccontextmanager
 import asyncio
-from typing import Optional, List
+import copy
+import time
+from typing import Optional, List, Iterable, Dict, Union
+from urllib.parse import urlparse
 import random
 
 
+# Resource types let through when request interception is enabled
+DEFAULT_ALLOWED_RESOURCE_TYPES = ('document', 'script', 'xhr', 'fetch')
+
+# Page-side extractor used by BaseScraper.extract(): one evaluate() call per page
+EXTRACT_SCRIPT = """
+(spec) => {
+    const read = (el, attr) => attr === 'text' ? el.textContent : el.getAttribute(attr);
+    const out = {};
+    for (const [field, rule] of Object.entries(spec)) {
+        try {
+            if (rule.count) {
+                out[field] = document.querySelectorAll(rule.selector).length;
+            } else if (rule.all) {
+                const values = [];
+                for (const el of document.querySelectorAll(rule.selector)) {
+                    const value = read(el, rule.attr);
+                    if (value) values.push(value);
+                    if (rule.limit && values.length >= rule.limit) break;
+                }
+                out[field] = values;
+            } else {
+                const el = document.querySelector(rule.selector);
+                out[field] = el ? read(el, rule.attr) : null;
+            }
+        } catch (e) {
+            // Invalid selector: report the field as missing
+            out[field] = rule.count ? 0 : (rule.all ? [] : null);
+        }
+    }
+    return out;
+}
+"""
+
+# Resolves true once the DOM has seen no mutation for quietMs, false on timeout
+DOM_QUIET_SCRIPT = """
+([quietMs, timeoutMs]) => new Promise(resolve => {
+    let quietTimer = null;
+    let deadline = null;
+    const done = (quiet) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(deadline);
+        resolve(quiet);
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => done(true), quietMs);
+    });
+    observer.observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    quietTimer = setTimeout(() => done(true), quietMs);
+    deadline = setTimeout(() => done(false), timeoutMs);
+})
+"""
+
+# Analytics/ad hosts blocked whatever their resource type
+TRACKER_DOMAINS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'facebook.net',
+    'hotjar.com',
+    'clarity.ms',
+    'plausible.io',
+    'segment.io',
+    'umami.is',
+)
+
+
 class BaseScraper:
     """
     Base scraper using Playwright for robust web scraping
     Supports headless mode, custom user agents, and anti-detection measures
+
+    Pool mode: with pool_size > 1, start() opens pool_size pages spread over
+    `contexts` browser contexts. Pages are leased with acquire_page() /
+    release_page() (or the lease() context manager); each lease returns a
+    scraper bound to its own page, so every helper below works unchanged.
+    At most pool_size leases are active at once.
+
+    Request interception: with block_resources=True every request whose
+    resource type is not in allowed_resource_types (images, fonts, media,
+    stylesheets by default), or whose host is a known tracker, is aborted
+    before it leaves the browser. Counters are kept in resource_stats.
+
+    Readiness: wait_until_ready() replaces fixed sleeps after navigation by
+    waiting for a selector, network idle and/or a DOM-mutation quiet window,
+    and records how long each page took in readiness_stats.
     """
 
-    def __init__(self, headless: bool = True, user_agent: Optional[str] = None, viewport: Optional[dict] = None):
+    def __init__(self, headless: bool = True, user_agent: Optional[str] = None, viewport: Optional[dict] = None,
+                 pool_size: int = 1, contexts: int = 1, block_resources: bool = False,
+                 allowed_resource_types: Optional[Iterable[str]] = None,
+                 blocked_domains: Optional[Iterable[str]] = None):
         """
         Initialize the scraper
 
@@ -23,16 +117,45 @@ class BaseScraper:
             headless: Run browser in headless mode
             user_agent: Custom user agent string
             viewport: Custom viewport size {'width': 1920, 'height': 1080}
+            pool_size: Number of pages to open (concurrency cap for leases)
+            contexts: Number of browser contexts the pages are spread over
+            block_resources: Abort requests outside the resource allowlist
+            allowed_resource_types: Playwright resource types to let through
+            blocked_domains: Hosts to block regardless of resource type (defaults to TRACKER_DOMAINS)
         """
         self.headless = headless
         self.user_agent = user_agent
         self.viewport = viewport or {'width': 1920, 'height': 1080}
+        self.pool_size = max(1, pool_size)
+        self.context_count = max(1, min(contexts, self.pool_size))
+
+        self.block_resources = block_resources
+        self.allowed_resource_types = frozenset(allowed_resource_types or DEFAULT_ALLOWED_RESOURCE_TYPES)
+        self.blocked_domains = tuple(blocked_domains if blocked_domains is not None else TRACKER_DOMAINS)
+        self.resource_stats = {
+            'allowed_requests': 0,
+            'blocked_requests': 0,
+            'allowed_bytes': 0,
+            'blocked_by_type': {},
+        }
+        self.readiness_stats = {
+            'waits': 0,
+            'timeouts': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0,
+        }
 
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
 
+        # Pool state (shared with leased workers)
+        self.contexts: List[BrowserContext] = []
+        self.pages: List[Page] = []
+        self._idle_pages: Optional[asyncio.Queue] = None
+        self._owner: Optional['BaseScraper'] = None
+
     async def start(self):
         """Start the browser and create a new page"""
         self.playwright = await async_playwright().start()
@@ -49,23 +172,147 @@ class BaseScraper:
 
         logger.info("Browser started")
 
+        for _ in range(self.context_count):
+            self.contexts.append(await self._new_context())
+        self.context = self.contexts[0]
+
+        # Spread pages round-robin over the contexts
+        self._idle_pages = asyncio.Queue()
+        for i in range(self.pool_size):
+            page = await self.contexts[i % self.context_count].new_page()
+            self.pages.append(page)
+            self._idle_pages.put_nowait(page)
+
+        self.page = self.pages[0]
+        if self.pool_size > 1:
+            logger.info(f"Page pool created: {self.pool_size} pages over {self.context_count} context(s)")
+        else:
+            logger.info("Page created")
+
+    async def _new_context(self) -> BrowserContext:
+        """Create a browser context with the anti-detection settings"""
         # Create context with custom settings
         context_options = {
             'viewport': self.viewport,
             'user_agent': self.user_agent or await self._get_default_user_agent(),
         }
 
-        self.context = await self.browser.new_context(**context_options)
+        context = await self.browser.new_context(**context_options)
 
         # Add init script to hide webdriver property
-        await self.context.add_init_script("""
+        await context.add_init_script("""
             Object.defineProperty(navigator, 'webdriver', {
                 get: () => undefined
             });
         """)
 
-        self.page = await self.context.new_page()
-        logger.info("Page created")
+        if self.block_resources:
+            await context.route('**/*', self._route_request)
+            context.on('requestfinished', self._record_transfer)
+
+        return context
+
+    def _is_blocked_host(self, url: str) -> bool:
+        """Check whether a URL points at a blocked (tracker) host"""
+        host = urlparse(url).hostname or ''
+        return any(host == domain or host.endswith('.' + domain) for domain in self.blocked_domains)
+
+    async def _route_request(self, route):
+        """Abort requests outside the allowlist, let the rest continue"""
+        request = route.request
+        resource_type = request.resource_type
+
+        if resource_type not in self.allowed_resource_types or self._is_blocked_host(request.url):
+            self.resource_stats['blocked_requests'] += 1
+            by_type = self.resource_stats['blocked_by_type']
+            by_type[resource_type] = by_type.get(resource_type, 0) + 1
+            await route.abort()
+            return
+
+        self.resource_stats['allowed_requests'] += 1
+        await route.continue_()
+
+    async def _record_transfer(self, request):
+        """
+        Account the bytes an allowed request transferred
+
+        Uses Playwright's measured sizes (response headers + body as sent over
+        the wire) rather than Content-Length, which chunked and compressed
+        responses usually omit. Blocked requests never finish, so only
+        allowed ones are counted.
+        """
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            # Page or context closed before the sizes could be read
+            return
+        self.resource_stats['allowed_bytes'] += sizes['responseHeadersSize'] + sizes['responseBodySize']
+
+    def get_resource_stats(self) -> dict:
+        """
+        Get request interception counters for this run
+
+        Blocked requests are aborted before any byte is transferred, so they
+        are reported as counts per resource type rather than bytes.
+        """
+        stats = dict(self.resource_stats)
+        stats['blocked_by_type'] = dict(self.resource_stats['blocked_by_type'])
+        return stats
+
+    def _bind(self, page: Page) -> 'BaseScraper':
+        """Return a scraper view that shares this browser but drives `page`"""
+        worker = copy.copy(self)
+        worker.page = page
+        worker.context = page.context
+        worker._owner = self
+        return worker
+
+    async def acquire_page(self) -> 'BaseScraper':
+        """
+        Lease a page from the pool, waiting if all pages are busy
+
+        Returns:
+            BaseScraper bound to the leased page
+        """
+        if self._idle_pages is None:
+            raise RuntimeError("Scraper not started. Call start() first.")
+        page = await self._idle_pages.get()
+        return self._bind(page)
+
+    async def release_page(self, worker: 'BaseScraper'):
+        """
+        Return a leased page to the pool
+
+        Crashed or closed pages are replaced with a fresh page in the same context.
+
+        Args:
+            worker: Scraper returned by acquire_page()
+        """
+        page = worker.page
+        if page.is_closed():
+            logger.warning("Pooled page was closed, replacing it")
+            context = page.context if page.context in self.contexts else self.contexts[0]
+            replacement = await context.new_page()
+            self.pages[self.pages.index(page)] = replacement
+            page = replacement
+        self._idle_pages.put_nowait(page)
+
+    @asynccontextmanager
+    async def lease(self):
+        """
+        Lease a page for the duration of an `async with` block
+
+        Leasing from an already-leased worker yields the worker itself.
+        """
+        if self._owner is not None:
+            yield self
+            return
+
+        worker = await self.acquire_page()
+        try:
+            yield worker
+        finally:
+            await self.release_page(worker)
 
     async def _get_default_user_agent(self):
         """Get a realistic user agent"""
@@ -100,6 +347,70 @@ class BaseScraper:
             logger.warning(f"Navigation failed for {url}: {e}")
             return False
 
+    async def wait_until_ready(self, selector: Optional[str] = None, min_count: Optional[int] = None,
+                               network_idle: bool = False, quiet_ms: int = 0,
+                               timeout: int = 10000) -> bool:
+        """
+        Wait until the current page is ready, instead of sleeping a fixed time
+
+        Conditions are checked in order and share a single timeout budget:
+        1. `selector` is attached (or more than `min_count` elements match it)
+        2. the network is idle (no connections for 500 ms), if `network_idle`
+        3. the DOM has seen no mutation for `quiet_ms` milliseconds
+
+        Args:
+            selector: CSS selector that must be present
+            min_count: Wait until more than this many elements match `selector`
+            network_idle: Wait for the network-idle load state
+            quiet_ms: Length of the DOM-mutation quiet window (0 to skip)
+            timeout: Overall timeout in milliseconds
+
+        Returns:
+            bool: True if every condition was met, False on timeout
+        """
+        if not self.page:
+            raise RuntimeError("Scraper not started. Call start() first.")
+
+        started = time.monotonic()
+
+        def remaining_ms() -> float:
+            return max(1.0, timeout - (time.monotonic() - started) * 1000)
+
+        ready = True
+        try:
+            if selector and min_count is not None:
+                await self.page.wait_for_function(
+                    "([selector, n]) => document.querySelectorAll(selector).length > n",
+                    arg=[selector, min_count],
+                    timeout=remaining_ms()
+                )
+            elif selector:
+                await self.page.wait_for_selector(selector, state='attached', timeout=remaining_ms())
+
+            if network_idle:
+                await self.page.wait_for_load_state('networkidle', timeout=remaining_ms())
+
+            if quiet_ms:
+                ready = await self.page.evaluate(DOM_QUIET_SCRIPT, [quiet_ms, remaining_ms()])
+        except Exception as e:
+            logger.debug(f"Page not ready within {timeout}ms: {e}")
+            ready = False
+
+        elapsed_ms = (time.monotonic() - started) * 1000
+        self.readiness_stats['waits'] += 1
+        self.readiness_stats['total_ms'] += elapsed_ms
+        self.readiness_stats['max_ms'] = max(self.readiness_stats['max_ms'], elapsed_ms)
+        if not ready:
+            self.readiness_stats['timeouts'] += 1
+
+        return ready
+
+    def get_readiness_stats(self) -> dict:
+        """Get page readiness timings for this run"""
+        stats = dict(self.readiness_stats)
+        stats['avg_ms'] = stats['total_ms'] / stats['waits'] if stats['waits'] else 0.0
+        return stats
+
     async def get_html(self) -> str:
         """Get the current page HTML content"""
         if not self.page:
@@ -142,17 +453,105 @@ class BaseScraper:
             raise RuntimeError("Scraper not started. Call start() first.")
 
         try:
-            elements = await self.page.query_selector_all(selector)
-            hrefs = []
-            for element in elements:
-                href = await element.get_attribute('href')
-                if href:
-                    hrefs.append(href)
-            return hrefs
+            # Read every href in the page context (single round trip)
+            return await self.page.eval_on_selector_all(
+                selector,
+                "els => els.map(el => el.getAttribute('href')).filter(Boolean)"
+            )
         except Exception as e:
             logger.warning(f"Error getting hrefs for selector '{selector}': {e}")
             return []
 
+    async def get_new_hrefs(self, selector: str = 'a', marker: str = 'data-scraper-seen') -> List[str]:
+        """
+        Get href attributes of matching elements not returned by a previous call
+
+        Returned elements are tagged with `marker`, so repeated calls on a
+        growing list (e.g. after "Load More") only read newly added nodes.
+
+        Args:
+            selector: CSS selector for links
+            marker: Attribute used to tag elements already read
+
+        Returns:
+            List of href URLs from new elements
+        """
+        if not self.page:
+            raise RuntimeError("Scraper not started. Call start() first.")
+
+        try:
+            return await self.page.eval_on_selector_all(
+                f"{selector}:not([{marker}])",
+                "(els, marker) => els.map(el => { el.setAttribute(marker, ''); return el.getAttribute('href'); })"
+                ".filter(Boolean)",
+                marker
+            )
+        except Exception as e:
+            logger.warning(f"Error getting new hrefs for selector '{selector}': {e}")
+            return []
+
+    async def get_all_text(self, selector: str) -> List[str]:
+        """
+        Get text content of all elements matching a selector
+
+        Args:
+            selector: CSS selector
+
+        Returns:
+            List of text contents
+        """
+        if not self.page:
+            raise RuntimeError("Scraper not started. Call start() first.")
+
+        try:
+            return await self.page.eval_on_selector_all(
+                selector,
+                "els => els.map(el => el.textContent).filter(Boolean)"
+            )
+        except Exception as e:
+            logger.warning(f"Error getting text for selector '{selector}': {e}")
+            return []
+
+    async def extract(self, spec: Dict[str, Union[str, Dict]]) -> Dict:
+        """
+        Extract several fields from the page in a single round trip
+
+        Args:
+            spec: Mapping of field name to either a CSS selector (text of the
+                  first match) or a rule dict with keys:
+                  - 'selector': CSS selector (required)
+                  - 'attr': 'text' (default) or an attribute name such as 'href'
+                  - 'all': return every non-empty match as a list
+                  - 'limit': maximum number of matches when 'all' is set
+                  - 'count': return the number of matches instead of values
+
+        Returns:
+            Dict mapping each field to str/None, a list ('all') or an int ('count')
+        """
+        if not self.page:
+            raise RuntimeError("Scraper not started. Call start() first.")
+
+        rules = {}
+        for field, rule in spec.items():
+            if isinstance(rule, str):
+                rule = {'selector': rule}
+            rules[field] = {
+                'selector': rule['selector'],
+                'attr': rule.get('attr', 'text'),
+                'all': bool(rule.get('all', False)),
+                'limit': rule.get('limit') or 0,
+                'count': bool(rule.get('count', False)),
+            }
+
+        try:
+            return await self.page.evaluate(EXTRACT_SCRIPT, rules)
+        except Exception as e:
+            logger.warning(f"Error extracting fields {list(rules)}: {e}")
+            return {
+                field: 0 if rule['count'] else ([] if rule['all'] else None)
+                for field, rule in rules.items()
+            }
+
     async def click(self, selector: str, timeout: int = 30000):
         """
         Click on an element
@@ -234,12 +633,19 @@ class BaseScraper:
 
     async def close(self):
         """Close the browser and cleanup resources"""
-        if self.page:
-            await self.page.close()
-            logger.info("Page closed")
-
-        if self.context:
-            await self.context.close()
+        if self._owner is not None:
+            # Leased workers don't own the browser
+            return
+
+        for page in self.pages:
+            if not page.is_closed():
+                await page.close()
+        if self.pages:
+            logger.info(f"{len(self.pages)} page(s) closed" if len(self.pages) > 1 else "Page closed")
+
+        for context in self.contexts:
+            await context.close()
+        if self.contexts:
             logger.info("Context closed")
 
         if self.browser:
@@ -0,0 +1,238 @@
+"""
+Fetch strategy layer: plain HTTP first, Playwright as fallback
+Most mcp.so server pages are server-rendered, so their fields can be read
+from the raw HTML without starting a headless browser render
+"""
+import re
+from typing import Optional, Dict, Iterable, List
+from urllib.parse import urlparse
+
+import aiohttp
+from loguru import logger
+
+from .base_scraper import BaseScraper
+from src.network.http_pool import get_http_registry
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # HTTP path disabled, every page goes through the browser
+    lxml_html = None
+
+
+def _pattern_values(html: str, rule: Dict) -> List[str]:
+    """Matches of a rule's 'pattern' in raw HTML, up to the values the rule keeps"""
+    values = []
+    for match in re.finditer(rule['pattern'], html):
+        values.append(match.group(0))
+        if not rule.get('all') or (rule.get('limit') and len(values) >= rule['limit']):
+            break
+    return values
+
+
+def parse_html_fields(html: str, spec: Dict[str, Dict]) -> Dict:
+    """
+    Extract fields from raw HTML using the XPath side of an extraction spec
+
+    Rules use the same keys as BaseScraper.extract(), plus:
+    - 'xpath': XPath selecting the elements (fields without it come back empty)
+    - 'pattern': regex applied to the raw HTML when the XPath finds nothing
+
+    Args:
+        html: Page HTML
+        spec: Mapping of field name to rule dict
+
+    Returns:
+        Dict mapping each field to str/None, a list ('all') or an int ('count')
+    """
+    tree = None
+    if lxml_html is not None and html.strip():
+        try:
+            tree = lxml_html.fromstring(html)
+        except Exception as e:
+            # Only the regex patterns apply; missing required fields send the page to the browser
+            logger.debug(f"Unparseable HTML: {e}")
+    fields = {}
+
+    for field, rule in spec.items():
+        if isinstance(rule, str):
+            rule = {'selector': rule}
+        attr = rule.get('attr', 'text')
+        limit = rule.get('limit') or 0
+
+        values = []
+        xpath = rule.get('xpath')
+        if tree is not None and xpath:
+            try:
+                elements = tree.xpath(xpath)
+            except Exception as e:
+                logger.warning(f"Invalid XPath for field '{field}': {e}")
+                elements = []
+
+            if rule.get('count'):
+                fields[field] = len(elements)
+                continue
+
+            for element in elements:
+                value = element.text_content() if attr == 'text' else element.get(attr)
+                if value:
+                    values.append(value)
+                    if not rule.get('all') or (limit and len(values) >= limit):
+                        break
+        elif rule.get('count'):
+            fields[field] = 0
+            continue
+
+        if not values and rule.get('pattern'):
+            values = _pattern_values(html, rule)
+
+        if rule.get('all'):
+            fields[field] = values
+        else:
+            fields[field] = values[0] if values else None
+
+    return fields
+
+
+class HybridFetcher:
+    """
+    Reads page fields over plain HTTP and falls back to a Playwright page
+    when required fields are missing from the server-rendered HTML
+
+    Keeps per-domain counters of how often each path was used.
+    """
+
+    def __init__(self, scraper: Optional[BaseScraper] = None, timeout: int = 20,
+                 user_agent: Optional[str] = None, ready_quiet_ms: int = 300, ready_timeout: int = 10000):
+        """
+        Initialize the fetcher
+
+        Args:
+            scraper: Started BaseScraper (pooled or not) used for fallbacks; None disables fallback
+            timeout: HTTP timeout in seconds
+            user_agent: User agent for HTTP requests
+            ready_quiet_ms: DOM quiet window for fallback pages (see BaseScraper.wait_until_ready)
+            ready_timeout: Readiness timeout for fallback pages in milliseconds
+        """
+        self.scraper = scraper
+        self.timeout = timeout
+        self.user_agent = user_agent or (
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+            '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        )
+        self.ready_quiet_ms = ready_quiet_ms
+        self.ready_timeout = ready_timeout
+
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.domain_stats: Dict[str, Dict[str, int]] = {}
+
+        if lxml_html is None:
+            logger.warning("lxml not installed: HTTP-first fetching disabled, using the browser for every page")
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
+
+    async def start(self):
+        """Start HTTP session (pooled connections shared process-wide)"""
+        headers = {
+            'Accept': 'text/html,application/xhtml+xml',
+            'User-Agent': self.user_agent
+        }
+        self.session = get_http_registry().session(
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    async def close(self):
+        """Close HTTP session"""
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    def _count(self, url: str, outcome: str):
+        """Increment a per-domain counter ('http', 'fallback' or 'failed')"""
+        domain = urlparse(url).hostname or 'unknown'
+        counters = self.domain_stats.setdefault(domain, {'http': 0, 'fallback': 0, 'failed': 0})
+        counters[outcome] += 1
+
+    async def _fetch_html(self, url: str) -> Optional[str]:
+        """
+        Fetch raw HTML over HTTP
+
+        Returns:
+            HTML string or None if the request failed or wasn't HTML
+        """
+        if not self.session:
+            await self.start()
+
+        try:
+            async with self.session.get(url) as response:
+                if response.status != 200:
+                    logger.debug(f"HTTP {response.status} for {url}")
+                    return None
+                if 'html' not in response.headers.get('Content-Type', ''):
+                    return None
+                return await response.text(errors='replace')
+        except Exception as e:
+            logger.debug(f"HTTP fetch failed for {url}: {e}")
+            return None
+
+    async def _fetch_with_browser(self, url: str, spec: Dict, ready_selector: Optional[str]) -> Optional[Dict]:
+        """Read the fields from a leased Playwright page ('pattern' rules apply to its HTML)"""
+        async with self.scraper.lease() as page_scraper:
+            if not await page_scraper.navigate(url):
+                return None
+            await page_scraper.wait_until_ready(selector=ready_selector, quiet_ms=self.ready_quiet_ms,
+                                                timeout=self.ready_timeout)
+            fields = await page_scraper.extract(spec)
+
+            html = None
+            for field, rule in spec.items():
+                if isinstance(rule, dict) and rule.get('pattern') and not fields.get(field):
+                    html = html if html is not None else await page_scraper.get_html()
+                    values = _pattern_values(html, rule)
+                    fields[field] = values if rule.get('all') else (values[0] if values else None)
+            return fields
+
+    async def fetch_fields(self, url: str, spec: Dict, required: Iterable[str] = (),
+                           ready_selector: Optional[str] = None) -> Optional[Dict]:
+        """
+        Extract fields from a page, over HTTP when possible
+
+        Args:
+            url: Page URL
+            spec: Extraction spec (BaseScraper.extract rules with 'xpath' for the HTTP path)
+            required: Fields that must be non-empty for the HTTP result to be used
+            ready_selector: Selector to wait for on fallback pages
+
+        Returns:
+            Dict of fields, or None if both paths failed
+        """
+        if lxml_html is not None:
+            html = await self._fetch_html(url)
+            if html:
+                fields = parse_html_fields(html, spec)
+                if all(fields.get(name) for name in required):
+                    self._count(url, 'http')
+                    return fields
+
+        if self.scraper is None:
+            self._count(url, 'failed')
+            return None
+
+        fields = await self._fetch_with_browser(url, spec, ready_selector)
+        self._count(url, 'fallback' if fields is not None else 'failed')
+        return fields
+
+    def get_stats(self) -> Dict:
+        """Get per-domain fetch statistics"""
+        stats = {}
+        for domain, counters in self.domain_stats.items():
+            total = sum(counters.values())
+            stats[domain] = dict(counters, fallback_rate=counters['fallback'] / total if total else 0.0)
+        return stats
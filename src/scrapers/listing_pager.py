@@ -0,0 +1,219 @@
+"""
+Listing pagination over the site's own XHR endpoint
+Captures the request fired by a "Load More" click and replays it over plain
+HTTP with an incremented page number, so long listings don't need a browser
+"""
+import asyncio
+import re
+from typing import Optional, List, Dict, Iterable
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+import aiohttp
+from loguru import logger
+
+from src.network.http_pool import get_http_registry
+
+
+# Query/body parameters recognised as a page number
+PAGE_PARAM_NAMES = ('page', 'p', 'pageNum', 'page_number', 'pageNumber')
+
+# Server detail paths (/server/{name}/{owner}) inside JSON, RSC or HTML bodies
+SERVER_PATH_PATTERN = re.compile(r'/server/([^/"\'\\\s?#<>]+)/([^/"\'\\\s?#<>]+)')
+
+# Headers not replayed: set by aiohttp or tied to the original connection
+SKIPPED_HEADERS = ('host', 'content-length', 'connection', 'accept-encoding', 'cookie')
+
+
+def extract_server_paths(body: str) -> List[str]:
+    """
+    Extract unique /server/{name}/{owner} paths from a response body
+
+    Args:
+        body: Response text (JSON, RSC payload or HTML)
+
+    Returns:
+        Paths in order of first appearance
+    """
+    paths = {}
+    for match in SERVER_PATH_PATTERN.finditer(body):
+        paths.setdefault(f"/server/{match.group(1)}/{match.group(2)}", None)
+    return list(paths)
+
+
+class ListingEndpoint:
+    """Replayable listing request with the location of its page parameter"""
+
+    def __init__(self, url: str, method: str, headers: Dict[str, str], post_data: Optional[str],
+                 param: str, location: str, page: int):
+        """
+        Args:
+            url: Request URL
+            method: HTTP method
+            headers: Request headers to replay
+            post_data: Request body (None for GET)
+            param: Name of the page parameter
+            location: 'query' or 'body'
+            page: Page number of the captured request
+        """
+        self.url = url
+        self.method = method
+        self.headers = {k: v for k, v in headers.items() if k.lower() not in SKIPPED_HEADERS}
+        self.post_data = post_data
+        self.param = param
+        self.location = location
+        self.page = page
+
+    @classmethod
+    def detect(cls, url: str, method: str, headers: Dict[str, str],
+               post_data: Optional[str]) -> Optional['ListingEndpoint']:
+        """
+        Build an endpoint if the request carries a numeric page parameter
+
+        Returns:
+            ListingEndpoint or None if no page parameter was found
+        """
+        query = dict(parse_qsl(urlparse(url).query))
+        for name in PAGE_PARAM_NAMES:
+            if query.get(name, '').isdigit():
+                return cls(url, method, headers, post_data, name, 'query', int(query[name]))
+
+        if post_data:
+            for name in PAGE_PARAM_NAMES:
+                match = re.search(rf'"{name}"\s*:\s*(\d+)', post_data)
+                if match:
+                    return cls(url, method, headers, post_data, name, 'body', int(match.group(1)))
+
+        return None
+
+    def request_for(self, page: int):
+        """
+        Build the URL and body for a given page
+
+        Returns:
+            Tuple (url, body)
+        """
+        if self.location == 'query':
+            parts = urlparse(self.url)
+            query = dict(parse_qsl(parts.query))
+            query[self.param] = str(page)
+            return urlunparse(parts._replace(query=urlencode(query))), self.post_data
+
+        body = re.sub(rf'("{self.param}"\s*:\s*)\d+', rf'\g<1>{page}', self.post_data, count=1)
+        return self.url, body
+
+
+class ListingCapture:
+    """Records XHR/fetch responses that list server pages"""
+
+    def __init__(self, page):
+        """
+        Args:
+            page: Playwright page to listen on
+        """
+        self.page = page
+        self.endpoints: List[ListingEndpoint] = []
+
+    def attach(self):
+        """Start listening for responses"""
+        self.page.on('response', self._on_response)
+
+    def detach(self):
+        """Stop listening for responses"""
+        self.page.remove_listener('response', self._on_response)
+
+    async def _on_response(self, response):
+        """Keep listing responses whose request has a page parameter"""
+        request = response.request
+        if request.resource_type not in ('xhr', 'fetch'):
+            return
+
+        try:
+            body = await response.text()
+        except Exception:
+            return
+
+        if not extract_server_paths(body):
+            return
+
+        endpoint = ListingEndpoint.detect(request.url, request.method, await request.all_headers(),
+                                          request.post_data)
+        if endpoint:
+            logger.info(f"Captured listing endpoint: {request.method} {request.url} "
+                        f"({endpoint.location} param '{endpoint.param}'={endpoint.page})")
+            self.endpoints.append(endpoint)
+
+
+class ApiListingPager:
+    """Pages a captured listing endpoint over plain HTTP"""
+
+    def __init__(self, endpoint: ListingEndpoint, cookies: Optional[Dict[str, str]] = None,
+                 delay: float = 0.5, timeout: int = 20, empty_page_threshold: int = 3, max_pages: int = 1000):
+        """
+        Args:
+            endpoint: Endpoint captured from the browser
+            cookies: Browser cookies to send with each request
+            delay: Delay between requests in seconds
+            timeout: HTTP timeout in seconds
+            empty_page_threshold: Stop after this many pages without new links
+            max_pages: Hard limit on the number of requests
+        """
+        self.endpoint = endpoint
+        self.cookies = cookies or {}
+        self.delay = delay
+        self.timeout = timeout
+        self.empty_page_threshold = empty_page_threshold
+        self.max_pages = max_pages
+
+        self.stats = {'requests': 0, 'failed': 0, 'links_found': 0}
+
+    async def collect(self, max_links: int, known: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Page the endpoint until enough new links are found or the listing ends
+
+        Args:
+            max_links: Stop once this many links (known included) are collected
+            known: Paths already collected (not returned again)
+
+        Returns:
+            New server paths (/server/{name}/{owner})
+        """
+        seen = set(known or ())
+        new_links = []
+        consecutive_empty = 0
+
+        async with get_http_registry().session(headers=self.endpoint.headers, cookies=self.cookies,
+                                               timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            for page in range(self.endpoint.page + 1, self.endpoint.page + 1 + self.max_pages):
+                if len(seen) >= max_links or consecutive_empty >= self.empty_page_threshold:
+                    break
+
+                url, body = self.endpoint.request_for(page)
+                self.stats['requests'] += 1
+                try:
+                    async with session.request(self.endpoint.method, url, data=body) as response:
+                        if response.status != 200:
+                            logger.warning(f"Listing page {page} returned HTTP {response.status}")
+                            self.stats['failed'] += 1
+                            break
+                        text = await response.text(errors='replace')
+                except Exception as e:
+                    logger.warning(f"Listing page {page} failed: {e}")
+                    self.stats['failed'] += 1
+                    break
+
+                added = 0
+                for path in extract_server_paths(text):
+                    if path not in seen:
+                        seen.add(path)
+                        new_links.append(path)
+                        added += 1
+                        if len(seen) >= max_links:
+                            break
+
+                self.stats['links_found'] += added
+                consecutive_empty = 0 if added else consecutive_empty + 1
+                logger.debug(f"Listing page {page}: {added} new link(s)")
+
+                await asyncio.sleep(self.delay)
+
+        return new_links
@@ -0,0 +1,189 @@
+"""
+Sitemap-based URL discovery
+Streams sitemap.xml files (and sitemap indexes) over HTTP, without a browser
+"""
+import re
+import zlib
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Optional, List, Tuple, AsyncIterator
+from urllib.parse import urljoin, urlparse
+
+import aiohttp
+from loguru import logger
+
+from src.network.http_pool import get_http_registry
+
+
+# Server detail URLs: /server/{name}/{owner}
+SERVER_URL_PATTERN = re.compile(r'^/server/([^/?#]+)/([^/?#]+)/?$')
+
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a sitemap <lastmod> value (W3C datetime) into a naive UTC datetime
+
+    Returns:
+        datetime or None if missing/invalid
+    """
+    if not value:
+        return None
+    value = value.strip().replace('Z', '+00:00')
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = datetime.utcfromtimestamp(parsed.timestamp())
+    return parsed
+
+
+def parse_server_url(url: str) -> Optional[Tuple[str, str]]:
+    """
+    Extract (server_name, owner) from an mcp.so server URL
+
+    Returns:
+        Tuple or None if the URL isn't a server detail page
+    """
+    match = SERVER_URL_PATTERN.match(urlparse(url).path)
+    return (match.group(1), match.group(2)) if match else None
+
+
+class SitemapDiscovery:
+    """
+    Discovers server URLs from a site's sitemaps
+
+    Sitemap indexes are followed recursively; each file is parsed
+    incrementally as it downloads, so memory stays flat on large sitemaps.
+    """
+
+    def __init__(self, base_url: str = "https://mcp.so", timeout: int = 60):
+        """
+        Initialize discovery
+
+        Args:
+            base_url: Site root, used to locate robots.txt and /sitemap.xml
+            timeout: HTTP timeout per sitemap file in seconds
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        self.stats = {
+            'sitemaps_fetched': 0,
+            'sitemaps_skipped': 0,
+            'sitemaps_failed': 0,
+            'urls_seen': 0,
+        }
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        self.session = get_http_registry().session(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        if self.session:
+            await self.session.close()
+
+    async def find_sitemaps(self) -> List[str]:
+        """
+        Locate root sitemaps from robots.txt, defaulting to /sitemap.xml
+
+        Returns:
+            List of sitemap URLs
+        """
+        sitemaps = []
+        try:
+            async with self.session.get(f"{self.base_url}/robots.txt") as response:
+                if response.status == 200:
+                    for line in (await response.text()).splitlines():
+                        if line.lower().startswith('sitemap:'):
+                            sitemaps.append(line.split(':', 1)[1].strip())
+        except Exception as e:
+            logger.debug(f"Could not read robots.txt: {e}")
+
+        return sitemaps or [f"{self.base_url}/sitemap.xml"]
+
+    async def _stream_elements(self, sitemap_url: str) -> AsyncIterator[Tuple[str, str, Optional[str]]]:
+        """
+        Stream <url>/<sitemap> entries of one sitemap file
+
+        Yields:
+            Tuples (kind, loc, lastmod) where kind is 'url' or 'sitemap'
+        """
+        parser = ET.XMLPullParser(events=('end',))
+        # .xml.gz files are served as-is (no Content-Encoding)
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if sitemap_url.endswith('.gz') else None
+
+        async with self.session.get(sitemap_url) as response:
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}")
+
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                parser.feed(decompressor.decompress(chunk) if decompressor else chunk)
+
+                for _, element in parser.read_events():
+                    # Strip the sitemap namespace: {http://www.sitemaps.org/...}url -> url
+                    tag = element.tag.rsplit('}', 1)[-1]
+                    if tag not in ('url', 'sitemap'):
+                        continue
+
+                    loc = lastmod = None
+                    for child in element:
+                        child_tag = child.tag.rsplit('}', 1)[-1]
+                        if child_tag == 'loc':
+                            loc = (child.text or '').strip()
+                        elif child_tag == 'lastmod':
+                            lastmod = child.text
+
+                    element.clear()
+                    if loc:
+                        yield tag, loc, lastmod
+
+        parser.close()
+
+    async def iter_server_urls(self, since: Optional[datetime] = None,
+                               sitemaps: Optional[List[str]] = None) -> AsyncIterator[Tuple[str, Optional[datetime], int]]:
+        """
+        Iterate server URLs across all sitemaps
+
+        Args:
+            since: Skip child sitemaps whose index lastmod is not newer than this
+            sitemaps: Root sitemap URLs (default: from robots.txt)
+
+        Yields:
+            Tuples (url, lastmod, sitemap_number) where sitemap_number is the
+            1-based position of the sitemap file the URL was found in
+        """
+        pending = list(sitemaps or await self.find_sitemaps())
+        visited = set()
+        sitemap_number = 0
+
+        while pending:
+            sitemap_url = urljoin(self.base_url + '/', pending.pop(0))
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+            sitemap_number += 1
+
+            try:
+                self.stats['sitemaps_fetched'] += 1
+                async for kind, loc, lastmod in self._stream_elements(sitemap_url):
+                    if kind == 'sitemap':
+                        child_lastmod = parse_lastmod(lastmod)
+                        if since and child_lastmod and child_lastmod <= since:
+                            self.stats['sitemaps_skipped'] += 1
+                            continue
+                        pending.append(loc)
+                        continue
+
+                    self.stats['urls_seen'] += 1
+                    if parse_server_url(loc):
+                        yield loc, parse_lastmod(lastmod), sitemap_number
+
+            except Exception as e:
+                self.stats['sitemaps_failed'] += 1
+                logger.warning(f"Failed to read sitemap {sitemap_url}: {e}")